@@ -1,13 +1,73 @@
 import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
 import tkinter.messagebox as messagebox  # Module for displaying message boxes.
-import sqlite3  # SQLite3 for database management.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Define Genre and Language Options for Validation
+# Purpose:
+# Sets predefined valid options for genre and language to ensure data integrity.
+# Shared by the "Add Book" form and the bulk import.
+# -------------------------------------------
+GENRE_VALUES = ['Fiction', 'Fantasy', 'Science fiction', 'Horror', 'Romance', 'Historical fiction', 'Drama', 'Other']  # Valid genres.
+LANGUAGE_VALUES = ['EN', 'ES', 'RU', 'IT', 'HI', 'HI', 'AR', 'PT', 'JA', 'CM', 'FR', 'Other']  # Valid languages.
+
+
+# -------------------------------------------
+# Function: check_combobox_values
+# Purpose:
+# Checks the genre and language against the predefined lists.
+# Returns an error message, or None when both are valid.
+# -------------------------------------------
+def check_combobox_values(genre, language):
+    if genre not in GENRE_VALUES:
+        return f"Invalid Genre: '{genre}'."
+    if language not in LANGUAGE_VALUES:
+        return f"Invalid Language: '{language}'."
+    return None
+
+
+# -------------------------------------------
+# Function: validate_combobox_values
+# Purpose:
+# Validates the selected genre and language against predefined lists.
+# Shows the error over `parent` and returns False when one is invalid.
+# Shared by the "Add Book" form and the inline editor of the catalog.
+# -------------------------------------------
+def validate_combobox_values(genre, language, parent=None):
+    error = check_combobox_values(genre, language)
+    if error:
+        messagebox.showerror('Invalid Input', f"{error} Please select a valid option.", parent=parent)  # Show error for invalid genre or language.
+        return False
+    return True  # Valid selections.
+
+
+# -------------------------------------------
+# Function: insert_book
+# Purpose:
+# Inserts a new book record. SQLite assigns the next book ID (AUTOINCREMENT),
+# so IDs of deleted books are never reused. The ISBN is stored without hyphens and spaces.
+# Returns the new book ID.
+# Retried when another PC holds the write lock (see database.write_transaction).
+# -------------------------------------------
+def insert_book(values):
+    values = tuple(values[:6]) + (database.normalize_isbn(values[6]),) + tuple(values[7:])  # Searchable ISBN.
+
+    def insert(cursor):
+        cursor.execute('''
+            INSERT INTO books (book_name, book_publisher, author_name, book_year, book_genre, book_language, book_ISBN, book_quantity)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', values)  # Insert new book.
+        return cursor.lastrowid
+
+    return database.write_transaction(insert)
+
 
 # -------------------------------------------
 # Function: add_book_window
 # Purpose:
 # Creates and manages the "Add Book" window, allowing users to input and submit new book details.
 # -------------------------------------------
-def add_book_window(main_root, tabla_information, refresh_treeview):
+def add_book_window(main_root, tabla_information, refresh_treeview, worker=None):
     """
     Creates and manages the "Add Book" window, allowing users to input and submit new book details.
 
@@ -15,6 +75,7 @@ def add_book_window(main_root, tabla_information, refresh_treeview):
     - main_root: The main application window.
     - tabla_information: The treeview or table widget displaying book information.
     - refresh_treeview: A callback function to refresh the treeview after adding a new book.
+    - worker: Optional DatabaseWorker used to run the insert off the Tk thread.
     """
 
     # -------------------------------------------
@@ -121,18 +182,10 @@ def add_book_window(main_root, tabla_information, refresh_treeview):
     quantity_entry = ctk.CTkEntry(add_book_root, font=('Cascadia Code', 14), width=190)  # Entry for Quantity.
     quantity_entry.place(x=185, y=370)  # Position the entry field.
 
-    # -------------------------------------------
-    # Block: Define Genre and Language Options for Validation
-    # Purpose:
-    # Sets predefined valid options for genre and language to ensure data integrity.
-    # -------------------------------------------
-    GENRE_VALUES = ['Fiction', 'Fantasy', 'Science fiction', 'Horror', 'Romance', 'Historical fiction', 'Drama', 'Other']  # Valid genres.
-    LANGUAGE_VALUES = ['EN', 'ES', 'RU', 'IT', 'HI', 'HI', 'AR', 'PT', 'JA', 'CM', 'FR', 'Other']  # Valid languages.
-
     # -------------------------------------------
     # Block: Define Helper Functions
     # Purpose:
-    # Includes functions to clear input fields, retrieve the next book ID, validate selections, and submit book information.
+    # Includes functions to clear input fields, validate selections, and submit book information.
     # -------------------------------------------
     # Function: clear_info
     # Purpose:
@@ -147,29 +200,6 @@ def add_book_window(main_root, tabla_information, refresh_treeview):
         isbn_entry.delete(0, 'end')  # Clear ISBN.
         quantity_entry.delete(0, 'end')  # Clear Quantity.
 
-    # Function: get_next_book_id
-    # Purpose:
-    # Retrieves the next available book ID by finding the maximum existing ID and incrementing it.
-    def get_next_book_id():
-        conn = sqlite3.connect('./db/bookstore_management.db')  # Connect to the database.
-        cursor = conn.cursor()  # Create a cursor object.
-        cursor.execute('SELECT MAX(book_id) FROM books')  # Query to find the maximum book ID.
-        max_id = cursor.fetchone()[0]  # Fetch the result.
-        conn.close()  # Close the database connection.
-        return max_id + 1 if max_id else 1  # Return the next book ID.
-
-    # Function: validate_combobox_values
-    # Purpose:
-    # Validates the selected genre and language against predefined lists.
-    def validate_combobox_values(genre, language):
-        if genre not in GENRE_VALUES:
-            messagebox.showerror('Invalid Input', f"Invalid Genre: '{genre}'. Please select a valid option.", parent=add_book_root)  # Show error for invalid genre.
-            return False
-        if language not in LANGUAGE_VALUES:
-            messagebox.showerror('Invalid Input', f"Invalid Language: '{language}'. Please select a valid option.", parent=add_book_root)  # Show error for invalid language.
-            return False
-        return True  # Valid selections.
-
     # Function: submit_book_info
     # Purpose:
     # Gathers input data, validates it, inserts the new book into the database,
@@ -191,21 +221,27 @@ def add_book_window(main_root, tabla_information, refresh_treeview):
             return
 
         # Validate ComboBox selections.
-        if not validate_combobox_values(genre, language):
+        if not validate_combobox_values(genre, language, add_book_root):
             return  # Exit if validation fails.
 
-        # Get the next available book ID.
-        next_book_id = get_next_book_id()
+        # Insert the new book record, in the background when a worker is available.
+        values = (book_name, publisher_name, author_name, book_year, genre, language, isbn, quantity)
+        if worker:
+            submit_button.configure(state='disabled')  # Avoid a double insert while it runs.
+            worker.submit(insert_book, values, on_done=on_book_added, on_error=on_add_failed)
+            return
+        try:
+            book_id = insert_book(values)
+        except Exception as e:
+            on_add_failed(e)
+        else:
+            on_book_added(book_id)
 
-        # Connect to the SQLite database and insert the new book record.
-        conn = sqlite3.connect('./db/bookstore_management.db')  # Connect to the database.
-        cursor = conn.cursor()  # Create a cursor object.
-        cursor.execute('''
-            INSERT INTO books (book_id, book_name, book_publisher, author_name, book_year, book_genre, book_language, book_ISBN, book_quantity)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (next_book_id, book_name, publisher_name, author_name, book_year, genre, language, isbn, quantity))  # Insert new book.
-        conn.commit()  # Commit the transaction.
-        conn.close()  # Close the database connection.
+    # Function: on_book_added
+    # Purpose:
+    # Informs the user, refreshes the treeview and clears the form after the insert.
+    def on_book_added(book_id):
+        submit_button.configure(state='normal')
 
         # Inform the user of the successful addition.
         messagebox.showinfo('Message', 'Book information added successfully!', parent=add_book_root)  # Success message.
@@ -216,6 +252,13 @@ def add_book_window(main_root, tabla_information, refresh_treeview):
         # Clear the input fields for new entries.
         clear_info()  # Clear all input fields.
 
+    # Function: on_add_failed
+    # Purpose:
+    # Displays an error message if the insert fails.
+    def on_add_failed(e):
+        submit_button.configure(state='normal')
+        messagebox.showerror('Error', database.error_message(e), parent=add_book_root)  # Error message.
+
     # -------------------------------------------
     # Block: Create Action Buttons
     # Purpose:
@@ -0,0 +1,74 @@
+import importlib  # Preloads the main window modules.
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+from splash import splash_screen_main  # First screen: checks and migrates the database.
+
+# -------------------------------------------
+# Block: Application Shell
+# Purpose:
+# The splash, login and main window are screens of one window in one process. The
+# interpreter, customtkinter, PIL and the database connection are loaded once instead of
+# once per screen, and each screen replaces the previous one as soon as it is ready.
+# -------------------------------------------
+
+
+# -------------------------------------------
+# Function: clear_window
+# Purpose:
+# Removes everything the previous screen added to the window (widgets, event bindings,
+# borderless mode, background color) so the next screen starts from a blank window.
+# -------------------------------------------
+def clear_window(app_root, base_bindings):
+    for child in app_root.winfo_children():
+        child.destroy()  # Widgets of the previous screen.
+    for sequence in app_root.bind():
+        if sequence not in base_bindings:
+            app_root.unbind(sequence)  # Bindings added by the previous screen (dragging, Enter key).
+    app_root.overrideredirect(False)  # Restore the title bar.
+    app_root.configure(fg_color=app_root.cget('fg_color'))  # Restore the theme background color.
+
+
+# -------------------------------------------
+# Function: main
+# Purpose:
+# Creates the application window and shows the first screen. `start_screen` is 'splash',
+# 'login' or 'main'; `username` is shown in the main window when it is the first screen.
+# -------------------------------------------
+def main(start_screen='splash', username=None):
+    app_root = ctk.CTk()  # The only window of the application.
+    base_bindings = set(app_root.bind())  # Bindings customtkinter needs, kept between screens.
+
+    def switch_screen(build_screen, *args):
+        """Hides the window, replaces the current screen and shows the window again."""
+        app_root.withdraw()  # Avoid showing a half-built screen.
+        clear_window(app_root, base_bindings)
+        build_screen(app_root, *args)
+        app_root.deiconify()
+
+    def show_main(username):
+        """Replaces the login screen with the main window."""
+        from main_data import main_window  # Already imported while the splash was shown.
+        switch_screen(main_window, username)
+
+    def show_login():
+        """Called when the splash finished initializing: replaces it with the login screen."""
+        importlib.import_module('main_data')  # Deliberate preload: import the main window modules while the splash is still shown.
+        from login import login_screen_main
+        switch_screen(login_screen_main, show_main)
+
+    if start_screen == 'main':
+        from main_data import main_window
+        main_window(app_root, username)
+    elif start_screen == 'login':
+        from login import login_screen_main
+        login_screen_main(app_root, show_main)
+    else:
+        splash_screen_main(app_root, show_login)
+
+    app_root.mainloop()  # One event loop for every screen.
+
+
+# -------------------------------------------
+# Execution: Start Application
+# -------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import os  # Module to interact with the file system.
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+from PIL import Image  # Module to load and handle images.
+
+# -------------------------------------------
+# Block: Asset Cache Settings
+# Purpose:
+# Images are decoded once per process and shared by the light and dark variants of a
+# CTkImage. Resized copies are kept on disk, named after the source file, the target size
+# and the source modification time, so the large originals are only decoded again after
+# they change.
+# -------------------------------------------
+CACHE_DIR = './images/cache'  # Folder of the pre-resized images.
+
+_images = {}  # (path, pixel size) -> resized PIL image.
+_ctk_images = {}  # (path, size, scaling) -> CTkImage shared by every widget showing it.
+
+
+# -------------------------------------------
+# Function: cache_path
+# Purpose:
+# Path of the cached copy of `path` resized to `pixel_size` for the given source mtime.
+# -------------------------------------------
+def cache_path(path, pixel_size, mtime_ns):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}_{pixel_size[0]}x{pixel_size[1]}_{mtime_ns}.png")
+
+
+# -------------------------------------------
+# Function: save_cached_copy
+# Purpose:
+# Writes the resized image to the disk cache and removes the copies made from older versions
+# of the same source. A read-only or full disk only disables the cache.
+# -------------------------------------------
+def save_cached_copy(image, cached_path):
+    prefix = cached_path.rsplit('_', 1)[0] + '_'  # Same source and size, any mtime.
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for file_name in os.listdir(CACHE_DIR):
+            stale_path = os.path.join(CACHE_DIR, file_name)
+            if stale_path.startswith(prefix) and stale_path != cached_path:
+                os.remove(stale_path)  # Made from an older version of the source.
+        image.save(cached_path, optimize=False)  # PNG: lossless and fast to decode.
+    except OSError:
+        pass
+
+
+# -------------------------------------------
+# Function: load_image
+# Purpose:
+# Returns the image at `path` resized to `pixel_size` (width, height), from memory, from the
+# disk cache, or by decoding the source once. Raises FileNotFoundError or
+# PIL.UnidentifiedImageError like Image.open.
+# -------------------------------------------
+def load_image(path, pixel_size):
+    key = (path, tuple(pixel_size))
+    image = _images.get(key)
+    if image is not None:
+        return image
+
+    cached_path = cache_path(path, pixel_size, os.stat(path).st_mtime_ns)
+    try:
+        with Image.open(cached_path) as cached:
+            image = cached.copy()  # Small pre-resized copy.
+    except (OSError, ValueError):
+        with Image.open(path) as source:
+            source.draft('RGB', pixel_size)  # JPEG: decode directly at a reduced scale.
+            image = source.convert('RGBA' if 'A' in source.getbands() else 'RGB')
+        if image.size != tuple(pixel_size):
+            image = image.resize(pixel_size, Image.LANCZOS)
+            save_cached_copy(image, cached_path)  # Sources already at the right size are not copied.
+
+    _images[key] = image
+    return image
+
+
+# -------------------------------------------
+# Function: load_ctk_image
+# Purpose:
+# Returns a CTkImage of `path` shown at `size`, using one decoded image for the light and
+# dark variants. The image is prepared at the window scaling so it stays sharp on high-DPI
+# displays; the same CTkImage is returned for later calls with the same arguments.
+# -------------------------------------------
+def load_ctk_image(path, size, window=None):
+    scaling = ctk.ScalingTracker.get_window_scaling(window) if window is not None else 1.0
+    key = (path, tuple(size), scaling)
+    ctk_image = _ctk_images.get(key)
+    if ctk_image is None:
+        pixel_size = (round(size[0] * scaling), round(size[1] * scaling))  # Pixels actually drawn.
+        image = load_image(path, pixel_size)
+        ctk_image = ctk.CTkImage(light_image=image, dark_image=image, size=size)
+        _ctk_images[key] = ctk_image
+    return ctk_image
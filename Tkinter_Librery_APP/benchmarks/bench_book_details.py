@@ -0,0 +1,103 @@
+import argparse  # Command line options.
+import os  # Module to interact with the file system.
+import random  # Which books are opened.
+import tempfile  # Temporary folder for the synthetic database and covers.
+
+from PIL import Image  # Synthetic cover images.
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+from bench_suite import timed  # Median timing helper.
+import database  # Shared database connection layer.
+import book_details  # Details of the "Book Information" window.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Time to get the details of a book for the "Book Information" window on a large catalog
+# with a loan history: cold (read and decoded) and from the LRU caches, with and without a
+# cover. The budget for opening the details is 50 ms.
+# -------------------------------------------
+SIZE = 1_000_000  # Default catalog size.
+LOANS = 200_000  # Loans spread over the catalog.
+COVERS = 20  # Books with a cover (fewer than the covers kept in the cache).
+COVER_PIXELS = (1200, 1800)  # Size of a scanned cover.
+REPEATS = 40  # Books opened per measurement.
+
+
+# -------------------------------------------
+# Function: add_loans
+# Purpose:
+# Inserts `count` loans of random books, a tenth of them still open.
+# -------------------------------------------
+def add_loans(count, size):
+    chooser = random.Random(7)
+    rows = []
+    for index in range(count):
+        day = f'2026-{chooser.randint(1, 9):02d}-{chooser.randint(1, 28):02d}'
+        returned = None if index % 10 == 0 else f'{day} 18:00:00'
+        rows.append((chooser.randint(1, size), f'Customer {index % 5000}', 1, f'{day} 10:00:00', f'{day} 10:00:00', returned))
+    database.write_transaction(lambda cursor: cursor.executemany(
+        'INSERT INTO loans (book_id, customer, copies, checked_out_at, due_at, returned_at) VALUES (?, ?, ?, ?, ?, ?)', rows
+    ))
+
+
+# -------------------------------------------
+# Function: add_covers
+# Purpose:
+# Writes JPEG covers for the books 1..count into `folder`.
+# -------------------------------------------
+def add_covers(folder, count):
+    os.makedirs(folder, exist_ok=True)
+    for book_id in range(1, count + 1):
+        image = Image.radial_gradient('L').resize(COVER_PIXELS).convert('RGB')
+        image.save(os.path.join(folder, f'{book_id}.jpg'), quality=90)
+
+
+# -------------------------------------------
+# Function: open_books
+# Purpose:
+# Loads the details of every book in `book_ids`, optionally forgetting the caches first.
+# -------------------------------------------
+def open_books(book_ids, cold):
+    for book_id in book_ids:
+        if cold:
+            book_details.clear()
+        book_details.load_details(book_id)
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Prints the median time per opened book, cold and cached, with and without covers.
+# -------------------------------------------
+def run(size):
+    with tempfile.TemporaryDirectory() as folder:
+        use_catalog(create_catalog(os.path.join(folder, 'books.db'), size))
+        add_loans(LOANS, size)
+        book_details.COVERS_DIR = os.path.join(folder, 'covers')
+        add_covers(book_details.COVERS_DIR, COVERS)
+
+        chooser = random.Random(11)
+        plain_ids = [chooser.randint(COVERS + 1, size) for _ in range(REPEATS)]
+        cover_ids = list(range(1, COVERS + 1))
+        results = {}
+        for name, book_ids in (('without cover', plain_ids), ('with cover', cover_ids)):
+            results[f'cold {name}'] = timed(lambda: open_books(book_ids, cold=True), repeats=3) / len(book_ids)
+            open_books(book_ids, cold=False)  # Fill the caches.
+            results[f'cached {name}'] = timed(lambda: open_books(book_ids, cold=False), repeats=3) / len(book_ids)
+        plan = database.fetch_all(
+            'EXPLAIN QUERY PLAN SELECT customer, copies, checked_out_at, due_at, returned_at FROM loans '
+            'WHERE book_id = ? ORDER BY checked_out_at DESC LIMIT ?', (1, book_details.HISTORY_ROWS)
+        )
+        database.close_connection()
+        book_details.clear()
+
+    print(f'{size} books, {LOANS} loans, covers {COVER_PIXELS[0]}x{COVER_PIXELS[1]} JPEG')
+    for name, value in results.items():
+        print(f'  {name + " (ms/book)":<30} {value:10.3f}')
+    print(f'  loan history plan: {" / ".join(row[-1] for row in plan)}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Times the details of the "Book Information" window.')
+    parser.add_argument('--size', type=int, default=SIZE, help='catalog size in rows')
+    run(parser.parse_args().size)
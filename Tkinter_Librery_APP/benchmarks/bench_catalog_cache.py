@@ -0,0 +1,78 @@
+import argparse  # Command line options.
+import os  # Module to interact with the file system.
+import tempfile  # Temporary folder for the synthetic database.
+import tracemalloc  # Memory taken by the rows.
+
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+from bench_suite import timed  # Median timing helper.
+import database  # Shared database connection layer.
+import catalog_cache  # In-memory catalog.
+from search import build_filter, search_books  # Search panel backend.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Compares the catalog as lists of sqlite3 tuples (what every refresh used to build) with the
+# catalog cache: memory of the rows and time of repeated refreshes, searches and counts.
+# -------------------------------------------
+SIZE = 100_000  # Default catalog size.
+SEARCH = ('Book Name', 'shadow')  # Search repeated from the search panel.
+
+
+# -------------------------------------------
+# Function: measure_memory
+# Purpose:
+# Returns the memory in MiB still allocated by the value `build()` returns.
+# -------------------------------------------
+def measure_memory(build):
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return current / 2 ** 20
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Prints memory and timings of the tuple rows and of the catalog cache for `size` books.
+# -------------------------------------------
+def run(size):
+    with tempfile.TemporaryDirectory() as folder:
+        use_catalog(create_catalog(os.path.join(folder, 'books.db'), size))
+        where_sql, params = build_filter(*SEARCH)
+
+        # Block: Memory
+        tuple_mib = measure_memory(lambda: database.fetch_all(database.SELECT_BOOKS_QUERY))
+        catalog_cache.clear()
+        cache_mib = measure_memory(catalog_cache.all_books)
+
+        # Block: Timings
+        # Uncached: every call reads the rows from SQLite. Cached: the data version did not change.
+        results = {
+            'refresh uncached': timed(lambda: database.fetch_all(database.SELECT_BOOKS_QUERY)),
+            'refresh cached': timed(catalog_cache.all_books),
+            'search uncached': timed(lambda: database.fetch_all(
+                f'SELECT {database.BOOK_COLUMNS} FROM books WHERE {where_sql} ORDER BY book_id', params)),
+            'search cached': timed(lambda: search_books(*SEARCH)),
+            'count uncached': timed(lambda: database.fetch_one('SELECT COUNT(*) FROM books')),
+            'count cached': timed(catalog_cache.count_books),
+        }
+        database.get_connection().execute('UPDATE books SET book_quantity = 1 WHERE book_id = 1')
+        database.get_connection().commit()
+        results['reload after a commit'] = timed(catalog_cache.all_books, repeats=1)
+        database.close_connection()
+        catalog_cache.clear()
+
+    print(f'{size} books')
+    print(f"  {'memory tuples (MiB)':<28} {tuple_mib:10.1f}")
+    print(f"  {'memory cache (MiB)':<28} {cache_mib:10.1f}")
+    for name, value in results.items():
+        print(f'  {name + " (ms)":<28} {value:10.3f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compares the catalog cache with re-reading the rows.')
+    parser.add_argument('--size', type=int, default=SIZE, help='catalog size in rows')
+    run(parser.parse_args().size)
@@ -0,0 +1,78 @@
+import os  # Module to interact with the file system.
+import tempfile  # Temporary folder for the synthetic databases.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+import database  # Shared database connection layer.
+import soft_delete  # Trash used by delete_item.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Cost of one delete of the "Delete Book" button (moved to the trash, see soft_delete.py)
+# against the old delete that renumbered the whole table afterwards.
+# -------------------------------------------
+SIZES = [1_000, 5_000, 10_000, 100_000, 200_000]  # Catalog sizes to measure.
+DELETES = 20  # Deletes timed per catalog size.
+LEGACY_DELETES = 3  # The old delete is quadratic, so only a few are timed.
+LEGACY_MAX_SIZE = 5_000  # Largest catalog the old renumbering delete is timed on.
+
+LEGACY_RENUMBER = """
+    WITH Ordered AS (
+        SELECT rowid, book_id, ROW_NUMBER() OVER (ORDER BY book_id) AS new_id
+        FROM books
+    )
+    UPDATE books
+    SET book_id = (SELECT new_id FROM Ordered WHERE Ordered.rowid = books.rowid)
+"""  # Renumbering statement that delete_item used to run after each delete.
+
+
+# -------------------------------------------
+# Function: time_deletes
+# Purpose:
+# Deletes `count` books spread across the catalog and returns the mean time per delete in ms.
+# When legacy is True the row is removed and the old renumbering statement runs after each
+# delete; otherwise the book is moved to the trash like delete_item does.
+# -------------------------------------------
+def time_deletes(size, count, legacy):
+    step = max(size // count, 1)  # Spread the deletes across the catalog.
+    elapsed = 0.0
+    for number in range(count):
+        book_id = number * step + 1
+        start = time.perf_counter()
+        if legacy:
+            with database.transaction() as cursor:
+                cursor.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+                cursor.execute(LEGACY_RENUMBER)
+        else:
+            soft_delete.trash_books([book_id])  # Same call as delete_item.
+        elapsed += time.perf_counter() - start
+    return elapsed / count * 1000
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Builds every catalog size and prints the delete cost with and without renumbering.
+# -------------------------------------------
+def run():
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'rows':>10} {'trash (ms)':>16} {'renumber (ms)':>16}")
+        for size in SIZES:
+            db_path = create_catalog(os.path.join(folder, f"books_{size}.db"), size)
+            use_catalog(db_path)
+            stable = time_deletes(size, DELETES, legacy=False)
+
+            legacy = None
+            if size <= LEGACY_MAX_SIZE:
+                create_catalog(db_path, size)  # Fresh copy for the legacy run.
+                use_catalog(db_path)
+                legacy = time_deletes(size, LEGACY_DELETES, legacy=True)
+
+            legacy_text = f"{legacy:16.3f}" if legacy is not None else f"{'skipped':>16}"
+            print(f"{size:>10} {stable:16.3f} {legacy_text}")
+            database.close_connection()
+
+
+if __name__ == "__main__":
+    run()
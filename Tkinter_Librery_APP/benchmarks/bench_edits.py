@@ -0,0 +1,86 @@
+import argparse  # Command line options.
+import os  # Module to interact with the file system.
+import random  # Which books are edited.
+import sqlite3  # SQLite3 for database management.
+import tempfile  # Temporary folder for the synthetic database.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+import database  # Shared database connection layer.
+from book_editor import save_book_edits  # Coalesced save of the inline editor.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# A stock-take: the quantities of many books are corrected one after the other. Compares a
+# connection and a commit per field, a commit per field on the shared connection, and the
+# buffered edits of the inline editor saved in one transaction.
+# -------------------------------------------
+SIZE = 100_000  # Default catalog size.
+EDITS = 1000  # Quantities corrected.
+
+
+# -------------------------------------------
+# Function: per_field_connection
+# Purpose:
+# One connection, update and commit per edited field.
+# -------------------------------------------
+def per_field_connection(edits):
+    for book_id, quantity in edits:
+        conn = sqlite3.connect(database.DB_PATH)
+        conn.execute('UPDATE books SET book_quantity = ? WHERE book_id = ?', (quantity, book_id))
+        conn.commit()
+        conn.close()
+
+
+# -------------------------------------------
+# Function: per_field_commit
+# Purpose:
+# One write transaction per edited field on the shared connection.
+# -------------------------------------------
+def per_field_commit(edits):
+    for book_id, quantity in edits:
+        database.write_transaction(
+            lambda cursor: cursor.execute('UPDATE books SET book_quantity = ? WHERE book_id = ?', (quantity, book_id))
+        )
+
+
+# -------------------------------------------
+# Function: coalesced
+# Purpose:
+# The edits buffered by the inline editor, saved in one transaction.
+# -------------------------------------------
+def coalesced(edits):
+    save_book_edits({book_id: {'book_quantity': str(quantity)} for book_id, quantity in edits})
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Prints the time of the same stock-take with every strategy.
+# -------------------------------------------
+def run(size, count):
+    chooser = random.Random(5)
+    edits = [(chooser.randint(1, size), chooser.randint(0, 50)) for _ in range(count)]
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        use_catalog(create_catalog(os.path.join(folder, 'books.db'), size))
+        for name, strategy in (('connection per field', per_field_connection),
+                               ('commit per field', per_field_commit),
+                               ('coalesced (one commit)', coalesced)):
+            start = time.perf_counter()
+            strategy(edits)
+            results[name] = (time.perf_counter() - start) * 1000
+        database.close_connection()
+
+    print(f'{size} books, {count} quantity edits')
+    for name, value in results.items():
+        print(f'  {name + " (ms)":<28} {value:10.1f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compares per-field commits with the coalesced save of the editor.')
+    parser.add_argument('--size', type=int, default=SIZE, help='catalog size in rows')
+    parser.add_argument('--edits', type=int, default=EDITS, help='edited quantities')
+    arguments = parser.parse_args()
+    run(arguments.size, arguments.edits)
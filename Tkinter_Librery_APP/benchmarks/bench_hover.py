@@ -0,0 +1,66 @@
+import os  # Module to interact with the file system.
+import sys  # Module to interact with the Python interpreter.
+import time  # High resolution timer.
+import tkinter as tk  # Tk root for the treeview (needs a display, e.g. Xvfb).
+from tkinter import ttk  # Themed widgets for Tkinter.
+
+# Make the application modules importable when the benchmark is run from this folder.
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Tkinter_Librery_APP folder.
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from row_hover import RowHover  # Highlighting used by the main window.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# -------------------------------------------
+SIZES = [1_000, 5_000, 20_000]  # Rows in the treeview.
+EVENTS = 200  # Hover updates timed per size with RowHover.
+LEGACY_EVENTS = 5  # Hover updates timed per size with the old full scan.
+
+
+# -------------------------------------------
+# Function: legacy_hover
+# Purpose:
+# Hover handler the main window used before RowHover: retags every row on each event.
+# -------------------------------------------
+def legacy_hover(tabla_information, my_line):
+    tabla_information.tag_configure('hover', background='#605b3e', foreground='#ffffff')
+    for i in tabla_information.get_children():
+        tabla_information.item(i, tags=('hover',) if i == my_line else ())
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Fills a treeview with every size and prints the mean cost of one hover update.
+# Rows are passed directly because identify_row needs a mapped widget.
+# -------------------------------------------
+def run():
+    root = tk.Tk()
+    root.withdraw()  # The window does not need to be visible.
+    print(f"{'rows':>10} {'RowHover (us)':>16} {'full scan (us)':>16}")
+    for size in SIZES:
+        tabla_information = ttk.Treeview(root, columns=('book_id', 'book_name'), show='headings')
+        for number in range(size):
+            tabla_information.insert('', 'end', iid=str(number), values=(number, f'Book {number}'))
+        items = tabla_information.get_children()
+
+        row_hover = RowHover(tabla_information)
+        start = time.perf_counter()
+        for event in range(EVENTS):
+            row_hover.highlight(items[(event * 7) % size])  # A different row on each event.
+        new_cost = (time.perf_counter() - start) / EVENTS * 1_000_000
+
+        start = time.perf_counter()
+        for event in range(LEGACY_EVENTS):
+            legacy_hover(tabla_information, items[(event * 7) % size])
+        legacy_cost = (time.perf_counter() - start) / LEGACY_EVENTS * 1_000_000
+
+        print(f"{size:>10} {new_cost:16.1f} {legacy_cost:16.1f}")
+        tabla_information.destroy()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+import argparse  # Command line options.
+import os  # Module to interact with the file system.
+import statistics  # Median of the timings.
+import sys  # Module to interact with the Python interpreter.
+import time  # High resolution timer.
+
+# Make the application modules importable when the benchmark is run from this folder.
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Tkinter_Librery_APP folder.
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+import credentials  # Password hashing used by the login screen.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# scrypt costs timed on this machine. Run it on the counter hardware and set
+# credentials.SCRYPT_N to the largest cost that stays under the login budget.
+# -------------------------------------------
+COSTS = [2 ** exponent for exponent in range(12, 19)]  # Values of N to time.
+REPEATS = 5  # Password checks timed per cost.
+LOGIN_BUDGET_MS = 300  # Default time allowed for the password check of one login.
+
+
+# -------------------------------------------
+# Function: time_cost
+# Purpose:
+# Returns the median time in ms of one password check with the given scrypt cost.
+# -------------------------------------------
+def time_cost(n):
+    stored = credentials.hash_password('benchmark-password', n=n)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        credentials.verify_password('benchmark-password', stored)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Prints the check time and memory of every cost and the recommended SCRYPT_N.
+# -------------------------------------------
+def run(budget_ms):
+    print(f"{'N':>10} {'memory (MiB)':>14} {'check (ms)':>12}")
+    recommended = None
+    for n in COSTS:
+        elapsed = time_cost(n)
+        memory = 128 * n * credentials.SCRYPT_R / 2 ** 20
+        marker = ' <- current' if n == credentials.SCRYPT_N else ''
+        print(f"{n:>10} {memory:14.0f} {elapsed:12.1f}{marker}")
+        if elapsed <= budget_ms:
+            recommended = n
+    if recommended:
+        print(f"Largest cost under {budget_ms} ms: SCRYPT_N = 2 ** {recommended.bit_length() - 1}")
+    else:
+        print(f"No cost fits in {budget_ms} ms on this machine.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Times the login password check for several scrypt costs.')
+    parser.add_argument('--budget-ms', type=float, default=LOGIN_BUDGET_MS, help='login latency budget')
+    run(parser.parse_args().budget_ms)
@@ -0,0 +1,126 @@
+import argparse  # Command line options.
+import multiprocessing  # Counter processes renting at the same time.
+import os  # Module to interact with the file system.
+import random  # Which books each counter rents.
+import sqlite3  # SQLite3 for database management.
+import tempfile  # Temporary folder for the synthetic database.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+import database  # Shared database connection layer.
+import rentals  # Checkout and returns.
+
+# -------------------------------------------
+# Block: Rental Benchmark Settings
+# Purpose:
+# N processes (counter PCs) check out and return a small set of popular books with few
+# copies, so most checkouts compete for the same rows. At the end the stock must add up:
+# copies on the shelf + copies on open loans = copies at the start, and never below zero.
+# -------------------------------------------
+PROCESSES = 8  # Concurrent counters.
+OPERATIONS = 300  # Checkouts and returns per counter.
+CATALOG_SIZE = 10_000  # Books in the shared file.
+HOT_BOOKS = 20  # Popular titles every counter rents.
+COPIES = 5  # Copies of each popular title at the start.
+RETURN_SHARE = 0.4  # Share of the operations that return a loan.
+
+
+# -------------------------------------------
+# Function: counter
+# Purpose:
+# Body of one counter process: rents one or two popular titles or returns one of its own
+# loans, and puts (checkouts, returns, out of stock, failed, seconds, first error) on the queue.
+# -------------------------------------------
+def counter(db_path, operations, seed, results):
+    database.DB_PATH = db_path
+    chooser = random.Random(seed)
+    customer = f'Customer {seed}'
+    my_loans = []  # Open loans of this counter.
+    checkouts = returns = out_of_stock = failed = 0
+    first_error = None
+    start = time.perf_counter()
+    for _ in range(operations):
+        try:
+            if my_loans and chooser.random() < RETURN_SHARE:
+                loan_id = my_loans.pop(chooser.randrange(len(my_loans)))
+                returns += rentals.return_loans([loan_id])
+            else:
+                books = chooser.sample(range(1, HOT_BOOKS + 1), chooser.randint(1, 2))
+                my_loans.extend(rentals.checkout(customer, [(book_id, 1) for book_id in books], staff='bench'))
+                checkouts += 1
+        except ValueError:
+            out_of_stock += 1  # Nothing was rented: the whole checkout rolled back.
+        except sqlite3.OperationalError as error:
+            failed += 1
+            first_error = first_error or str(error)
+    results.put((checkouts, returns, out_of_stock, failed, time.perf_counter() - start, first_error))
+    database.close_connection()
+
+
+# -------------------------------------------
+# Function: check_stock
+# Purpose:
+# Returns (books whose stock does not add up, lowest quantity) for the popular titles.
+# -------------------------------------------
+def check_stock():
+    rows = database.fetch_all(
+        f'SELECT book_id, {rentals.QUANTITY}, '
+        '(SELECT IFNULL(SUM(copies), 0) FROM loans WHERE loans.book_id = books.book_id AND returned_at IS NULL) '
+        'FROM books WHERE book_id <= ?', (HOT_BOOKS,)
+    )
+    wrong = [book_id for book_id, quantity, on_loan in rows if quantity + on_loan != COPIES]
+    return wrong, min(quantity for _, quantity, _ in rows)
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Starts the counter processes on a fresh catalog and prints throughput and the stock check.
+# -------------------------------------------
+def run(processes, operations):
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = create_catalog(os.path.join(folder, 'books.db'), CATALOG_SIZE)
+        use_catalog(db_path)  # Migrations and WAL mode before the counters start.
+        database.write_transaction(
+            lambda cursor: cursor.execute('UPDATE books SET book_quantity = ? WHERE book_id <= ?', (COPIES, HOT_BOOKS))
+        )
+        database.close_connection()
+
+        context = multiprocessing.get_context('spawn')  # Fresh interpreter: no shared connections.
+        results = context.Queue()
+        workers = [
+            context.Process(target=counter, args=(db_path, operations, seed, results))
+            for seed in range(processes)
+        ]
+        start = time.perf_counter()
+        for process in workers:
+            process.start()
+        reports = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        database.DB_PATH = db_path
+        wrong, lowest = check_stock()
+        database.close_connection()
+
+    checkouts, returns, out_of_stock, failed = (sum(report[index] for report in reports) for index in range(4))
+    errors = {report[5] for report in reports if report[5]}
+    print(f'{processes} counters x {operations} operations, {HOT_BOOKS} titles x {COPIES} copies')
+    print(f"  {'checkouts':<22} {checkouts:10d}")
+    print(f"  {'returns':<22} {returns:10d}")
+    print(f"  {'out of stock':<22} {out_of_stock:10d}")
+    print(f"  {'failed':<22} {failed:10d}")
+    print(f"  {'throughput (op/s)':<22} {(checkouts + returns) / elapsed:10.0f}")
+    print(f"  {'lowest stock':<22} {lowest:10d}")
+    print(f"  {'stock errors':<22} {len(wrong):10d}")
+    for error in sorted(errors):
+        print(f'  error: {error}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent checkouts and returns of a few popular books.')
+    parser.add_argument('--processes', type=int, default=PROCESSES)
+    parser.add_argument('--operations', type=int, default=OPERATIONS, help='operations per counter')
+    arguments = parser.parse_args()
+    run(arguments.processes, arguments.operations)
@@ -0,0 +1,164 @@
+import argparse  # Command line options.
+from datetime import datetime, timedelta  # Purge cut-off.
+import os  # Module to interact with the file system.
+import random  # Which books are deleted.
+import tempfile  # Temporary folder for the synthetic database.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, use_catalog  # Synthetic catalog helpers.
+import database  # Shared database connection layer.
+import catalog_cache  # In-memory catalog of the table.
+import soft_delete  # Trash, restore and purge.
+from search import build_filter, order_by, where_clause  # Catalog queries.
+from migrations import STATS_COPIES  # Copies counted by the inventory summaries.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Cost of a delete with and without the trash (hard DELETE against setting deleted_at), the
+# undo and the batched purge, on a large catalog. Afterwards checks that the inventory
+# summaries still match the books in the catalog, and that the catalog queries use the
+# partial indexes and the purge the tombstone index.
+# -------------------------------------------
+SIZE = 200_000  # Default catalog size.
+DELETES = 500  # Books deleted one by one per strategy.
+PURGE_ROWS = 20_000  # Tombstones purged in batches.
+PLANS = (
+    ('sort by name', '', '', ('book_name', False)),
+    ('search author', 'Author Name', 'tolkien', ('book_id', False)),
+    ('year range', 'Year', '1990-1999', ('book_id', False)),
+    ('language', 'Language', 'english', ('book_quantity', True)),
+)  # (label, search filter, text, sort) of the checked query plans.
+
+
+# -------------------------------------------
+# Function: per_delete
+# Purpose:
+# Runs `delete` for every book ID and returns the mean time per delete in ms.
+# -------------------------------------------
+def per_delete(delete, book_ids):
+    start = time.perf_counter()
+    for book_id in book_ids:
+        delete(book_id)
+    return (time.perf_counter() - start) * 1000 / len(book_ids)
+
+
+def hard_delete(book_id):
+    database.write_transaction(lambda cursor: cursor.execute('DELETE FROM books WHERE book_id = ?', (book_id,)))
+
+
+# -------------------------------------------
+# Function: stats_mismatches
+# Purpose:
+# Compares the trigger-maintained summaries with a full count of the books in the catalog.
+# Returns the number of rows that differ.
+# -------------------------------------------
+def stats_mismatches():
+    live = f'FROM books WHERE {database.LIVE_BOOKS}'
+    copies = STATS_COPIES.format('books')
+    expected = {('total', None): tuple(database.fetch_one(f'SELECT COUNT(*), IFNULL(SUM({copies}), 0) {live}'))}
+    for dimension, value in (('genre', 'book_genre'), ('language', 'book_language'), ('decade', 'book_year / 10 * 10')):
+        for row in database.fetch_all(f'SELECT {value}, COUNT(*), SUM({copies}) {live} GROUP BY 1'):
+            expected[(dimension, row[0])] = (row[1], row[2])
+    stored = {('total', None): tuple(database.fetch_one('SELECT titles, copies FROM stats_totals'))}
+    for row in database.fetch_all('SELECT dimension, value, titles, copies FROM stats_groups'):
+        stored[(row[0], row[1])] = (row[2], row[3])
+    return sum(1 for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+
+
+# -------------------------------------------
+# Function: catalog_ids
+# Purpose:
+# Returns the IDs of the books in the in-memory catalog.
+# -------------------------------------------
+def catalog_ids():
+    return {record.book_id for record in catalog_cache.all_books()}
+
+
+# -------------------------------------------
+# Function: query_plan
+# Purpose:
+# Returns the plan of a catalog page query as one line.
+# -------------------------------------------
+def query_plan(sql, params=()):
+    return ' / '.join(row[-1] for row in database.fetch_all(f'EXPLAIN QUERY PLAN {sql}', params))
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Prints the delete, undo and purge times, the summary check and the query plans.
+# -------------------------------------------
+def run(size):
+    deletes = min(DELETES, size // 10)  # Small catalogs: fewer deletes, so enough books remain.
+    purge_rows = min(PURGE_ROWS, size // 2)
+    chooser = random.Random(3)
+    book_ids = chooser.sample(range(1, size + 1), 2 * deletes + purge_rows)
+    hard_ids, soft_ids, purge_ids = book_ids[:deletes], book_ids[deletes:2 * deletes], book_ids[2 * deletes:]
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        use_catalog(create_catalog(os.path.join(folder, 'books.db'), size))
+        catalog_cache.all_books()  # Loaded once, then patched from the change log.
+
+        results['hard DELETE (ms/book)'] = per_delete(hard_delete, hard_ids)
+        stamps = {}
+        results['trash (ms/book)'] = per_delete(
+            lambda book_id: stamps.setdefault(book_id, soft_delete.trash_books([book_id])[0]), soft_ids
+        )
+        start = time.perf_counter()
+        trashed = soft_delete.trash_books(purge_ids)[1]
+        results[f'trash {len(trashed)} at once (ms)'] = (time.perf_counter() - start) * 1000
+        hidden = catalog_ids().isdisjoint(soft_ids + purge_ids)
+
+        restore_ids = soft_ids[:max(deletes // 2, 1)]
+        results['undo (ms/book)'] = per_delete(
+            lambda book_id: soft_delete.restore_books([book_id], stamps[book_id]), restore_ids
+        )
+        restored = catalog_ids().issuperset(restore_ids)
+        mismatches = stats_mismatches()
+
+        # Block: Batched Purge
+        # Every tombstone is old enough with a cut-off in the future.
+        cut_off = soft_delete.timestamp(datetime.now() + timedelta(days=1))
+        batches, purged, longest = 0, 0, 0.0
+        while True:
+            start = time.perf_counter()
+            count = soft_delete.purge_tombstones(cut_off)
+            longest = max(longest, (time.perf_counter() - start) * 1000)
+            if not count:
+                break
+            batches, purged = batches + 1, purged + count
+        results[f'purge {purged} in {batches} batches (ms, longest batch)'] = longest
+        left = database.fetch_one('SELECT COUNT(*) FROM books WHERE deleted_at IS NOT NULL')[0]
+        mismatches += stats_mismatches()
+
+        plans = {}
+        for label, search_filter, text, sort in PLANS:
+            where_sql, params = build_filter(search_filter, text) or ('', ())
+            plans[label] = query_plan(
+                f'SELECT {database.BOOK_COLUMNS} FROM books{where_clause(where_sql)} ORDER BY {order_by(sort)} LIMIT 50',
+                params
+            )
+        plans['purge'] = query_plan(
+            'DELETE FROM books WHERE book_id IN (SELECT book_id FROM books WHERE deleted_at < ? ORDER BY deleted_at LIMIT ?)',
+            (cut_off, soft_delete.PURGE_BATCH)
+        )
+        database.close_connection()
+        catalog_cache.clear()
+
+    print(f'{size} books, {deletes} single deletes per strategy, {purge_rows} tombstones purged')
+    for name, value in results.items():
+        print(f'  {name:<44} {value:10.3f}')
+    print(f'  trashed books hidden: {hidden}, restored books back: {restored}, tombstones left: {left}')
+    print(f'  summary rows differing from a full count: {mismatches}')
+    for label, plan in plans.items():
+        print(f'  plan {label}: {plan}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Times deletes into the trash, undo and the batched purge.')
+    parser.add_argument('--size', type=int, default=SIZE, help='catalog size in rows (at least 20)')
+    arguments = parser.parse_args()
+    if arguments.size < 20:
+        parser.error('--size must be at least 20 rows')
+    run(arguments.size)
@@ -0,0 +1,272 @@
+import time  # High resolution timer.
+STARTED_AT = time.time()  # Taken first so the probe measures its own interpreter start.
+
+import argparse  # Command line options.
+import json  # Machine-readable report.
+import os  # Module to interact with the file system.
+import platform  # Machine description for the report.
+import shutil  # Finds Xvfb and copies the database.
+import statistics  # Medians of the runs.
+import subprocess  # Starts the probes and the virtual display.
+import sys  # Module to interact with the Python interpreter.
+import tempfile  # Temporary folder for the database copy.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Every entry point is started in a fresh interpreter RUNS times, plus one run under the
+# import profiler. Each probe reports, in milliseconds, the interpreter start, the imports,
+# the window construction and the time from process start to the first database query, the
+# first paint and (main window) the first rows.
+# -------------------------------------------
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Tkinter_Librery_APP folder.
+ENTRY_POINTS = ['splash', 'login', 'main']  # splash.py, login.py and main_data.py.
+RUNS = 5  # Fresh processes per entry point.
+PROBE_TIMEOUT_S = 60  # A probe that takes longer is reported as failed.
+IMPORT_PROFILE_TOP = 15  # Slowest modules listed by the import profiler.
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')  # Default report folder.
+
+
+# -------------------------------------------
+# Function: probe
+# Purpose:
+# Runs in the child process: imports the GUI modules, builds one screen on a new window and
+# prints the milestones as one JSON line once the screen is painted and its data is loaded.
+# `spawned_at` is the wall clock time at which the parent started the process.
+# -------------------------------------------
+def probe(entry_point, spawned_at, db_path):
+    milestones = {'interpreter_start': (STARTED_AT - spawned_at) * 1000}
+    sys.path.insert(0, APP_DIR)
+
+    def elapsed():
+        """Milliseconds since the parent started this process."""
+        return (time.time() - spawned_at) * 1000
+
+    def timed_import(name, import_module):
+        """Imports a module and stores the time it took."""
+        start = time.perf_counter()
+        import_module()
+        milestones[name] = (time.perf_counter() - start) * 1000
+
+    timed_import('import_customtkinter', lambda: __import__('customtkinter'))
+    timed_import('import_pil', lambda: __import__('PIL.Image'))
+    timed_import('import_ttk', lambda: __import__('tkinter.ttk'))
+    screen_module = {'splash': 'splash', 'login': 'login', 'main': 'main_data'}[entry_point]
+    timed_import('import_screen', lambda: __import__(screen_module))
+
+    import customtkinter as ctk
+    import database
+    import functions
+    import virtual_table
+    database.DB_PATH = db_path  # Never touch the real database.
+
+    # Block: Record Database Milestones
+    # The first query of any kind, and the first rows shown in the catalog table.
+    def record_once(name):
+        if name not in milestones:
+            milestones[name] = elapsed()
+
+    def wrap_query(function):
+        def wrapped(*args, **kwargs):
+            result = function(*args, **kwargs)
+            record_once('first_db_query')
+            return result
+        return wrapped
+
+    for name in ('open_connection', 'fetch_all', 'fetch_one'):
+        setattr(database, name, wrap_query(getattr(database, name)))
+
+    def show_book_rows(*args, **kwargs):
+        functions.show_book_rows(*args, **kwargs)
+        record_once('first_rows')
+
+    virtual_table.show_book_rows = show_book_rows
+    screen = sys.modules[screen_module]
+    if hasattr(screen, 'show_book_rows'):
+        screen.show_book_rows = show_book_rows
+
+    # Block: Build the Screen
+    app_root = ctk.CTk()
+    start = time.perf_counter()
+    if entry_point == 'splash':
+        screen.splash_screen_main(app_root, lambda: record_once('ready'))
+    elif entry_point == 'login':
+        screen.login_screen_main(app_root, lambda username: None)
+    else:
+        screen.main_window(app_root, 'benchmark')
+    milestones['window_construction'] = (time.perf_counter() - start) * 1000
+
+    # Block: Wait for the First Paint and the Data
+    waiting_for = {'splash': ('first_paint', 'ready'), 'login': ('first_paint',),
+                   'main': ('first_paint', 'first_rows')}[entry_point]
+
+    def on_expose(event):
+        if event.widget is app_root:
+            app_root.update_idletasks()  # Finish drawing the widgets.
+            record_once('first_paint')
+
+    def check_done():
+        if all(name in milestones for name in waiting_for):
+            app_root.destroy()
+        else:
+            app_root.after(5, check_done)
+
+    app_root.bind('<Expose>', on_expose, add='+')
+    app_root.after(5, check_done)
+    app_root.mainloop()
+    print(json.dumps(milestones))
+
+
+# -------------------------------------------
+# Function: start_virtual_display
+# Purpose:
+# Starts Xvfb on a free display number and returns (process, display), or (None, None) when
+# a display is already available or the platform does not use X (Windows).
+# -------------------------------------------
+def start_virtual_display(force):
+    if sys.platform.startswith('win') or (os.environ.get('DISPLAY') and not force):
+        return None, None
+    if shutil.which('Xvfb') is None:
+        sys.exit('Xvfb is required to run this benchmark without a display.')
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        ['Xvfb', '-displayfd', str(write_fd), '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as display_pipe:
+        display = ':' + display_pipe.readline().strip()  # Written by Xvfb once it is ready.
+    return process, display
+
+
+# -------------------------------------------
+# Function: prepare_database
+# Purpose:
+# Copies the application database into `folder` and migrates the copy, so the probes measure
+# a normal start and not a one-time schema upgrade.
+# -------------------------------------------
+def prepare_database(folder):
+    sys.path.insert(0, APP_DIR)
+    import database
+    import migrations
+    db_path = os.path.join(folder, 'bookstore_management.db')
+    shutil.copyfile(os.path.join(APP_DIR, 'db', 'bookstore_management.db'), db_path)
+    conn = database.open_connection(db_path)
+    migrations.apply_migrations(conn)
+    conn.close()
+    return db_path
+
+
+# -------------------------------------------
+# Function: run_probe
+# Purpose:
+# Starts one probe process and returns its milestones, or None if it failed.
+# With profile_imports the child runs with -X importtime and the profile is returned too.
+# -------------------------------------------
+def run_probe(entry_point, db_path, env, profile_imports=False):
+    command = [sys.executable]
+    if profile_imports:
+        command += ['-X', 'importtime']
+    command += [os.path.abspath(__file__), '--probe', entry_point, '--db', db_path]
+    spawned_at = time.time()
+    try:
+        result = subprocess.run(
+            command + ['--spawned-at', repr(spawned_at)], cwd=APP_DIR, env=env,
+            capture_output=True, text=True, timeout=PROBE_TIMEOUT_S
+        )  # cwd matters: the application uses paths relative to its folder.
+    except subprocess.TimeoutExpired:
+        return None, None
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        print(result.stderr.strip()[-2000:], file=sys.stderr)
+        return None, None
+    return json.loads(lines[-1]), (parse_import_profile(result.stderr) if profile_imports else None)
+
+
+# -------------------------------------------
+# Function: parse_import_profile
+# Purpose:
+# Summarizes -X importtime output: the IMPORT_PROFILE_TOP slowest top-level imports by
+# cumulative time (what each import statement costs) and the modules with the most time
+# spent in their own code.
+# -------------------------------------------
+def parse_import_profile(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            'module': name.strip(),
+            'top_level': not name.startswith('  '),  # Nested imports are indented by two spaces per level.
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'self_ms': int(self_us) / 1000,
+        })
+    top_level = [module for module in modules if module.pop('top_level')]
+    return {
+        'top_level': sorted(top_level, key=lambda module: module['cumulative_ms'], reverse=True)[:IMPORT_PROFILE_TOP],
+        'self_time': sorted(modules, key=lambda module: module['self_ms'], reverse=True)[:IMPORT_PROFILE_TOP],
+    }
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Probes every entry point, prints a summary table and writes the JSON report.
+# -------------------------------------------
+def run(runs, output, force_xvfb):
+    xvfb, display = start_virtual_display(force_xvfb)
+    env = dict(os.environ, DISPLAY=display) if display else dict(os.environ)
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'virtual_display': bool(xvfb),
+        'runs': runs,
+        'entry_points': {},
+    }
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            db_path = prepare_database(folder)
+            for entry_point in ENTRY_POINTS:
+                _, import_profile = run_probe(entry_point, db_path, env, profile_imports=True)
+                samples = [run_probe(entry_point, db_path, env)[0] for _ in range(runs)]
+                samples = [sample for sample in samples if sample is not None]
+                names = sorted({name for sample in samples for name in sample})
+                report['entry_points'][entry_point] = {
+                    'failed_runs': runs - len(samples),
+                    'median_ms': {
+                        name: statistics.median(sample[name] for sample in samples if name in sample)
+                        for name in names
+                    },
+                    'samples_ms': samples,
+                    'import_profile': import_profile,
+                }
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    for entry_point, result in report['entry_points'].items():
+        print(f"{entry_point} ({result['failed_runs']} failed runs)")
+        for name, value in result['median_ms'].items():
+            print(f"  {name:<24} {value:10.1f} ms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Startup time-to-interactive benchmark.')
+    parser.add_argument('--runs', type=int, default=RUNS, help='fresh processes per entry point')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, f"startup_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    parser.add_argument('--xvfb', action='store_true', help='use a virtual display even if DISPLAY is set')
+    parser.add_argument('--probe', choices=ENTRY_POINTS, help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--spawned-at', type=float, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.probe:
+        probe(arguments.probe, arguments.spawned_at, arguments.db)
+    else:
+        run(arguments.runs, arguments.output, arguments.xvfb)
@@ -0,0 +1,240 @@
+import argparse  # Command line options.
+import itertools  # Unique names for the headless treeviews.
+import json  # Machine-readable report.
+import os  # Module to interact with the file system.
+import platform  # Machine description for the report.
+import statistics  # Medians of the timings.
+import sys  # Module to interact with the Python interpreter.
+import tempfile  # Temporary folder for the synthetic databases.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, synthetic_rows, use_catalog  # Synthetic catalog helpers.
+from bench_delete import LEGACY_RENUMBER  # Renumbering statement delete_item used to run.
+import database  # Shared database connection layer.
+import functions  # refresh_table, delete_book and show_book_rows.
+from addBookWindow import insert_book  # Insert used by the "Add Book" window.
+from search import build_filter, search_books  # Search panel backend.
+from virtual_table import load_window  # Data side of the virtual table.
+from inventory_stats import load_inventory_stats  # Inventory dashboard backend.
+
+# -------------------------------------------
+# Block: Benchmark Settings
+# Purpose:
+# Catalog sizes, repetitions and the operations that are too slow to time on big catalogs
+# (the old renumbering delete and the load of the whole table into the widget).
+# -------------------------------------------
+SIZES = [1_000, 100_000, 1_000_000]  # Catalog sizes to measure.
+REPEATS = 5  # Timed runs per operation (the median is reported).
+VISIBLE_ROWS = 25  # Rows shown by the virtual table in a maximized main window.
+LEGACY_MAX_SIZE = 5_000  # Largest catalog the old renumbering delete is timed on.
+FULL_LOAD_MAX_SIZE = 100_000  # Largest catalog loaded whole into the widget.
+SEARCHES = [
+    ('Book Name', 'shadow riv'),  # Prefix words on the full-text index.
+    ('Author Name', 'tolstoy'),
+    ('', 'garden'),  # No filter: name, author and publisher.
+    ('ISBN', '978-0000000500'),
+    ('Year', '1990-1999'),
+    ('Language', 'es'),
+]  # (filter, text) pairs typed in the search panel.
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')  # Default report folder.
+
+_tree_names = itertools.count(1)  # Names of the headless treeviews.
+
+
+# -------------------------------------------
+# Class: HeadlessTreeview
+# Purpose:
+# Stand-in for ttk.Treeview with the calls show_book_rows makes, so the Python side of a
+# refresh can be timed without a display. Keeps the items in display order like Tk does.
+# -------------------------------------------
+class HeadlessTreeview:
+    def __init__(self):
+        self.name = f'.headless{next(_tree_names)}'  # Unique like a Tk widget path.
+        self.order = []  # Item IDs in display order.
+        self.values = {}  # Item ID -> values.
+
+    def __str__(self):
+        return self.name
+
+    def get_children(self, item=''):
+        return tuple(self.order)
+
+    def delete(self, *items):
+        removed = set(items)
+        self.order = [item for item in self.order if item not in removed]
+        for item in items:
+            del self.values[item]
+
+    def insert(self, parent, index, iid, values):
+        self.order.insert(len(self.order) if index == 'end' else index, iid)
+        self.values[iid] = values
+
+    def move(self, item, parent, index):
+        self.order.remove(item)
+        self.order.insert(index, item)
+
+    def item(self, item, values=None):
+        self.values[item] = values
+
+
+# -------------------------------------------
+# Function: make_treeview
+# Purpose:
+# Returns a real ttk.Treeview when a Tk root is given (needs a display, e.g. Xvfb), or a
+# HeadlessTreeview otherwise.
+# -------------------------------------------
+def make_treeview(tk_root):
+    if tk_root is None:
+        return HeadlessTreeview()
+    from tkinter import ttk
+    return ttk.Treeview(tk_root, columns=tuple(range(10)), show='headings')
+
+
+# -------------------------------------------
+# Function: timed
+# Purpose:
+# Runs `function` `repeats` times (calling `setup` before each run, untimed) and returns the
+# median duration in milliseconds.
+# -------------------------------------------
+def timed(function, repeats=REPEATS, setup=None):
+    durations = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+# -------------------------------------------
+# Function: legacy_insert
+# Purpose:
+# Insert path of the "Add Book" window before AUTOINCREMENT: MAX(book_id) + 1, then insert.
+# -------------------------------------------
+def legacy_insert(values):
+    max_id = database.fetch_one('SELECT MAX(book_id) FROM books')[0]
+    with database.transaction() as cursor:
+        cursor.execute(
+            'INSERT INTO books (book_id, book_name, book_publisher, author_name, book_year, book_genre, '
+            'book_language, book_ISBN, book_quantity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            ((max_id or 0) + 1,) + values
+        )
+
+
+# -------------------------------------------
+# Function: bench_size
+# Purpose:
+# Times every data path on a synthetic catalog of `size` rows and returns {name: ms}.
+# -------------------------------------------
+def bench_size(folder, size, tk_root):
+    start = time.perf_counter()
+    db_path = create_catalog(os.path.join(folder, f'books_{size}.db'), size)
+    use_catalog(db_path)  # Also runs the migrations (full-text index, indexes).
+    results = {'setup_s': round(time.perf_counter() - start, 2)}
+
+    # Block: Initial Load (populate_treeview)
+    # Virtual mode: count + first pages + show them. Full mode: every row into the widget.
+    def virtual_load(tree):
+        total_rows, first_row, pages, _ = load_window('', (), 0, VISIBLE_ROWS)
+        rows = [row for page in pages.values() for row in page][:VISIBLE_ROWS]
+        functions.show_book_rows(tree, rows)
+
+    results['populate_virtual_ms'] = timed(lambda: virtual_load(make_treeview(tk_root)))
+    if size <= FULL_LOAD_MAX_SIZE:
+        results['populate_full_ms'] = timed(lambda: functions.refresh_table(make_treeview(tk_root)), repeats=1)
+
+    # Block: Refresh (refresh_treeview / refresh_table)
+    # A refresh after one row changed: only that row is touched in the widget. The change is
+    # committed, so the catalog cache sees a new data_version and re-reads the changed book.
+    tree = make_treeview(tk_root)
+    virtual_load(tree)
+    change = lambda: database.write_transaction(
+        lambda cursor: cursor.execute('UPDATE books SET book_quantity = book_quantity + 1 WHERE book_id = 1'))
+    results['refresh_virtual_ms'] = timed(lambda: virtual_load(tree), setup=change)
+    if size <= FULL_LOAD_MAX_SIZE:
+        tree = make_treeview(tk_root)
+        functions.refresh_table(tree)
+        results['refresh_full_ms'] = timed(lambda: functions.refresh_table(tree), setup=change)
+
+    # Block: Delete (delete_item)
+    book_ids = iter(range(2, size, max(size // 50, 1)))  # Spread across the catalog.
+    results['delete_ms'] = timed(lambda: functions.delete_book(next(book_ids)))
+    if size <= LEGACY_MAX_SIZE:
+        def legacy_delete():
+            with database.transaction() as cursor:
+                cursor.execute('DELETE FROM books WHERE book_id = ?', (next(book_ids),))
+                cursor.execute(LEGACY_RENUMBER)
+        results['delete_legacy_renumber_ms'] = timed(legacy_delete, repeats=3)
+
+    # Block: Insert (submit_book_info)
+    new_rows = synthetic_rows(20, seed=size)
+    results['insert_ms'] = timed(lambda: insert_book(tuple(map(str, next(new_rows)))))
+    results['insert_legacy_next_id_ms'] = timed(lambda: legacy_insert(tuple(map(str, next(new_rows)))))
+
+    # Block: Search
+    # First page of the virtual table for each search, and the whole result as a list.
+    for search_filter, text in SEARCHES:
+        where_sql, params = build_filter(search_filter, text)
+        name = (search_filter or 'all').lower().replace(' ', '_')
+        results[f'search_{name}_ms'] = timed(lambda: load_window(where_sql, params, 0, VISIBLE_ROWS))
+        results[f'search_{name}_all_rows_ms'] = timed(lambda: search_books(search_filter, text), repeats=3)
+
+    # Block: Inventory Statistics
+    # Summary tables kept by triggers, against the GROUP BY queries they replace.
+    copies = 'SUM(CAST(IFNULL(book_quantity, 0) AS INTEGER))'
+
+    def group_by_stats():
+        database.fetch_one(f'SELECT COUNT(*), {copies} FROM books')
+        for value in ('book_genre', 'book_language', 'book_year / 10 * 10'):
+            database.fetch_all(f'SELECT {value}, COUNT(*), {copies} FROM books GROUP BY 1')
+
+    results['stats_summary_ms'] = timed(load_inventory_stats)
+    results['stats_group_by_ms'] = timed(group_by_stats, repeats=3)
+
+    database.close_connection()
+    os.remove(db_path)  # Free the disk space before the next size.
+    return results
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Benchmarks every size, prints the results and writes the JSON report.
+# -------------------------------------------
+def run(sizes, output, use_tk):
+    tk_root = None
+    if use_tk:
+        import tkinter as tk
+        tk_root = tk.Tk()
+        tk_root.withdraw()  # The window does not need to be visible.
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'sqlite': database.sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'widget': 'ttk.Treeview' if tk_root else 'HeadlessTreeview',
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            results = bench_size(folder, size, tk_root)
+            report['sizes'][str(size)] = results
+            print(f'{size} rows')
+            for name, value in results.items():
+                print(f'  {name:<36} {value:12.3f}')
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f'Report written to {output}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Times the catalog data paths on synthetic catalogs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='catalog sizes in rows')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, f"suite_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    parser.add_argument('--tk', action='store_true', help='use a real ttk.Treeview (needs a display, e.g. Xvfb)')
+    arguments = parser.parse_args()
+    run(arguments.sizes, arguments.output, arguments.tk)
@@ -0,0 +1,136 @@
+import argparse  # Command line options.
+import multiprocessing  # Writer processes, like several counter PCs.
+import os  # Module to interact with the file system.
+import random  # Which book each operation touches.
+import sqlite3  # SQLite3 for database management.
+import tempfile  # Temporary folder for the synthetic database.
+import time  # High resolution timer.
+
+from synthetic_catalog import create_catalog, synthetic_rows, use_catalog  # Synthetic catalog helpers.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Stress Test Settings
+# Purpose:
+# N processes write to one database file at the same time (insert, update, delete, like the
+# counter PCs adding, renting and deleting books). The "coordinated" mode uses the normal
+# write path (BEGIN IMMEDIATE, busy timeout, retries with backoff); the "legacy" mode reads
+# and then writes in a deferred transaction without retries, as the windows used to.
+# -------------------------------------------
+PROCESSES = 8  # Concurrent writer processes.
+OPERATIONS = 300  # Operations per process.
+CATALOG_SIZE = 10_000  # Books in the shared file.
+INSERT_QUERY = (
+    'INSERT INTO books (book_name, book_publisher, author_name, book_year, book_genre, '
+    'book_language, book_ISBN, book_quantity) VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)  # Same insert as the "Add Book" window.
+
+
+# -------------------------------------------
+# Function: operation
+# Purpose:
+# Runs operation number `index` on a cursor: insert `values`, or update or delete `book_id`.
+# -------------------------------------------
+def operation(cursor, index, values, book_id):
+    kind = index % 3
+    if kind == 0:
+        cursor.execute(INSERT_QUERY, values)
+    elif kind == 1:
+        cursor.execute('UPDATE books SET book_quantity = book_quantity + 1 WHERE book_id = ?', (book_id,))
+    else:
+        cursor.execute('DELETE FROM books WHERE book_id = ?', (book_id,))
+
+
+# -------------------------------------------
+# Function: legacy_operation
+# Purpose:
+# The same operation in a deferred transaction that reads before it writes, without retries.
+# -------------------------------------------
+def legacy_operation(conn, *args):
+    cursor = conn.cursor()
+    try:
+        cursor.execute('BEGIN')  # Deferred: no lock until the first write.
+        cursor.execute('SELECT MAX(book_id) FROM books').fetchone()  # Read first (MAX(book_id) + 1 era).
+        operation(cursor, *args)  # Upgrading to a write lock can fail at once.
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+# -------------------------------------------
+# Function: writer
+# Purpose:
+# Body of one writer process: runs the operations and puts (done, failed, retries, seconds,
+# first error) on the result queue.
+# -------------------------------------------
+def writer(db_path, mode, operations, busy_timeout_ms, seed, results):
+    database.DB_PATH = db_path
+    database.BUSY_TIMEOUT_MS = busy_timeout_ms
+    rows = (tuple(map(str, row)) for row in synthetic_rows(operations, seed=seed))
+    chooser = random.Random(seed)
+    conn = database.get_connection()
+    done = failed = 0
+    first_error = None
+    start = time.perf_counter()
+    for index in range(operations):
+        args = (index, next(rows), chooser.randint(1, CATALOG_SIZE))  # Same data on a retry.
+        try:
+            if mode == 'legacy':
+                legacy_operation(conn, *args)
+            else:
+                database.write_transaction(operation, *args)
+            done += 1
+        except sqlite3.OperationalError as error:
+            failed += 1
+            first_error = first_error or str(error)
+    results.put((done, failed, database.write_retries, time.perf_counter() - start, first_error))
+    database.close_connection()
+
+
+# -------------------------------------------
+# Function: run
+# Purpose:
+# Starts the writer processes on a fresh catalog and prints throughput and failure rate.
+# -------------------------------------------
+def run(mode, processes, operations, busy_timeout_ms):
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = create_catalog(os.path.join(folder, 'books.db'), CATALOG_SIZE)
+        use_catalog(db_path)  # Migrations and WAL mode before the writers start.
+        database.close_connection()
+
+        context = multiprocessing.get_context('spawn')  # Fresh interpreter: no shared connections.
+        results = context.Queue()
+        workers = [
+            context.Process(target=writer, args=(db_path, mode, operations, busy_timeout_ms, seed, results))
+            for seed in range(processes)
+        ]
+        start = time.perf_counter()
+        for process in workers:
+            process.start()
+        reports = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+    done = sum(report[0] for report in reports)
+    failed = sum(report[1] for report in reports)
+    retries = sum(report[2] for report in reports)
+    errors = {report[4] for report in reports if report[4]}
+    print(f'{mode}: {processes} processes x {operations} operations, busy timeout {busy_timeout_ms} ms')
+    print(f"  {'committed':<20} {done:10d}")
+    print(f"  {'failed':<20} {failed:10d} ({failed / (done + failed):.1%})")
+    print(f"  {'retries':<20} {retries:10d}")
+    print(f"  {'throughput (op/s)':<20} {done / elapsed:10.0f}")
+    for error in sorted(errors):
+        print(f'  error: {error}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent writer processes on one database file.')
+    parser.add_argument('--mode', choices=('coordinated', 'legacy'), default='coordinated')
+    parser.add_argument('--processes', type=int, default=PROCESSES)
+    parser.add_argument('--operations', type=int, default=OPERATIONS, help='operations per process')
+    parser.add_argument('--busy-timeout-ms', type=int, default=database.BUSY_TIMEOUT_MS)
+    arguments = parser.parse_args()
+    run(arguments.mode, arguments.processes, arguments.operations, arguments.busy_timeout_ms)
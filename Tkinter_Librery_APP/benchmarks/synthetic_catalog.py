@@ -0,0 +1,102 @@
+import os  # Module to interact with the file system.
+import random  # Pseudo-random values for the synthetic rows.
+import sys  # Module to interact with the Python interpreter.
+
+# Make the application modules importable when a benchmark is run from this folder.
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Tkinter_Librery_APP folder.
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+import database  # Shared database connection layer.
+import catalog_cache  # In-memory catalog, cleared when the file changes.
+import book_details  # Cached details and covers, cleared when the file changes.
+
+# -------------------------------------------
+# Block: Synthetic Data Settings
+# Purpose:
+# Schema and value pools used to generate catalogs that look like the real one.
+# -------------------------------------------
+BOOKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "books" (
+    "book_id"	INTEGER,
+    "book_name"	TEXT NOT NULL,
+    "book_publisher"	TEXT NOT NULL,
+    "author_name"	TEXT NOT NULL,
+    "book_year"	INTEGER NOT NULL,
+    "book_genre"	TEXT NOT NULL,
+    "book_language"	TEXT NOT NULL,
+    "book_ISBN"	TEXT NOT NULL,
+    "book_quantity"	BLOB,
+    PRIMARY KEY("book_id" AUTOINCREMENT)
+);
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_usuario INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre_usuario TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+"""  # Same definition as the books and usuarios tables of db/bookstore_management.db.
+
+GENRES = ['Fiction', 'Fantasy', 'Science fiction', 'Horror', 'Romance', 'Historical fiction', 'Drama', 'Other']
+LANGUAGES = ['EN', 'ES', 'RU', 'IT', 'HI', 'AR', 'PT', 'JA', 'CM', 'FR', 'Other']
+WORDS = ['Shadow', 'River', 'Empire', 'Garden', 'Winter', 'Silent', 'Golden', 'Night', 'Stone', 'Letters',
+         'Ocean', 'Forgotten', 'House', 'Journey', 'Fire', 'Glass', 'Crown', 'Storm', 'Memory', 'City']
+FIRST_NAMES = ['Anna', 'Miguel', 'Fyodor', 'Jane', 'Haruki', 'Chinua', 'Isabel', 'Leo', 'Toni', 'Gabriel']
+LAST_NAMES = ['Smith', 'Garcia', 'Ivanov', 'Rossi', 'Tanaka', 'Achebe', 'Allende', 'Tolstoy', 'Morrison', 'Marquez']
+PUBLISHERS = ['Penguin', 'Vintage', 'HarperCollins', 'Anagrama', 'Alfaguara', 'Faber', 'Kodansha', 'Gallimard']
+
+
+# -------------------------------------------
+# Function: synthetic_rows
+# Purpose:
+# Generates book rows (without book_id) with a fixed seed so every run sees the same data.
+# -------------------------------------------
+def synthetic_rows(count, seed=1234):
+    rng = random.Random(seed)  # Deterministic generator.
+    for number in range(count):
+        yield (
+            f"{rng.choice(WORDS)} {rng.choice(WORDS)} {number}",  # Book name.
+            rng.choice(PUBLISHERS),  # Publisher.
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",  # Author name.
+            rng.randint(1600, 2024),  # Year.
+            rng.choice(GENRES),  # Genre.
+            rng.choice(LANGUAGES),  # Language.
+            f"978{number:010d}",  # ISBN.
+            rng.randint(0, 50),  # Quantity.
+        )
+
+
+# -------------------------------------------
+# Function: create_catalog
+# Purpose:
+# Creates a fresh database file with the books table filled with `count` synthetic rows.
+# Returns the path of the file.
+# -------------------------------------------
+def create_catalog(db_path, count):
+    if os.path.exists(db_path):
+        os.remove(db_path)  # Always start from an empty file.
+    conn = database.open_connection(db_path)
+    conn.executescript(BOOKS_SCHEMA)
+    with conn:
+        conn.executemany(
+            'INSERT INTO books (book_name, book_publisher, author_name, book_year, book_genre, '
+            'book_language, book_ISBN, book_quantity) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            synthetic_rows(count)
+        )  # Bulk insert in one transaction.
+    conn.close()
+    return db_path
+
+
+# -------------------------------------------
+# Function: use_catalog
+# Purpose:
+# Points the shared connection of the application at the given database file and forgets
+# what the in-memory caches read from the previous one.
+# -------------------------------------------
+def use_catalog(db_path):
+    database.close_connection()  # Drop the connection to the previous file.
+    database.DB_PATH = db_path
+    catalog_cache.clear()
+    book_details.clear()
+    return database.get_connection()
@@ -0,0 +1,265 @@
+import os  # Module to interact with the file system.
+import threading  # The Tk thread and the database worker share the caches.
+from collections import OrderedDict  # Ordered mappings used as small LRU caches.
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+from tkinter import ttk  # Themed widgets for Tkinter.
+from PIL import Image  # Module to load and handle images.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Book Details Settings
+# Purpose:
+# The details of a book (full record, copies on loan, loan history, cover) are only read
+# when the "Book Information" window shows it. The last books shown are kept in two small
+# LRU caches, so going up and down the catalog does not query or decode them again: the
+# details until the next commit (database.data_version()), the covers until their file changes.
+# -------------------------------------------
+MAX_CACHED_DETAILS = 64  # Books whose details are kept.
+MAX_CACHED_COVERS = 32  # Decoded covers kept (about 115 KiB each).
+COVERS_DIR = './images/covers'  # Optional covers, named after the book ID (12.jpg).
+COVER_EXTENSIONS = ('.jpg', '.jpeg', '.png')  # Cover file types looked for.
+COVER_SIZE = (160, 240)  # Largest size a cover is shown at.
+HISTORY_ROWS = 20  # Newest loans listed.
+DETAILS_KEY = 'book_details'  # Worker key: a newer selection replaces an older one.
+DETAIL_FIELDS = (
+    ('Author', 3), ('Publisher', 2), ('Year', 4), ('Genre', 5), ('Language', 6), ('ISBN', 7), ('In stock', 8)
+)  # (label, index in the book row) of the lines under the title.
+
+_lock = threading.Lock()  # Guards the caches.
+_details = OrderedDict()  # book_id -> (data_version, details).
+_covers = OrderedDict()  # (path, mtime_ns) -> resized PIL image.
+
+
+# -------------------------------------------
+# Function: _remember
+# Purpose:
+# Stores `value` under `key` in an LRU cache, dropping the least recently used entries.
+# -------------------------------------------
+def _remember(cache, key, value, limit):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+# -------------------------------------------
+# Function: cover_file
+# Purpose:
+# Returns (path, mtime_ns) of the cover of a book, or None when it has no cover.
+# -------------------------------------------
+def cover_file(book_id):
+    for extension in COVER_EXTENSIONS:
+        path = os.path.join(COVERS_DIR, f'{book_id}{extension}')
+        try:
+            return path, os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+    return None
+
+
+# -------------------------------------------
+# Function: load_cover
+# Purpose:
+# Returns the cover of a book fitted into COVER_SIZE, or None. With `cached_only`, returns
+# False instead of decoding a cover that is not in the cache. An unreadable file counts as
+# no cover.
+# -------------------------------------------
+def load_cover(book_id, cached_only=False):
+    key = cover_file(book_id)
+    if key is None:
+        return None
+    with _lock:
+        image = _covers.get(key)
+        if image is not None:
+            _covers.move_to_end(key)
+            return image
+    if cached_only:
+        return False
+    try:
+        with Image.open(key[0]) as source:
+            source.draft('RGB', COVER_SIZE)  # JPEG: decode directly at a reduced scale.
+            image = source.convert('RGB')
+        image.thumbnail(COVER_SIZE, Image.LANCZOS)  # Keeps the proportions.
+    except (OSError, ValueError) as err:
+        print(f"Error loading the cover of book {book_id}: {err}")
+        return None
+    with _lock:
+        _remember(_covers, key, image, MAX_CACHED_COVERS)
+    return image
+
+
+# -------------------------------------------
+# Function: load_details
+# Purpose:
+# Returns {'book', 'on_loan', 'history', 'cover'} for a book, or None if it no longer exists.
+# 'book' is the catalog row, 'history' the newest loans as (customer, copies, checked out,
+# due, returned). With `cached_only`, returns False instead of reading anything from disk.
+# -------------------------------------------
+def load_details(book_id, cached_only=False):
+    version = database.data_version()
+    with _lock:
+        entry = _details.get(book_id)
+        details = entry[1] if entry is not None and entry[0] == version else None
+        if details is not None:
+            _details.move_to_end(book_id)
+    if details is None:
+        if cached_only:
+            return False
+        book = database.fetch_one(
+            f'SELECT {database.BOOK_COLUMNS} FROM books WHERE book_id = ? AND {database.LIVE_BOOKS}', (book_id,)
+        )
+        if book is None:
+            return None  # Deleted in the meantime.
+        on_loan = database.fetch_one(
+            'SELECT IFNULL(SUM(copies), 0) FROM loans WHERE book_id = ? AND returned_at IS NULL', (book_id,)
+        )[0]
+        history = database.fetch_all(
+            'SELECT customer, copies, checked_out_at, due_at, returned_at FROM loans '
+            'WHERE book_id = ? ORDER BY checked_out_at DESC LIMIT ?', (book_id, HISTORY_ROWS)
+        )
+        details = {'book': tuple(book), 'on_loan': on_loan, 'history': [tuple(row) for row in history]}
+        with _lock:
+            _remember(_details, book_id, (version, details), MAX_CACHED_DETAILS)
+
+    cover = load_cover(book_id, cached_only)
+    if cover is False:
+        return False
+    return dict(details, cover=cover)
+
+
+# -------------------------------------------
+# Function: clear
+# Purpose:
+# Forgets the cached details and covers.
+# -------------------------------------------
+def clear():
+    with _lock:
+        _details.clear()
+        _covers.clear()
+
+
+# -------------------------------------------
+# Function: book_info_window
+# Purpose:
+# Opens the "Book Information" window. It is not modal and follows the selection of the
+# catalog while it is open; only one is open at a time. Cached books are shown at once,
+# the others are loaded on the worker.
+# -------------------------------------------
+def book_info_window(main_root, tabla_information, worker):
+    """
+    Parameters:
+    - main_root: The main application window.
+    - tabla_information: The catalog treeview whose selected book is shown.
+    - worker: DatabaseWorker reading the details off the Tk thread.
+    """
+    open_window = getattr(main_root, 'book_info_window', None)
+    if open_window is not None and open_window.winfo_exists():
+        open_window.lift()  # Already open: bring it to the front.
+        return
+
+    # -------------------------------------------
+    # Block: Initialize "Book Information" Window
+    # -------------------------------------------
+    info_root = ctk.CTkToplevel(main_root)  # "Book Information" window instance.
+    info_root.geometry('560x520')  # Set window size.
+    info_root.title('Book Information')  # Set window title.
+    info_root.transient(main_root)  # Stays above the main window.
+    info_root.after(200, lambda: info_root.iconbitmap('./images/icobookstore.ico'))  # Set window icon after 200ms.
+    main_root.book_info_window = info_root
+
+    cover_label = ctk.CTkLabel(info_root, text='No cover', width=COVER_SIZE[0], height=COVER_SIZE[1], fg_color='#605b3e')
+    cover_label.grid(row=0, column=0, padx=10, pady=10, sticky='n')
+    fields_frame = ctk.CTkFrame(info_root, fg_color='transparent')
+    fields_frame.grid(row=0, column=1, padx=(0, 10), pady=10, sticky='nw')
+    title_label = ctk.CTkLabel(fields_frame, text='Select a book', font=('Cascadia Code', 16, 'bold'),
+                               wraplength=340, justify='left')
+    title_label.grid(row=0, column=0, columnspan=2, sticky='w', pady=(0, 5))
+    value_labels = []
+    for row, (label, _) in enumerate(DETAIL_FIELDS + (('On loan', None),), start=1):
+        ctk.CTkLabel(fields_frame, text=f'{label}:', font=('Cascadia Code', 13, 'bold')).grid(row=row, column=0, sticky='w')
+        value_label = ctk.CTkLabel(fields_frame, text='', font=('Cascadia Code', 13), wraplength=250, justify='left')
+        value_label.grid(row=row, column=1, sticky='w', padx=(8, 0))
+        value_labels.append(value_label)
+
+    history_table = ttk.Treeview(
+        info_root, columns=('customer', 'copies', 'checked_out_at', 'due_at', 'returned_at'), show='headings', height=8
+    )  # Newest loans of the book.
+    for column, title, width in (('customer', 'Customer', 160), ('copies', 'Copies', 60), ('checked_out_at', 'Out', 100),
+                                 ('due_at', 'Due', 100), ('returned_at', 'Returned', 100)):
+        history_table.heading(column, text=title)
+        history_table.column(column, width=width, anchor='w' if column == 'customer' else 'center')
+    history_table.grid(row=1, column=0, columnspan=2, padx=10, pady=(0, 10), sticky='nsew')
+    info_root.grid_rowconfigure(1, weight=1)
+    info_root.grid_columnconfigure(1, weight=1)
+
+    # -------------------------------------------
+    # Function: show_details
+    # Purpose:
+    # Fills the window with the details of a book (None: the book was deleted).
+    # -------------------------------------------
+    def show_details(details):
+        if not info_root.winfo_exists():
+            return  # Closed while loading.
+        history_table.delete(*history_table.get_children())
+        if details is None:
+            title_label.configure(text='This book is no longer in the catalog')
+            for value_label in value_labels:
+                value_label.configure(text='')
+            cover_label.configure(image=None, text='No cover')
+            return
+        book = details['book']
+        title_label.configure(text=book[1])
+        for value_label, (_, index) in zip(value_labels, DETAIL_FIELDS):
+            value_label.configure(text=str(book[index]))
+        value_labels[-1].configure(text=str(details['on_loan']))
+        cover = details['cover']
+        if cover is None:
+            cover_label.configure(image=None, text='No cover')
+        else:
+            cover_label.configure(image=ctk.CTkImage(light_image=cover, dark_image=cover, size=cover.size), text='')
+        for customer, copies, checked_out_at, due_at, returned_at in details['history']:
+            history_table.insert('', 'end', values=(customer, copies, checked_out_at[:10], due_at[:10],
+                                                    returned_at[:10] if returned_at else 'Out'))
+
+    # -------------------------------------------
+    # Function: show_selected
+    # Purpose:
+    # Shows the first selected book of the catalog: from the caches when possible, otherwise
+    # loaded on the worker (a newer selection cancels the older load).
+    # -------------------------------------------
+    def show_selected(event=None):
+        if not info_root.winfo_exists():
+            return
+        selection = tabla_information.selection()
+        if not selection:
+            return
+        book_id = int(selection[0])
+        details = load_details(book_id, cached_only=True)
+        if details is not False:
+            worker.cancel(DETAILS_KEY)  # An older load must not replace it.
+            show_details(details)
+            return
+        worker.submit(
+            load_details, book_id, on_done=show_details,
+            on_error=lambda err: print(f"Error loading book {book_id}: {err}"), key=DETAILS_KEY
+        )
+
+    select_binding = tabla_information.bind('<<TreeviewSelect>>', show_selected, add='+')
+
+    # -------------------------------------------
+    # Function: close_window
+    # Purpose:
+    # Stops following the selection and closes the window.
+    # -------------------------------------------
+    def close_window():
+        script = tabla_information.bind('<<TreeviewSelect>>')  # unbind() would drop the other bindings too.
+        tabla_information.bind(
+            '<<TreeviewSelect>>', '\n'.join(line for line in script.split('\n') if select_binding not in line)
+        )
+        tabla_information.deletecommand(select_binding)
+        worker.cancel(DETAILS_KEY)
+        main_root.book_info_window = None
+        info_root.destroy()
+
+    info_root.protocol('WM_DELETE_WINDOW', close_window)
+    show_selected()
@@ -0,0 +1,366 @@
+import tkinter.messagebox as messagebox  # Module for displaying message boxes.
+from tkinter import ttk  # Themed widgets for Tkinter.
+import database  # Shared database connection layer.
+from addBookWindow import GENRE_VALUES, LANGUAGE_VALUES, validate_combobox_values  # Same checks as the "Add Book" form.
+
+# -------------------------------------------
+# Block: Inline Editing Settings
+# Purpose:
+# Cells of the catalog are edited in place. Edited values are shown at once and kept in a
+# buffer; the buffer is written in one transaction when the user pauses for FLUSH_MS, presses
+# Ctrl+S, or before the table is reloaded. Several edits of one cell only write the last
+# value, and a stock-take of hundreds of quantities is one commit instead of one per field.
+# After the save only the edited rows are read again and redrawn.
+# -------------------------------------------
+FLUSH_MS = 1500  # Pause after the last edit before the buffer is saved.
+RETRY_MS = 2000  # Wait before saving again when another PC held the database.
+LOOKUP_BATCH = 500  # Book IDs per "IN (...)" lookup (below the SQLite parameter limit).
+UNSAVED_TAG = 'unsaved'  # Tag of the rows with edits that are not saved yet.
+UNSAVED_FOREGROUND = '#c0392b'  # Text color of those rows.
+EDITABLE_COLUMNS = (
+    'book_name', 'book_publisher', 'author_name', 'book_year',
+    'book_genre', 'book_language', 'book_isbn', 'book_quantity'
+)  # Treeview columns that are also books columns (the row number and ID are not editable).
+CHOICES = {'book_genre': GENRE_VALUES, 'book_language': list(dict.fromkeys(LANGUAGE_VALUES))}  # Columns edited with a list.
+
+
+# -------------------------------------------
+# Function: save_book_edits
+# Purpose:
+# Writes the buffered edits {book_id: {column: value}} in one transaction and returns the
+# saved books as read afterwards. Books with the same edited columns share one statement.
+# -------------------------------------------
+def save_book_edits(changes):
+    statements = {}  # Edited columns -> parameter rows.
+    for book_id, values in changes.items():
+        columns = tuple(sorted(values))
+        if not set(columns) <= set(EDITABLE_COLUMNS):
+            raise ValueError(f'Not an editable column: {columns}')  # Column names go into the SQL.
+        params = [
+            int(values[column]) if column == 'book_quantity' and str(values[column]).isdigit() else values[column]
+            for column in columns
+        ]  # No numeric affinity on the quantity: whole numbers are stored as integers so they sort and add up.
+        if 'book_isbn' in columns:
+            index = columns.index('book_isbn')
+            params[index] = database.normalize_isbn(params[index])  # Found by the ISBN search.
+        statements.setdefault(columns, []).append(params + [book_id])
+
+    def save(cursor):
+        for columns, params in statements.items():
+            assignments = ', '.join(f'{column} = ?' for column in columns)
+            cursor.executemany(f'UPDATE books SET {assignments} WHERE book_id = ? AND {database.LIVE_BOOKS}', params)
+
+    database.write_transaction(save)
+
+    book_ids = sorted(changes)
+    rows = []
+    for start in range(0, len(book_ids), LOOKUP_BATCH):
+        batch = book_ids[start:start + LOOKUP_BATCH]
+        rows.extend(database.fetch_all(
+            f"SELECT {database.BOOK_COLUMNS} FROM books "
+            f"WHERE book_id IN ({', '.join('?' * len(batch))}) AND {database.LIVE_BOOKS}", batch
+        ))  # Deleted books are not returned.
+    return [tuple(row) for row in rows]
+
+
+# -------------------------------------------
+# Class: BookEditor
+# Purpose:
+# Edits the cells of the catalog treeview in place (double-click a cell, or "Edit Book" for
+# the selected row) and saves the edits in the background with write-behind.
+# Enter saves the cell and edits the same column of the next row, Tab the next column,
+# Escape cancels the cell.
+# -------------------------------------------
+class BookEditor:
+    def __init__(self, tabla_information, worker, on_saved, on_discarded, status_label=None, flush_ms=FLUSH_MS):
+        """
+        Parameters:
+        - tabla_information: The catalog treeview (item IDs are book IDs).
+        - worker: DatabaseWorker that runs the saves off the Tk thread.
+        - on_saved: Callback with the saved book rows, to redraw just those rows.
+        - on_discarded: Callback run after edits were rejected by the database, to show its values again.
+        - status_label: Optional label showing the number of unsaved edits.
+        - flush_ms: Pause after the last edit before the buffer is saved.
+        """
+        self.tabla_information = tabla_information
+        self.worker = worker
+        self.on_saved = on_saved
+        self.on_discarded = on_discarded
+        self.status_label = status_label
+        self.flush_ms = flush_ms
+        self.pending = {}  # book_id -> {column: value} not sent yet.
+        self.saving = 0  # Saves running on the worker.
+        self.after_id = None  # Scheduled save, if any.
+        self.cell_editor = None  # (widget, item, column) of the cell being edited.
+        self.committing = False  # True while a cell is validated (message boxes take the focus).
+
+        tabla_information.tag_configure(UNSAVED_TAG, foreground=UNSAVED_FOREGROUND)
+        tabla_information.bind('<Double-1>', self.on_double_click)
+        tabla_information.bind('<Control-s>', lambda event: self.flush())
+        tabla_information.bind('<Destroy>', self.on_destroy, add='+')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tabla_information.bind(sequence, lambda event: self.commit_cell(keep_on_error=False), add='+')  # Rows move.
+
+    # -------------------------------------------
+    # Function: on_double_click
+    # Purpose:
+    # Starts editing the double-clicked cell.
+    # -------------------------------------------
+    def on_double_click(self, event):
+        if self.tabla_information.identify_region(event.x, event.y) != 'cell':
+            return
+        item = self.tabla_information.identify_row(event.y)
+        column = self.tabla_information.column(self.tabla_information.identify_column(event.x), 'id')
+        if item and column in EDITABLE_COLUMNS:
+            self.start_edit(item, column)
+
+    # -------------------------------------------
+    # Function: edit_selected
+    # Purpose:
+    # Starts editing the name of the selected book ("Edit Book" button).
+    # -------------------------------------------
+    def edit_selected(self):
+        item = self.tabla_information.focus() or next(iter(self.tabla_information.selection()), '')
+        if not item:
+            messagebox.showinfo('Edit Book', 'Select the book to edit, or double-click a cell.',
+                                parent=self.tabla_information.winfo_toplevel())
+            return
+        self.start_edit(item, EDITABLE_COLUMNS[0])
+
+    # -------------------------------------------
+    # Function: start_edit
+    # Purpose:
+    # Places an entry (or a list for genre and language) over a cell of the treeview.
+    # -------------------------------------------
+    def start_edit(self, item, column):
+        self.close_cell_editor()
+        bbox = self.tabla_information.bbox(item, column)
+        if not bbox:
+            return  # Cell out of view.
+        x, y, width, height = bbox
+        if column in CHOICES:
+            editor = ttk.Combobox(self.tabla_information, values=CHOICES[column], state='readonly')
+            editor.set(self.tabla_information.set(item, column))
+            editor.bind('<<ComboboxSelected>>', lambda event: self.commit_cell())
+        else:
+            editor = ttk.Entry(self.tabla_information)
+            editor.insert(0, self.tabla_information.set(item, column))
+            editor.select_range(0, 'end')
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        editor.bind('<Return>', lambda event: self.commit_cell(move=(1, 0)))
+        editor.bind('<Tab>', self.on_tab)
+        editor.bind('<Escape>', lambda event: self.close_cell_editor())
+        editor.bind('<Control-s>', lambda event: self.commit_cell() and self.flush())
+        editor.bind('<FocusOut>', lambda event: editor.after_idle(self.on_focus_out, editor))
+        self.tabla_information.selection_set(item)
+        self.cell_editor = (editor, item, column)
+
+    # -------------------------------------------
+    # Function: on_tab
+    # Purpose:
+    # Saves the cell and edits the next column; the focus does not leave the table.
+    # -------------------------------------------
+    def on_tab(self, event):
+        self.commit_cell(move=(0, 1))
+        return 'break'
+
+    # -------------------------------------------
+    # Function: on_focus_out
+    # Purpose:
+    # Saves the cell when the user clicked elsewhere. Checked once the focus has moved, as
+    # the list of a combobox takes the focus while it is open.
+    # -------------------------------------------
+    def on_focus_out(self, editor):
+        if self.cell_editor is None or self.cell_editor[0] is not editor or self.committing:
+            return
+        if str(editor.tk.call('focus')).startswith(str(editor)):
+            return  # Still in the editor (combobox list).
+        self.commit_cell(keep_on_error=False)
+
+    # -------------------------------------------
+    # Function: close_cell_editor
+    # Purpose:
+    # Removes the entry over the edited cell without saving it.
+    # -------------------------------------------
+    def close_cell_editor(self):
+        if self.cell_editor is not None:
+            editor = self.cell_editor[0]
+            self.cell_editor = None  # Before destroy(): it sends <FocusOut>.
+            editor.destroy()
+            self.tabla_information.focus_set()
+
+    # -------------------------------------------
+    # Function: commit_cell
+    # Purpose:
+    # Validates the edited cell like the "Add Book" form and buffers it. `move` (rows, columns)
+    # starts editing a neighbouring cell. An invalid value keeps the editor open, or is dropped
+    # when the editor lost the focus. Returns True when the value was accepted.
+    # -------------------------------------------
+    def commit_cell(self, move=None, keep_on_error=True):
+        if self.cell_editor is None or self.committing:
+            return False
+        self.committing = True
+        try:
+            accepted = self.validate_cell(keep_on_error)
+        finally:
+            self.committing = False
+        if accepted and move:
+            self.edit_neighbour(*accepted, *move)
+        return bool(accepted)
+
+    # -------------------------------------------
+    # Function: validate_cell
+    # Purpose:
+    # Checks the edited value and buffers it. Returns (item, column) when it was accepted.
+    # -------------------------------------------
+    def validate_cell(self, keep_on_error):
+        editor, item, column = self.cell_editor
+        value = editor.get().strip()
+        row = dict(zip(self.tabla_information['columns'], self.tabla_information.item(item, 'values')))
+        row[column] = value
+        parent = self.tabla_information.winfo_toplevel()
+        if not keep_on_error:
+            self.close_cell_editor()  # The user moved on: an invalid value is dropped.
+        if not value:
+            messagebox.showerror('Error', 'All fields are required!', parent=parent)
+            return None
+        if column in CHOICES and not validate_combobox_values(row['book_genre'], row['book_language'], parent):
+            return None
+        self.close_cell_editor()
+        if value != self.tabla_information.set(item, column):
+            self.queue_edit(item, column, value)
+        return item, column
+
+    # -------------------------------------------
+    # Function: edit_neighbour
+    # Purpose:
+    # Starts editing the cell `rows` rows down or `columns` columns right of the given cell.
+    # -------------------------------------------
+    def edit_neighbour(self, item, column, rows, columns):
+        if rows:
+            item = self.tabla_information.next(item)
+        if columns:
+            index = EDITABLE_COLUMNS.index(column) + columns
+            if index >= len(EDITABLE_COLUMNS):
+                item, index = self.tabla_information.next(item), 0  # Wrap to the next row.
+            column = EDITABLE_COLUMNS[index]
+        if item:
+            self.tabla_information.focus(item)
+            self.start_edit(item, column)
+
+    # -------------------------------------------
+    # Function: queue_edit
+    # Purpose:
+    # Shows the new value, adds it to the buffer and (re)starts the save timer.
+    # -------------------------------------------
+    def queue_edit(self, item, column, value):
+        self.tabla_information.set(item, column, value)
+        tags = self.tabla_information.item(item, 'tags')
+        if UNSAVED_TAG not in tags:
+            self.tabla_information.item(item, tags=list(tags) + [UNSAVED_TAG])
+        self.pending.setdefault(int(item), {})[column] = value  # A later edit of the cell replaces it.
+        self.schedule_flush(self.flush_ms)
+
+    # -------------------------------------------
+    # Function: schedule_flush
+    # Purpose:
+    # Saves the buffer after `delay_ms`, replacing an earlier schedule.
+    # -------------------------------------------
+    def schedule_flush(self, delay_ms):
+        if self.after_id is not None:
+            self.tabla_information.after_cancel(self.after_id)
+        self.after_id = self.tabla_information.after(delay_ms, self.flush)
+        self.show_status()
+
+    # -------------------------------------------
+    # Function: flush
+    # Purpose:
+    # Sends the buffered edits to the worker as one save. Saves run in order on the worker,
+    # so a reload submitted afterwards reads the saved values.
+    # -------------------------------------------
+    def flush(self):
+        if self.after_id is not None:
+            self.tabla_information.after_cancel(self.after_id)
+            self.after_id = None
+        if not self.pending:
+            return
+        changes, self.pending = self.pending, {}
+        self.saving += 1
+        self.worker.submit(
+            save_book_edits, changes,
+            on_done=self.on_flushed,
+            on_error=lambda err: self.on_flush_failed(changes, err)
+        )
+        self.show_status()
+
+    # -------------------------------------------
+    # Function: on_flushed
+    # Purpose:
+    # Redraws the saved rows with the values read back from the database.
+    # -------------------------------------------
+    def on_flushed(self, rows):
+        self.saving -= 1
+        if not self.tabla_information.winfo_exists():
+            return
+        for row in rows:
+            item = str(row[0])
+            if int(item) not in self.pending and self.tabla_information.exists(item):
+                tags = [tag for tag in self.tabla_information.item(item, 'tags') if tag != UNSAVED_TAG]
+                self.tabla_information.item(item, tags=tags)
+        self.on_saved([row for row in rows if row[0] not in self.pending])  # Newer edits stay on screen.
+        self.show_status()
+
+    # -------------------------------------------
+    # Function: on_flush_failed
+    # Purpose:
+    # Puts the edits back in the buffer and tries again later when another PC held the
+    # database; otherwise reports the error and shows the database values again.
+    # -------------------------------------------
+    def on_flush_failed(self, changes, err):
+        self.saving -= 1
+        if not self.tabla_information.winfo_exists():
+            return
+        if database.is_transient_error(err):
+            for book_id, values in changes.items():
+                newer = self.pending.get(book_id, {})
+                self.pending[book_id] = {**values, **newer}  # Edits made meanwhile win.
+            self.schedule_flush(RETRY_MS)
+            return
+        messagebox.showerror('Error', database.error_message(err), parent=self.tabla_information.winfo_toplevel())
+        for book_id in changes:
+            if self.tabla_information.exists(str(book_id)) and book_id not in self.pending:
+                tags = [tag for tag in self.tabla_information.item(str(book_id), 'tags') if tag != UNSAVED_TAG]
+                self.tabla_information.item(str(book_id), tags=tags)
+        self.show_status()
+        self.on_discarded()
+
+    # -------------------------------------------
+    # Function: show_status
+    # Purpose:
+    # Shows how many books have unsaved edits.
+    # -------------------------------------------
+    def show_status(self):
+        if self.status_label is None or not self.status_label.winfo_exists():
+            return
+        if self.pending:
+            text = f'{len(self.pending)} unsaved edits (Ctrl+S saves now)'
+        elif self.saving:
+            text = 'Saving...'
+        else:
+            text = ''
+        self.status_label.configure(text=text)
+
+    # -------------------------------------------
+    # Function: on_destroy
+    # Purpose:
+    # Saves the remaining edits directly when the table is destroyed (logout or exit).
+    # -------------------------------------------
+    def on_destroy(self, event):
+        if event.widget is not self.tabla_information or not self.pending:
+            return
+        changes, self.pending = self.pending, {}
+        try:
+            save_book_edits(changes)
+        except Exception as err:
+            print(f"Error saving the last edits: {err}")
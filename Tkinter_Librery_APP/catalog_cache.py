@@ -0,0 +1,265 @@
+import sys  # sys.intern for the repeated strings.
+import threading  # The Tk thread and the database worker share the cache.
+from collections import OrderedDict  # Ordered mapping used as a small LRU of results.
+import database  # Shared database connection layer.
+import search  # Sort orders of the treeview columns.
+
+# -------------------------------------------
+# Block: Catalog Cache Settings
+# Purpose:
+# The books table is read from disk once per process and kept as compact BookRecord objects
+# whose repeated strings (publisher, author, genre, language) are interned, so every book of
+# the same publisher points to one string. Refreshes, searches and counts are answered from
+# memory until database.data_version() changes, i.e. until some connection commits.
+# After a commit only the books listed in the book_changes log since the last read are
+# re-read. Searches still ask SQLite for the matching book IDs in order (indexes, FTS5) but
+# never for the rows; the ID lists and the counts are kept per data version.
+# -------------------------------------------
+FIELDS = (
+    'book_id', 'book_name', 'book_publisher', 'author_name', 'book_year',
+    'book_genre', 'book_language', 'book_isbn', 'book_quantity'
+)  # Same order as database.BOOK_COLUMNS.
+LOAD_BATCH = 5000  # Rows read per fetchmany while loading the catalog.
+MAX_CACHED_RESULTS = 32  # Search results and counts kept for the current data version.
+MAX_PATCHED_BOOKS = 5000  # More changed books than this are read with a full reload.
+LOOKUP_BATCH = 500  # Book IDs per "IN (...)" lookup (below the SQLite parameter limit).
+
+_lock = threading.RLock()  # Guards the cached state.
+_version = None  # data_version() the cached state belongs to.
+_records = None  # book_id -> BookRecord in book_id order, None until first needed.
+_last_change = 0  # Newest book_changes entry reflected in _records.
+_results = OrderedDict()  # (where_sql, params, sort) -> list of book IDs in order.
+_counts = OrderedDict()  # (where_sql, params) -> row count.
+
+
+# -------------------------------------------
+# Class: BookRecord
+# Purpose:
+# One row of the books table without a per-row dict. Behaves like the row tuple returned by
+# sqlite3 where the catalog needs it: record[0] is the book ID and tuple(record) the values.
+# -------------------------------------------
+class BookRecord:
+    __slots__ = FIELDS
+
+    def __init__(self, book_id, book_name, book_publisher, author_name, book_year,
+                 book_genre, book_language, book_isbn, book_quantity):
+        self.book_id = book_id
+        self.book_name = book_name
+        self.book_publisher = book_publisher
+        self.author_name = author_name
+        self.book_year = book_year
+        self.book_genre = book_genre
+        self.book_language = book_language
+        self.book_isbn = book_isbn
+        self.book_quantity = book_quantity
+
+    def __iter__(self):
+        return iter((self.book_id, self.book_name, self.book_publisher, self.author_name, self.book_year,
+                     self.book_genre, self.book_language, self.book_isbn, self.book_quantity))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f'BookRecord{tuple(self)!r}'
+
+
+# -------------------------------------------
+# Function: _sync
+# Purpose:
+# Brings the cached state up to date when the database changed since it was read (call with
+# _lock held): the changed books are patched in, or the catalog is dropped if that fails.
+# A new connection generation (reopened, or DB_PATH changed) may be another file whose
+# change log has nothing to do with _last_change, so the catalog is always dropped then.
+# -------------------------------------------
+def _sync():
+    global _version, _records, _last_change
+    version = database.data_version()
+    if version != _version:
+        same_generation = _version is not None and version[0] == _version[0]
+        _version = version
+        _results.clear()
+        _counts.clear()
+        if not same_generation:
+            _records = None  # Read again on next use.
+            _last_change = 0
+        elif _records is not None and not _apply_changes():
+            _records = None  # Read again on next use.
+
+
+# -------------------------------------------
+# Function: _apply_changes
+# Purpose:
+# Re-reads the books logged in book_changes since the last read and updates _records.
+# Returns False when the log no longer reaches back that far or too many books changed.
+# -------------------------------------------
+def _apply_changes():
+    global _records, _last_change
+    changes = database.fetch_all(
+        'SELECT change_id, book_id FROM book_changes WHERE change_id > ? ORDER BY change_id', (_last_change,)
+    )
+    if not changes:
+        return True  # Another table changed (users, ...).
+    oldest = database.fetch_one('SELECT MIN(change_id) FROM book_changes')[0]
+    book_ids = sorted({book_id for _, book_id in changes})  # Ascending, so new books are appended in order.
+    if oldest > _last_change + 1 or len(book_ids) > MAX_PATCHED_BOOKS:
+        return False  # Pruned entries were missed, or a bulk change.
+
+    # Block: Re-read The Changed Books
+    # Re-reading is idempotent, so a commit made meanwhile is simply applied again next time.
+    found = {}
+    for start in range(0, len(book_ids), LOOKUP_BATCH):
+        batch = book_ids[start:start + LOOKUP_BATCH]
+        marks = ', '.join('?' * len(batch))
+        for row in database.fetch_all(
+            f'SELECT {database.BOOK_COLUMNS} FROM books WHERE book_id IN ({marks}) AND {database.LIVE_BOOKS}', batch
+        ):
+            found[row[0]] = _make_record(row)
+
+    # Block: Patch The Records
+    # New books usually get the highest ID and are appended; otherwise the order is rebuilt.
+    records, last_id = _records, next(reversed(_records), 0)
+    reorder = False
+    for book_id in book_ids:
+        record = found.get(book_id)
+        if record is None:
+            records.pop(book_id, None)  # Deleted or moved to the trash.
+            continue
+        if book_id not in records and book_id < last_id:
+            reorder = True
+        records[book_id] = record
+    if reorder:
+        _records = dict(sorted(records.items()))
+    _last_change = changes[-1][0]
+    return True
+
+
+# -------------------------------------------
+# Function: _make_record
+# Purpose:
+# Builds a BookRecord from a books row, interning the repeated strings.
+# -------------------------------------------
+def _make_record(row):
+    book_id, name, publisher, author, year, genre, language, isbn, quantity = row
+    return BookRecord(
+        book_id, name, sys.intern(publisher), sys.intern(author), year,
+        sys.intern(genre), sys.intern(language), isbn, quantity
+    )
+
+
+# -------------------------------------------
+# Function: _load_records
+# Purpose:
+# Reads the whole books table into BookRecord objects, interning the repeated strings.
+# -------------------------------------------
+def _load_records():
+    global _last_change
+    _last_change = database.fetch_one('SELECT IFNULL(MAX(change_id), 0) FROM book_changes')[0]  # Before the rows.
+    intern = sys.intern
+    records = {}
+    cursor = database.get_connection().execute(database.SELECT_BOOKS_QUERY)
+    while True:
+        rows = cursor.fetchmany(LOAD_BATCH)  # Never holds the whole table as tuples.
+        if not rows:
+            break
+        for book_id, name, publisher, author, year, genre, language, isbn, quantity in rows:
+            records[book_id] = BookRecord(
+                book_id, name, intern(publisher), intern(author), year,
+                intern(genre), intern(language), isbn, quantity
+            )
+    return records
+
+
+# -------------------------------------------
+# Function: _remember
+# Purpose:
+# Stores a value in one of the small LRU maps, dropping the oldest entry when it is full.
+# -------------------------------------------
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > MAX_CACHED_RESULTS:
+        cache.popitem(last=False)
+    return value
+
+
+# -------------------------------------------
+# Function: all_books
+# Purpose:
+# Returns every book as BookRecord objects in book_id order (the refresh_table listing).
+# -------------------------------------------
+def all_books():
+    global _records
+    with _lock:
+        _sync()
+        if _records is None:
+            _records = _load_records()
+        return list(_records.values())
+
+
+# -------------------------------------------
+# Function: find_books
+# Purpose:
+# Returns the books matching a filter condition (see search.build_filter) in the given sort
+# order. The ordered IDs come from SQLite the first time and from memory afterwards.
+# -------------------------------------------
+def find_books(where_sql='', params=(), sort=None):
+    global _records
+    key = (where_sql, tuple(params), tuple(sort or search.DEFAULT_SORT))
+    with _lock:
+        _sync()
+        if _records is None:
+            _records = _load_records()
+        records = _records
+        if not where_sql and key[2] == search.DEFAULT_SORT:
+            return list(records.values())  # Whole catalog in book_id order.
+        book_ids = _results.get(key)
+        if book_ids is None:
+            where = search.where_clause(where_sql)
+            rows = database.fetch_all(f'SELECT book_id FROM books{where} ORDER BY {search.order_by(key[2])}', params)
+            book_ids = _remember(_results, key, [row[0] for row in rows])
+        else:
+            _results.move_to_end(key)
+        return [records[book_id] for book_id in book_ids if book_id in records]
+
+
+# -------------------------------------------
+# Function: count_books
+# Purpose:
+# Returns the number of books matching a filter condition, counted once per data version.
+# -------------------------------------------
+def count_books(where_sql='', params=()):
+    key = (where_sql, tuple(params))
+    with _lock:
+        _sync()
+        total = _counts.get(key)
+        if total is None:
+            listed = _results.get(key + (search.DEFAULT_SORT,))
+            if listed is not None:
+                total = len(listed)  # Already listed.
+            elif not where_sql and _records is not None:
+                total = len(_records)  # Whole catalog already in memory.
+            else:
+                total = database.fetch_one(f'SELECT COUNT(*) FROM books{search.where_clause(where_sql)}', params)[0]
+            _remember(_counts, key, total)
+        else:
+            _counts.move_to_end(key)
+        return total
+
+
+# -------------------------------------------
+# Function: clear
+# Purpose:
+# Frees the cached catalog (it is read again on next use).
+# -------------------------------------------
+def clear():
+    global _version, _records, _last_change
+    with _lock:
+        _version = None
+        _records = None
+        _last_change = 0
+        _results.clear()
+        _counts.clear()
@@ -0,0 +1,131 @@
+import csv  # Writer for CSV files.
+import json  # Serializer for JSONL lines.
+import tkinter.messagebox as messagebox  # Module for displaying message boxes.
+from tkinter import filedialog  # Dialog to choose the destination file.
+import database  # Shared database connection layer.
+from search import where_clause  # WHERE clause of catalog queries (leaves out the trash).
+from functions import open_progress_window  # Progress window with a cancel button.
+
+# -------------------------------------------
+# Block: Export Settings
+# Purpose:
+# Exported columns (the same ones the catalog table shows) and the fetchmany batch size.
+# -------------------------------------------
+EXPORT_COLUMNS = tuple(column.strip() for column in database.BOOK_COLUMNS.split(','))  # Header of the export.
+BATCH_SIZE = 2000  # Rows fetched from SQLite at a time.
+
+
+# -------------------------------------------
+# Function: iter_books
+# Purpose:
+# Yields the books matching the optional filter in book ID order, fetching BATCH_SIZE rows
+# at a time with fetchmany so only one batch is in memory.
+# -------------------------------------------
+def iter_books(where_sql='', params=()):
+    where = where_clause(where_sql)  # Books in the trash are not exported.
+    cursor = database.get_connection().execute(
+        f'SELECT {database.BOOK_COLUMNS} FROM books{where} ORDER BY book_id', params
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+# -------------------------------------------
+# Function: export_catalog
+# Purpose:
+# Writes the books matching the optional filter to a CSV or JSONL file (chosen by the file
+# extension) with constant memory use.
+# progress(written, total) is called after every batch. Stops early when `cancel_event` is
+# set. Returns a summary dict.
+# -------------------------------------------
+def export_catalog(path, where_sql='', params=(), progress=None, cancel_event=None):
+    where = where_clause(where_sql)  # Books in the trash are not exported.
+    total = database.fetch_one(f'SELECT COUNT(*) FROM books{where}', params)[0]  # Rows to export.
+    as_jsonl = path.lower().endswith(('.jsonl', '.json', '.ndjson'))
+    written = 0
+    cancelled = False
+
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        writer = None if as_jsonl else csv.writer(target)
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)  # Header row.
+
+        for row in iter_books(where_sql, params):
+            if as_jsonl:
+                target.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n')
+            else:
+                writer.writerow(row)
+            written += 1
+            if written % BATCH_SIZE == 0:
+                if progress:
+                    progress(written, total)
+                if cancel_event is not None and cancel_event.is_set():
+                    cancelled = True
+                    break
+
+    if progress:
+        progress(written, total)
+    return {'written': written, 'path': path, 'cancelled': cancelled}
+
+
+# -------------------------------------------
+# Function: export_books_window
+# Purpose:
+# Asks for the destination file and whether to export only the current search result,
+# then exports on a job thread of the database worker while showing the progress.
+# -------------------------------------------
+def export_books_window(main_root, worker, current_filter=None):
+    """
+    Parameters:
+    - main_root: The main application window.
+    - worker: DatabaseWorker that runs the export (submit_job: searches and saves go on meanwhile).
+    - current_filter: Optional callable returning the (where_sql, params) of the current
+      search, or None when no search is active.
+    """
+    condition = current_filter() if current_filter else None
+    if condition and not messagebox.askyesno(
+            'Export Books', 'Export only the current search result?\n(No exports the whole catalog.)', parent=main_root):
+        condition = None
+
+    path = filedialog.asksaveasfilename(
+        parent=main_root,
+        title='Export Books',
+        defaultextension='.csv',
+        filetypes=[('CSV file', '*.csv'), ('JSON Lines file', '*.jsonl')]
+    )  # Destination chosen by the user.
+    if not path:
+        return
+    where_sql, params = condition or ('', ())
+
+    # Block: Initialize Progress Window
+    export_root, update_progress, cancel_event = open_progress_window(main_root, 'Export Books')
+
+    def show_progress(written, total):
+        """Updates the progress bar and the counter (runs on the Tk thread)."""
+        update_progress(written / total if total else 1, f'Exported: {written} of {total}')
+
+    def on_done(summary):
+        """Closes the progress window and shows the summary."""
+        export_root.destroy()
+        message = f"Exported {summary['written']} books to:\n{summary['path']}"
+        if summary['cancelled']:
+            message = 'Export cancelled. ' + message
+        messagebox.showinfo('Export Books', message, parent=main_root)
+
+    def on_error(err):
+        """Closes the progress window and shows the error."""
+        export_root.destroy()
+        messagebox.showerror('Export Books', f"An error occurred: {err}", parent=main_root)
+
+    worker.submit_job(
+        export_catalog, path, where_sql, params,
+        lambda *args: worker.post(show_progress, *args),  # Progress is reported from the worker thread.
+        cancel_event,
+        on_done=on_done, on_error=on_error
+    )
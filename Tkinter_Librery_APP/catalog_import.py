@@ -0,0 +1,238 @@
+import csv  # Reader and writer for CSV files.
+import json  # Parser for JSONL lines.
+import os  # Module to interact with the file system.
+import tkinter.messagebox as messagebox  # Module for displaying message boxes.
+from tkinter import filedialog  # Dialog to choose the file to import.
+import database  # Shared database connection layer.
+from addBookWindow import check_combobox_values  # Same genre/language rules as the "Add Book" form.
+from functions import open_progress_window  # Progress window with a cancel button.
+
+# -------------------------------------------
+# Block: Import Settings
+# Purpose:
+# Columns read from the supplier file (the same names as the books table) and batch sizes.
+# -------------------------------------------
+IMPORT_COLUMNS = (
+    'book_name', 'book_publisher', 'author_name', 'book_year',
+    'book_genre', 'book_language', 'book_ISBN', 'book_quantity'
+)  # Columns of a book record, in insert order.
+CHUNK_SIZE = 2000  # Rows inserted per transaction.
+PROGRESS_EVERY = 2000  # Rows between two progress reports.
+
+INSERT_BOOK_QUERY = (
+    f"INSERT INTO books ({', '.join(IMPORT_COLUMNS)}) VALUES ({', '.join('?' * len(IMPORT_COLUMNS))})"
+)  # SQLite assigns the book IDs (AUTOINCREMENT).
+
+
+# -------------------------------------------
+# Function: read_lines
+# Purpose:
+# Yields the lines of a text file and keeps a running count of the bytes read in
+# `position[0]` and of the lines read in `position[1]`, so progress can be reported without
+# loading the file. The file is opened with errors='surrogateescape': a line with bytes that
+# are not UTF-8 raises ValueError, after the lines before it were yielded.
+# -------------------------------------------
+def read_lines(file, position):
+    for line in file:
+        try:
+            position[0] += len(line.encode('utf-8'))
+        except UnicodeEncodeError:
+            raise ValueError(f'The file is not UTF-8 text: line {position[1] + 1} cannot be read.') from None
+        position[1] += 1
+        yield line
+
+
+# -------------------------------------------
+# Function: read_records
+# Purpose:
+# Streams the records of a CSV (with a header row) or JSONL file as (line number, dict) pairs.
+# Column names are matched without regard to case. Lines that cannot be parsed are yielded
+# with None instead of a dict. Raises ValueError when the CSV header itself cannot be read.
+# -------------------------------------------
+def read_records(file, file_format, position):
+    lines = read_lines(file, position)
+    if file_format == 'csv':
+        reader = csv.DictReader(lines)
+        try:
+            reader.fieldnames  # Reads the header row.
+        except csv.Error as err:
+            raise ValueError(f'The header row of the CSV file cannot be read: {err}') from err
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error:
+                yield position[1], None  # Field over the size limit, ... (line_num lags behind here).
+                continue
+            yield reader.line_num, {str(key).strip().lower(): value for key, value in record.items()}
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue  # Skip blank lines.
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        if not isinstance(record, dict):
+            yield line_number, None
+            continue
+        yield line_number, {str(key).strip().lower(): value for key, value in record.items()}
+
+
+# -------------------------------------------
+# Function: validate_record
+# Purpose:
+# Applies the "Add Book" rules to a record: every field is required and the genre and
+# language must be valid options. Returns (values, None) or (None, reason).
+# -------------------------------------------
+def validate_record(record):
+    if record is None:
+        return None, 'Unreadable line.'
+    values = []
+    for column in IMPORT_COLUMNS:
+        value = record.get(column.lower())
+        value = '' if value is None else str(value).strip()
+        if column == 'book_ISBN':
+            value = database.normalize_isbn(value)  # Stored like the "Add Book" form does.
+        if not value:
+            return None, f"Missing value for '{column}'."
+        values.append(value)
+    error = check_combobox_values(values[4], values[5])
+    if error:
+        return None, error
+    return tuple(values), None
+
+
+# -------------------------------------------
+# Function: rejected_report_path
+# Purpose:
+# Path of the report listing the rejected rows, next to the imported file.
+# -------------------------------------------
+def rejected_report_path(path):
+    base, _ = os.path.splitext(path)
+    return f"{base}_rejected.csv"
+
+
+# -------------------------------------------
+# Function: import_catalog
+# Purpose:
+# Streams a CSV or JSONL file into the books table with executemany, committing every
+# CHUNK_SIZE valid rows in one transaction. Rejected rows are written to a CSV report as
+# they are found, so memory use does not depend on the file size.
+# progress(bytes_read, total_bytes, imported, rejected) is called every PROGRESS_EVERY rows.
+# Stops at the next record when `cancel_event` is set: the rows read so far are inserted and
+# the committed chunks are kept.
+# A file that is not UTF-8 text stops the import at the first bad line; the rows before it
+# are kept and the summary's 'error' says where it stopped (also set for an unreadable CSV header).
+# Returns a summary dict.
+# -------------------------------------------
+def import_catalog(path, progress=None, cancel_event=None):
+    file_format = 'jsonl' if path.lower().endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+    total_bytes = os.path.getsize(path)
+    report_path = rejected_report_path(path)
+    position = [0, 0]  # Bytes and lines read so far.
+    imported = rejected = 0
+    chunk = []
+    error = None  # Why the import stopped before the end of the file.
+
+    def flush():
+        nonlocal imported
+        if chunk:
+            database.write_transaction(
+                lambda cursor: cursor.executemany(INSERT_BOOK_QUERY, chunk)  # One transaction per chunk.
+            )
+            imported += len(chunk)
+            chunk.clear()
+
+    with open(path, newline='', encoding='utf-8-sig', errors='surrogateescape') as source, \
+            open(report_path, 'w', newline='', encoding='utf-8') as report:
+        report_writer = csv.writer(report)
+        report_writer.writerow(['line', 'reason', 'record'])
+
+        try:
+            for count, (line_number, record) in enumerate(read_records(source, file_format, position), start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    break  # Also reached in files made mostly of rejected rows.
+                values, reason = validate_record(record)
+                if values:
+                    chunk.append(values)
+                    if len(chunk) >= CHUNK_SIZE:
+                        flush()
+                else:
+                    rejected += 1
+                    report_writer.writerow([line_number, reason, json.dumps(record)])
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(position[0], total_bytes, imported + len(chunk), rejected)
+        except ValueError as err:
+            error = str(err)  # Not UTF-8 text, or an unreadable CSV header.
+        flush()  # Insert the last partial chunk (also after a cancel).
+
+    if rejected == 0:
+        os.remove(report_path)  # No report needed.
+    if progress:
+        progress(total_bytes, total_bytes, imported, rejected)
+    return {
+        'imported': imported,
+        'rejected': rejected,
+        'report_path': report_path if rejected else None,
+        'cancelled': bool(cancel_event is not None and cancel_event.is_set()),
+        'error': error,
+    }
+
+
+# -------------------------------------------
+# Function: import_books_window
+# Purpose:
+# Asks for a CSV or JSONL file, imports it on a job thread of the database worker and shows
+# the progress and a summary of the imported and rejected rows.
+# -------------------------------------------
+def import_books_window(main_root, tabla_information, refresh_treeview, worker):
+    """
+    Parameters:
+    - main_root: The main application window.
+    - tabla_information: The treeview widget displaying book information.
+    - refresh_treeview: A callback function to refresh the treeview after the import.
+    - worker: DatabaseWorker that runs the import (submit_job: searches and saves go on meanwhile).
+    """
+    path = filedialog.askopenfilename(
+        parent=main_root,
+        title='Import Books',
+        filetypes=[('Catalog files', '*.csv *.jsonl *.json *.ndjson'), ('All files', '*.*')]
+    )  # File chosen by the user.
+    if not path:
+        return
+
+    # Block: Initialize Progress Window
+    import_root, update_progress, cancel_event = open_progress_window(main_root, 'Import Books')
+
+    def show_progress(bytes_read, total_bytes, imported, rejected):
+        """Updates the progress bar and the counters (runs on the Tk thread)."""
+        update_progress(bytes_read / total_bytes if total_bytes else 1, f'Imported: {imported}   Rejected: {rejected}')
+
+    def on_done(summary):
+        """Closes the progress window, refreshes the treeview and shows the summary."""
+        import_root.destroy()
+        refresh_treeview(tabla_information)
+        message = f"Imported {summary['imported']} books, rejected {summary['rejected']} rows."
+        if summary['cancelled']:
+            message = 'Import cancelled. ' + message
+        if summary['report_path']:
+            message += f"\nRejected rows were saved to:\n{summary['report_path']}"
+        if summary['error']:
+            messagebox.showwarning('Import Books', f"{summary['error']}\n{message}", parent=main_root)
+            return
+        messagebox.showinfo('Import Books', message, parent=main_root)
+
+    def on_error(err):
+        """Closes the progress window and shows the error."""
+        import_root.destroy()
+        refresh_treeview(tabla_information)  # Chunks committed before the error are kept.
+        messagebox.showerror('Import Books', database.error_message(err), parent=main_root)
+
+    worker.submit_job(
+        import_catalog, path,
+        lambda *args: worker.post(show_progress, *args),  # Progress is reported from the worker thread.
+        cancel_event,
+        on_done=on_done, on_error=on_error
+    )
@@ -0,0 +1,59 @@
+import sqlite3  # SQLite3 for database management.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Change Watcher Settings
+# Purpose:
+# Several counter PCs share the database file. The open main window polls
+# database.data_version() (one PRAGMA on a dedicated connection, no table is read) and only
+# refreshes when some connection committed since the last look.
+# -------------------------------------------
+WATCH_MS = 1000  # Interval between two checks.
+
+
+# -------------------------------------------
+# Class: ChangeWatcher
+# Purpose:
+# Calls `on_change` on the Tk thread after the database was committed to by another PC (or
+# another connection of this one). Stops by itself when `widget` is destroyed.
+# -------------------------------------------
+class ChangeWatcher:
+    def __init__(self, widget, on_change, interval_ms=WATCH_MS):
+        """
+        Parameters:
+        - widget: Tk widget used to schedule the checks with after(); the watcher stops with it.
+        - on_change: Callback run on the Tk thread when the database changed.
+        - interval_ms: Time between two checks.
+        """
+        self.widget = widget
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.version = database.data_version()  # Version the window is showing.
+        self.widget.after(self.interval_ms, self._poll)
+
+    # -------------------------------------------
+    # Function: mark_seen
+    # Purpose:
+    # Records that the window is being refreshed now, so the changes committed so far (for
+    # example by a local action) do not trigger a second refresh.
+    # -------------------------------------------
+    def mark_seen(self):
+        self.version = database.data_version()
+
+    # -------------------------------------------
+    # Function: _poll
+    # Purpose:
+    # Checks the data version and schedules the next check while the widget exists.
+    # -------------------------------------------
+    def _poll(self):
+        if not self.widget.winfo_exists():
+            return  # The window was closed.
+        try:
+            version = database.data_version()
+        except sqlite3.Error as err:
+            print(f"Error checking for database changes: {err}")  # Try again on the next check.
+            version = self.version
+        if version != self.version:
+            self.version = version
+            self.on_change()
+        self.widget.after(self.interval_ms, self._poll)
@@ -0,0 +1,95 @@
+import base64  # Text encoding of the salt and the derived key.
+import hashlib  # scrypt key-derivation function.
+import hmac  # Constant-time comparison of the derived keys.
+import os  # Source of random salts.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Password Hash Settings
+# Purpose:
+# Passwords are stored as "scrypt$N$r$p$salt$key". N is the cost: doubling it doubles the time
+# and memory of every login (see benchmarks/bench_password_hash.py to choose it). Rows hashed
+# with older settings are upgraded on the next successful login.
+# -------------------------------------------
+SCRYPT_N = 2 ** 15  # CPU/memory cost.
+SCRYPT_R = 8  # Block size.
+SCRYPT_P = 1  # Parallelization.
+SALT_BYTES = 16  # Random salt per password.
+KEY_BYTES = 32  # Length of the derived key.
+HASH_PREFIX = 'scrypt$'  # Marks a hashed password (anything else is a legacy plaintext value).
+
+USER_PASSWORD_QUERY = 'SELECT password FROM usuarios WHERE nombre_usuario = ?'  # Login lookup.
+UPDATE_PASSWORD_QUERY = 'UPDATE usuarios SET password = ? WHERE nombre_usuario = ?'  # Rehash on login.
+
+
+# -------------------------------------------
+# Function: derive_key
+# Purpose:
+# Runs scrypt with the given parameters and returns the derived key.
+# -------------------------------------------
+def derive_key(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r, dklen=KEY_BYTES  # scrypt needs about 128 * N * r bytes.
+    )
+
+
+# -------------------------------------------
+# Function: hash_password
+# Purpose:
+# Returns the stored form of `password` with a new random salt and the given (or current) cost.
+# -------------------------------------------
+def hash_password(password, n=None, r=None, p=None):
+    n, r, p = n or SCRYPT_N, r or SCRYPT_R, p or SCRYPT_P  # Current settings by default.
+    salt = os.urandom(SALT_BYTES)
+    key = derive_key(password, salt, n, r, p)
+    salt_text = base64.b64encode(salt).decode('ascii')
+    key_text = base64.b64encode(key).decode('ascii')
+    return f"{HASH_PREFIX}{n}${r}${p}${salt_text}${key_text}"
+
+
+# -------------------------------------------
+# Function: is_hashed
+# Purpose:
+# Whether a stored password value is a hash (and not a legacy plaintext password).
+# -------------------------------------------
+def is_hashed(stored):
+    return stored.startswith(HASH_PREFIX)
+
+
+# -------------------------------------------
+# Function: verify_password
+# Purpose:
+# Checks `password` against a stored hash in constant time.
+# Returns (matches, needs_rehash); needs_rehash is True when the cost settings changed.
+# -------------------------------------------
+def verify_password(password, stored):
+    try:
+        n, r, p, salt, key = stored[len(HASH_PREFIX):].split('$')
+        n, r, p = int(n), int(r), int(p)
+        salt, key = base64.b64decode(salt), base64.b64decode(key)
+    except ValueError:
+        return False, False  # Not a hash this version understands.
+    matches = hmac.compare_digest(derive_key(password, salt, n, r, p), key)
+    return matches, (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+# -------------------------------------------
+# Function: verify_login
+# Purpose:
+# Returns True if the username exists and the password matches. Slow on purpose (scrypt), so
+# it must run off the Tk thread. Unknown users cost the same time as a wrong password.
+# -------------------------------------------
+def verify_login(username, password):
+    row = database.fetch_one(USER_PASSWORD_QUERY, (username,))
+    if row is None or not is_hashed(row[0]):
+        hash_password(password)  # Same work as a real check, so timing does not reveal users.
+        return False
+    matches, needs_rehash = verify_password(password, row[0])
+    if matches and needs_rehash:
+        new_hash = hash_password(password)  # Hashed before the write lock is taken.
+        database.write_transaction(
+            lambda cursor: cursor.execute(UPDATE_PASSWORD_QUERY, (new_hash, username))  # Upgrade the cost.
+        )
+    return matches
+
@@ -0,0 +1,242 @@
+import random  # Jitter of the retry delays.
+import re  # ISBN separators.
+import sqlite3  # SQLite3 for database management.
+import threading  # One connection per thread and a lock for the registry.
+import time  # Waits between write retries.
+from contextlib import contextmanager  # Helper to build the transaction context manager.
+import migrations  # Versioned schema migrations.
+import query_trace  # Statement timing shown in the diagnostics window.
+
+# -------------------------------------------
+# Block: Database Settings
+# Purpose:
+# Central location of the database file and the statements shared by every screen.
+# Keeping the SQL text identical lets sqlite3 reuse its cached prepared statements.
+# -------------------------------------------
+DB_PATH = './db/bookstore_management.db'  # Path to the SQLite database.
+STATEMENT_CACHE_SIZE = 128  # Number of prepared statements kept per connection.
+CACHE_SIZE_KIB = 8192  # Page cache size in KiB (negative value in PRAGMA cache_size).
+BUSY_TIMEOUT_MS = 5000  # Time to wait on a locked database before failing.
+WRITE_RETRIES = 3  # Extra attempts of a write that failed on a lock held by another PC.
+RETRY_DELAY_S = 0.05  # First wait before a retry; doubled on every attempt.
+RETRY_MAX_DELAY_S = 1.0  # Longest wait between two attempts.
+TRANSIENT_ERRORS = ('database is locked', 'database is busy', 'database table is locked')  # Worth retrying.
+
+BOOK_COLUMNS = (
+    'book_id, book_name, book_publisher, author_name, book_year, '
+    'book_genre, book_language, book_ISBN, book_quantity'
+)  # Columns shown in the catalog table, in display order.
+LIVE_BOOKS = 'deleted_at IS NULL'  # Books that are not in the trash (soft deleted, see soft_delete.py).
+SELECT_BOOKS_QUERY = f'SELECT {BOOK_COLUMNS} FROM books WHERE {LIVE_BOOKS} ORDER BY book_id'  # Query used by every view that lists the catalog.
+ISBN_SEPARATORS = re.compile(r'[\s-]')  # Hyphens and spaces are not part of an ISBN.
+
+
+# -------------------------------------------
+# Function: normalize_isbn
+# Purpose:
+# Returns an ISBN without hyphens and spaces. Every write path stores ISBNs this way and
+# the ISBN search normalizes the typed text the same way, so "978-0-316-76948-8" and
+# "9780316769488" find the same book on the ISBN index.
+# -------------------------------------------
+def normalize_isbn(isbn):
+    return ISBN_SEPARATORS.sub('', str(isbn))
+
+
+_connections = {}  # Thread ID -> long-lived connection of that thread.
+_connection_lock = threading.RLock()  # Guards _connections and the one-time migrations.
+_migrated = False  # Whether the startup migrations already ran in this process.
+_version_connection = None  # Connection that only reads PRAGMA data_version.
+_version_generation = 0  # Incremented whenever the version connection is reopened.
+write_retries = 0  # Writes retried after a transient lock error (shown by the stress test).
+
+
+# -------------------------------------------
+# Function: open_connection
+# Purpose:
+# Opens a new connection to the given database file and applies the tuned pragmas.
+# Used for the shared connections and by tools that need their own (benchmarks, stress tests).
+# -------------------------------------------
+def open_connection(db_path=DB_PATH):
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_MS / 1000,  # Wait on locks instead of failing immediately.
+        cached_statements=STATEMENT_CACHE_SIZE,  # Keep prepared statements around.
+        check_same_thread=False,  # Allows interrupt() and close_connection() from other threads.
+        factory=query_trace.TracedConnection  # Every statement is timed.
+    )
+    conn.execute('PRAGMA journal_mode=WAL')  # Readers do not block the writer.
+    conn.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL and much cheaper than FULL.
+    conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KIB}')  # Larger page cache.
+    conn.execute('PRAGMA temp_store=MEMORY')  # Keep temporary b-trees in memory.
+    conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')  # Wait on locks held by other PCs.
+    return conn
+
+
+# -------------------------------------------
+# Function: get_connection
+# Purpose:
+# Returns the long-lived connection of the calling thread, opening it on first use.
+# The Tk thread and the background database worker each keep one, so a slow query on the
+# worker never holds a lock the interface needs.
+# -------------------------------------------
+def get_connection():
+    global _migrated
+    thread_id = threading.get_ident()
+    conn = _connections.get(thread_id)
+    if conn is not None:
+        return conn
+    with _connection_lock:
+        conn = open_connection(DB_PATH)  # Open once and keep it for the thread lifetime.
+        if not _migrated:
+            migrations.apply_migrations(conn)  # No-op when the splash screen already ran them.
+            _migrated = True
+        _connections[thread_id] = conn
+        return conn
+
+
+# -------------------------------------------
+# Function: release_connection
+# Purpose:
+# Closes and forgets the connection of the calling thread, if it has one. Called by a thread
+# that is about to end (the database worker), so its connection is not left open and a new
+# thread that reuses the thread ID does not inherit it.
+# -------------------------------------------
+def release_connection():
+    with _connection_lock:
+        conn = _connections.pop(threading.get_ident(), None)
+    if conn is not None:
+        conn.close()
+
+
+# -------------------------------------------
+# Function: close_connection
+# Purpose:
+# Closes every shared connection. The next call to get_connection opens a new one, and
+# the startup migrations run again (for example after DB_PATH was changed).
+# -------------------------------------------
+def close_connection():
+    global _migrated, _version_connection, _version_generation
+    with _connection_lock:
+        for conn in _connections.values():
+            conn.close()  # Release the database file.
+        _connections.clear()
+        _migrated = False
+        if _version_connection is not None:
+            _version_connection.close()
+            _version_connection = None
+            _version_generation += 1  # Versions read from the new connection are not comparable.
+
+
+# -------------------------------------------
+# Function: data_version
+# Purpose:
+# Returns a value that changes whenever the database was committed to since the last call, by
+# any connection of this process or of another PC. It reads PRAGMA data_version on a
+# dedicated connection that never writes, so the commits of the shared connections count too.
+# Cheap enough to call before every use of cached data.
+# -------------------------------------------
+def data_version():
+    global _version_connection
+    with _connection_lock:
+        if _version_connection is None:
+            _version_connection = open_connection(DB_PATH)
+        version = _version_connection.execute('PRAGMA data_version').fetchone()[0]
+        return (_version_generation, version)
+
+
+# -------------------------------------------
+# Function: interrupt_thread
+# Purpose:
+# Aborts the query running on the connection of another thread (used to cancel stale work).
+# The interrupted statement raises sqlite3.OperationalError in that thread.
+# -------------------------------------------
+def interrupt_thread(thread_id):
+    conn = _connections.get(thread_id)
+    if conn is not None:
+        conn.interrupt()
+
+
+# -------------------------------------------
+# Function: fetch_all
+# Purpose:
+# Runs a read query on the connection of the calling thread and returns every row.
+# -------------------------------------------
+def fetch_all(query, params=()):
+    return get_connection().execute(query, params).fetchall()
+
+
+# -------------------------------------------
+# Function: fetch_one
+# Purpose:
+# Runs a read query on the connection of the calling thread and returns the first row or None.
+# -------------------------------------------
+def fetch_one(query, params=()):
+    return get_connection().execute(query, params).fetchone()
+
+
+# -------------------------------------------
+# Function: transaction
+# Purpose:
+# Context manager that yields a cursor on the connection of the calling thread and commits on success.
+# Rolls back every statement of the block if an exception is raised.
+# The write lock is taken up front (BEGIN IMMEDIATE), waiting up to BUSY_TIMEOUT_MS for other
+# PCs: a transaction that read first and then tries to write can fail at once in WAL mode.
+# Keep the block short and do slow work (hashing, parsing) before entering it.
+# -------------------------------------------
+@contextmanager
+def transaction():
+    conn = get_connection()
+    if conn.in_transaction:
+        conn.commit()  # Close a transaction left open by a plain statement.
+    cursor = conn.cursor()  # Cursor for the statements of this transaction.
+    try:
+        cursor.execute('BEGIN IMMEDIATE')  # Take the write lock before the first statement.
+        yield cursor
+        conn.commit()  # Commit all the statements at once.
+    except Exception:
+        conn.rollback()  # Undo the partial changes.
+        raise
+    finally:
+        cursor.close()
+
+
+# -------------------------------------------
+# Function: is_transient_error
+# Purpose:
+# Whether an error comes from a lock held by another connection and the write may succeed later.
+# -------------------------------------------
+def is_transient_error(error):
+    return isinstance(error, sqlite3.OperationalError) and str(error).startswith(TRANSIENT_ERRORS)
+
+
+# -------------------------------------------
+# Function: write_transaction
+# Purpose:
+# Runs `work(cursor, *args)` in a transaction and returns its result. When the database is
+# locked by another PC the whole transaction is retried up to WRITE_RETRIES times, waiting
+# a little longer each time (with jitter, so the PCs do not retry in step).
+# `work` must only touch the database, since it may run more than once.
+# -------------------------------------------
+def write_transaction(work, *args):
+    global write_retries
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            with transaction() as cursor:
+                return work(cursor, *args)
+        except sqlite3.OperationalError as error:
+            if attempt == WRITE_RETRIES or not is_transient_error(error):
+                raise
+        write_retries += 1
+        delay = min(RETRY_DELAY_S * 2 ** attempt, RETRY_MAX_DELAY_S)
+        time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+# -------------------------------------------
+# Function: error_message
+# Purpose:
+# Text shown to the user for a failed database operation.
+# -------------------------------------------
+def error_message(error):
+    if is_transient_error(error):
+        return 'The database is busy: another PC is saving changes. Please try again in a moment.'
+    return f"An error occurred: {error}"
@@ -0,0 +1,234 @@
+import itertools  # Counter for request IDs.
+import queue  # Thread-safe queues between the Tk thread and the worker.
+import sqlite3  # SQLite3 for database management.
+import threading  # Background thread that runs the queries.
+import traceback  # Details of a failing callback.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Worker Settings
+# -------------------------------------------
+POLL_MS = 30  # Interval at which finished requests are handed back to the Tk thread.
+
+
+# -------------------------------------------
+# Class: DatabaseWorker
+# Purpose:
+# Runs database functions on a background thread so a slow query or a locked database file
+# never freezes the Tk event loop. Results are delivered back on the Tk thread through
+# after() polling. Requests submitted with the same key replace each other: a newer request
+# cancels the pending or running older one (for example an outdated search).
+# Long jobs (import, export) run on a thread of their own with submit_job, so the catalog
+# loads, searches and saves queued meanwhile do not wait for them.
+# -------------------------------------------
+class DatabaseWorker:
+    def __init__(self, root, on_busy_change=None):
+        """
+        Parameters:
+        - root: Tk widget used to schedule the polling with after().
+        - on_busy_change: Optional callback called on the Tk thread with True when the worker
+          starts having work and False when it becomes idle (busy indicator).
+        """
+        self.root = root
+        self.on_busy_change = on_busy_change
+        self.requests = queue.Queue()  # Requests waiting for the worker thread.
+        self.results = queue.Queue()  # Finished requests waiting for the Tk thread.
+        self.callbacks = queue.Queue()  # Callbacks posted from the worker (progress updates).
+        self.ids = itertools.count(1)  # Request ID generator.
+        self.latest = {}  # Key -> ID of the newest request with that key.
+        self.pending = 0  # Requests submitted and not delivered yet (Tk thread only).
+        self.running = None  # (ID, key) of the request being executed.
+        self.running_lock = threading.Lock()  # Guards `running` between both threads.
+        self.after_id = None  # Scheduled poll, if any.
+
+        self.thread = threading.Thread(target=self._run, name='DatabaseWorker', daemon=True)
+        self.thread.start()
+
+    # -------------------------------------------
+    # Function: submit
+    # Purpose:
+    # Queues `function(*args)` for the worker thread and returns the request ID.
+    # on_done(result) or on_error(exception) is called later on the Tk thread.
+    # With a key, older requests with the same key are cancelled and never report back.
+    # -------------------------------------------
+    def submit(self, function, *args, on_done=None, on_error=None, key=None):
+        request_id = next(self.ids)
+        if key is not None:
+            self.latest[key] = request_id
+            self._interrupt_stale(key, request_id)
+
+        self.requests.put((request_id, key, function, args, on_done, on_error))
+        self._start_polling()
+        return request_id
+
+    # -------------------------------------------
+    # Function: submit_job
+    # Purpose:
+    # Runs a long `function(*args)` (import, export) on a thread of its own and returns the
+    # request ID. Callbacks and progress work as with submit(); the job has no key and is
+    # stopped through its own cancel event.
+    # -------------------------------------------
+    def submit_job(self, function, *args, on_done=None, on_error=None):
+        request_id = next(self.ids)
+
+        def run_job():
+            try:
+                result, error = function(*args), None
+            except Exception as exc:
+                result, error = None, exc
+            finally:
+                database.release_connection()  # The job thread ends here.
+            self.results.put((request_id, None, result, error, on_done, on_error))
+
+        self._start_polling()
+        threading.Thread(target=run_job, name='DatabaseJob', daemon=True).start()
+        return request_id
+
+    # -------------------------------------------
+    # Function: _start_polling
+    # Purpose:
+    # Counts a new request, shows the busy indicator and makes sure a poll is scheduled.
+    # -------------------------------------------
+    def _start_polling(self):
+        self.pending += 1
+        if self.pending == 1 and self.on_busy_change:
+            self.on_busy_change(True)  # Show the busy indicator.
+        if self.after_id is None:
+            self.after_id = self.root.after(POLL_MS, self._poll)
+
+    # -------------------------------------------
+    # Function: post
+    # Purpose:
+    # Schedules `callback(*args)` on the Tk thread. Safe to call from the worker thread, for
+    # example to report the progress of a long request.
+    # -------------------------------------------
+    def post(self, callback, *args):
+        self.callbacks.put((callback, args))
+
+    # -------------------------------------------
+    # Function: cancel
+    # Purpose:
+    # Cancels the pending or running request with the given key.
+    # -------------------------------------------
+    def cancel(self, key):
+        self.latest[key] = None  # No request with this key is current any more.
+        self._interrupt_stale(key, None)
+
+    # -------------------------------------------
+    # Function: shutdown
+    # Purpose:
+    # Stops the worker thread after the queued requests and stops polling.
+    # -------------------------------------------
+    def shutdown(self):
+        self.requests.put(None)  # Sentinel that ends the worker loop.
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    # -------------------------------------------
+    # Function: _is_stale
+    # Purpose:
+    # Whether a request has been replaced by a newer request with the same key.
+    # -------------------------------------------
+    def _is_stale(self, request_id, key):
+        return key is not None and self.latest.get(key) != request_id
+
+    # -------------------------------------------
+    # Function: _interrupt_stale
+    # Purpose:
+    # Interrupts the running query if it belongs to an older request with the same key.
+    # -------------------------------------------
+    def _interrupt_stale(self, key, request_id):
+        with self.running_lock:
+            if self.running and self.running[1] == key and self.running[0] != request_id:
+                database.interrupt_thread(self.thread.ident)
+
+    # -------------------------------------------
+    # Function: _run
+    # Purpose:
+    # Worker thread: serves requests until shutdown, then closes the thread's connection.
+    # -------------------------------------------
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            database.release_connection()  # The thread ends: close its connection.
+
+    # -------------------------------------------
+    # Function: _serve
+    # Purpose:
+    # Worker thread loop: executes requests in order and queues their results.
+    # -------------------------------------------
+    def _serve(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            request_id, key, function, args, on_done, on_error = request
+            if self._is_stale(request_id, key):
+                self.results.put((request_id, key, None, None, None, None))  # Skipped.
+                continue
+
+            with self.running_lock:
+                self.running = (request_id, key)
+            try:
+                result, error = function(*args), None
+            except Exception as exc:
+                result, error = None, exc
+            finally:
+                with self.running_lock:
+                    self.running = None
+            self.results.put((request_id, key, result, error, on_done, on_error))
+
+    # -------------------------------------------
+    # Function: _deliver
+    # Purpose:
+    # Calls a callback on the Tk thread. A callback that raises is reported and skipped, so
+    # the other results are still delivered and polling goes on.
+    # -------------------------------------------
+    def _deliver(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception:
+            print(f"Error in a database worker callback ({getattr(callback, '__name__', callback)}):")
+            traceback.print_exc()
+
+    # -------------------------------------------
+    # Function: _poll
+    # Purpose:
+    # Runs on the Tk thread: delivers finished requests to their callbacks.
+    # Results of stale requests (and interrupted queries) are dropped.
+    # -------------------------------------------
+    def _poll(self):
+        self.after_id = None
+        try:
+            while True:
+                try:
+                    callback, args = self.callbacks.get_nowait()
+                except queue.Empty:
+                    break
+                self._deliver(callback, *args)  # Progress update posted by the running request.
+
+            while True:
+                try:
+                    request_id, key, result, error, on_done, on_error = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self.pending -= 1
+                if self._is_stale(request_id, key):
+                    continue
+                if error is None:
+                    if on_done:
+                        self._deliver(on_done, result)
+                elif isinstance(error, sqlite3.OperationalError) and str(error) == 'interrupted':
+                    continue  # Cancelled while running.
+                elif on_error:
+                    self._deliver(on_error, error)
+                else:
+                    print(f"Error in database worker: {error}")  # Print any database errors.
+        finally:
+            if self.pending:
+                if self.after_id is None:
+                    self.after_id = self.root.after(POLL_MS, self._poll)  # Keep polling while work is queued.
+            elif self.on_busy_change:
+                self._deliver(self.on_busy_change, False)  # Hide the busy indicator.
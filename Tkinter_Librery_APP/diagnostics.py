@@ -0,0 +1,100 @@
+import time  # Formats the time of the records.
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+from tkinter import ttk  # Themed widgets for Tkinter.
+import query_trace  # Recorded statements and widget sections.
+
+# -------------------------------------------
+# Block: Diagnostics Settings
+# -------------------------------------------
+REFRESH_MS = 1000  # Interval at which the window shows the new records.
+SHOWN_RECORDS = 500  # Newest records listed in the table.
+SLOW_MS = 50  # Records slower than this are highlighted.
+
+
+# -------------------------------------------
+# Function: open_diagnostics_window
+# Purpose:
+# Opens the hidden diagnostics window (Ctrl+Shift+D in the main window). It lists the latest
+# statements and widget refreshes with their duration, rows, thread and calling function, a
+# summary of the time spent in the database and in the widgets, and switches for tracing and
+# the rotating log file.
+# -------------------------------------------
+def open_diagnostics_window(main_root):
+    # Block: Initialize Diagnostics Window
+    diagnostics_root = ctk.CTkToplevel(main_root)  # Diagnostics window instance.
+    diagnostics_root.geometry('1100x520')  # Set window size.
+    diagnostics_root.title('Diagnostics')  # Set window title.
+    diagnostics_root.after(200, lambda: diagnostics_root.iconbitmap('./images/icobookstore.ico'))  # Set window icon after 200ms.
+
+    # Block: Summary and Switches
+    summary_label = ctk.CTkLabel(diagnostics_root, text='', font=('Cascadia Code', 12), anchor='w')  # Totals.
+    summary_label.pack(fill='x', padx=10, pady=(10, 0))
+
+    controls_frame = ctk.CTkFrame(diagnostics_root, fg_color='transparent')  # Row of switches.
+    controls_frame.pack(fill='x', padx=10, pady=5)
+    trace_var = ctk.BooleanVar(value=query_trace.TRACE_ENABLED)  # Recording on/off.
+    log_var = ctk.BooleanVar(value=query_trace.is_logging())  # Log file on/off.
+    ctk.CTkCheckBox(
+        controls_frame, text='Trace statements', variable=trace_var,
+        command=lambda: query_trace.set_enabled(trace_var.get()), font=('Cascadia Code', 12)
+    ).pack(side='left', padx=(0, 20))
+    ctk.CTkCheckBox(
+        controls_frame, text=f'Write log file ({query_trace.LOG_PATH})', variable=log_var,
+        command=lambda: query_trace.set_log_file(log_var.get()), font=('Cascadia Code', 12)
+    ).pack(side='left', padx=(0, 20))
+    ctk.CTkButton(
+        controls_frame, text='Clear', width=80, fg_color='#605b3e', hover_color='#4c2c18',
+        command=lambda: (query_trace.records.clear(), show_records()), font=('Cascadia Code', 12)
+    ).pack(side='left')
+
+    # Block: Records Table
+    columns = ('time', 'kind', 'duration', 'rows', 'thread', 'caller', 'statement')
+    records_table = ttk.Treeview(diagnostics_root, columns=columns, show='headings')  # Latest records.
+    widths = {'time': 90, 'kind': 60, 'duration': 80, 'rows': 60, 'thread': 130, 'caller': 260, 'statement': 420}
+    for column in columns:
+        records_table.heading(column, text=column.capitalize())
+        records_table.column(column, width=widths[column], anchor='w' if column in ('caller', 'statement') else 'center')
+    records_table.tag_configure('slow', foreground='#c0392b')  # Records slower than SLOW_MS.
+    scrollbar = ctk.CTkScrollbar(diagnostics_root, orientation='vertical', command=records_table.yview)
+    records_table.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side='right', fill='y', pady=(0, 10))
+    records_table.pack(fill='both', expand=True, padx=(10, 0), pady=(0, 10))
+
+    # -------------------------------------------
+    # Function: show_records
+    # Purpose:
+    # Refreshes the summary and the table with the newest records.
+    # -------------------------------------------
+    def show_records():
+        totals = query_trace.summary()
+        sql_count, sql_ms, sql_slowest = totals['sql']
+        widget_count, widget_ms, widget_slowest = totals['widget']
+        summary_label.configure(text=(
+            f'Database: {sql_count} statements, {sql_ms:.1f} ms total, slowest {sql_slowest:.1f} ms    '
+            f'Widgets: {widget_count} refreshes, {widget_ms:.1f} ms total, slowest {widget_slowest:.1f} ms'
+        ))
+
+        records_table.delete(*records_table.get_children())
+        newest = list(query_trace.records)[-SHOWN_RECORDS:]
+        for record in reversed(newest):
+            records_table.insert('', 'end', values=(
+                time.strftime('%H:%M:%S', time.localtime(record.started_at)),
+                record.kind,
+                f'{record.duration_ms:.2f}',
+                record.rows,
+                record.thread,
+                record.caller,
+                ' '.join(record.sql.split()),  # One line per statement.
+            ), tags=('slow',) if record.duration_ms > SLOW_MS else ())
+
+    # -------------------------------------------
+    # Function: refresh_loop
+    # Purpose:
+    # Shows the new records every REFRESH_MS while the window is open.
+    # -------------------------------------------
+    def refresh_loop():
+        if diagnostics_root.winfo_exists():
+            show_records()
+            diagnostics_root.after(REFRESH_MS, refresh_loop)
+
+    refresh_loop()
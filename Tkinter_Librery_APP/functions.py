@@ -1,6 +1,14 @@
 import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
 from tkinter import messagebox  # Module for displaying message boxes.
-import sqlite3  # SQLite3 for database management.
+import threading  # Event used to cancel long background work.
+import database  # Shared database connection layer.
+import catalog_cache  # In-memory catalog, re-read only after a commit.
+import soft_delete  # Deletes move books to the trash.
+import query_trace  # Times the widget side of a refresh.
+
+# Rows currently shown in each table, keyed by widget name: {book_id item ID: values}.
+# Kept in display order so a refresh can be compared with what is on screen.
+_shown_rows = {}
 
 # -------------------------------------------
 # Function: exit_command
@@ -91,82 +99,159 @@ def exit_command(login_root):
 # -------------------------------------------
 # Function: delete_item
 # Purpose:
-# Deletes a selected book from the database after user confirmation.
+# Deletes the selected books after user confirmation (they are moved to the trash, see
+# soft_delete.py). With an UndoJournal the delete can be undone.
 # Refreshes the table to reflect the changes and handles potential errors.
+# The refresh_treeview callback defaults to a full reload of the table.
+# With a DatabaseWorker the delete runs off the Tk thread.
 # -------------------------------------------
-def delete_item(main_root, tabla_information):
-    # Block: Initialize Database Connection
-    # Connects to the SQLite database and creates a cursor for executing queries.
-    conn = sqlite3.connect('./db/bookstore_management.db')  # Connect to the database.
-    cursor = conn.cursor()  # Create a cursor object.
-
+def delete_item(main_root, tabla_information, refresh_treeview=None, worker=None, journal=None):
     # Block: Retrieve Selected Item
-    # Gets the currently selected item in the table.
-    selected_item = tabla_information.selection()  # Get selected item.
+    # Gets the currently selected items in the table.
+    selected_item = tabla_information.selection()  # Get selected items.
 
     if selected_item:
-        # Block: Extract Book ID
-        # Retrieves the book ID from the selected item.
-        book_id = tabla_information.item(selected_item[0])['values'][0]  # Extract book_id.
+        # Block: Extract Book IDs
+        # Rows are inserted with their book ID as item ID.
+        book_ids = [int(item) for item in selected_item]  # Extract book_ids.
+        if len(book_ids) == 1:
+            description = f'"{tabla_information.set(selected_item[0], "book_name")}"'  # Title for the undo label.
+            question = 'Do you want to delete this book?'
+        else:
+            description = f'{len(book_ids)} books'
+            question = f'Do you want to delete these {len(book_ids)} books?'
 
         # Block: Confirm Deletion
-        # Asks the user to confirm the deletion of the selected book.
-        message = messagebox.askyesno('Message', 'Do you want to delete this book?', parent=main_root)
+        # Asks the user to confirm the deletion of the selected books.
+        message = messagebox.askyesno('Message', question, parent=main_root)
         if message:
-            try:
-                # Block: Execute Deletion Query
-                # Deletes the book from the database and reorders the remaining book IDs.
-                cursor.execute("DELETE FROM books WHERE book_id = ?", (book_id,))  # Delete the book.
-                conn.commit()  # Commit the changes.
-
-                # Block: Reorder Book IDs
-                # Updates the book IDs to maintain a consecutive order after deletion.
-                cursor.execute("""
-                    WITH Ordered AS (
-                        SELECT rowid, book_id, ROW_NUMBER() OVER (ORDER BY book_id) AS new_id
-                        FROM books
-                    )
-                    UPDATE books
-                    SET book_id = (SELECT new_id FROM Ordered WHERE Ordered.rowid = books.rowid)
-                """)  # Reorder book IDs.
-                conn.commit()  # Commit the changes.
+            def on_deleted(result):
+                deleted_at, trashed = result
+                if journal:
+                    journal.record_trash(description, trashed, deleted_at)  # Can be undone.
 
                 # Block: Refresh Table Display
                 # Updates the table to reflect the deletion.
-                refresh_table(tabla_information, cursor)  # Refresh the table.
+                (refresh_treeview or refresh_table)(tabla_information)  # Refresh the table.
 
                 # Block: Inform User of Successful Deletion
-                messagebox.showinfo('Message', 'Book deleted successfully!', parent=main_root)  # Success message.
-            except Exception as e:
+                text = 'Book deleted successfully!' if len(book_ids) == 1 else f'{len(book_ids)} books deleted successfully!'
+                if journal:
+                    text += ' Press Ctrl+Z to undo.'
+                messagebox.showinfo('Message', text, parent=main_root)  # Success message.
+
+            def on_error(e):
                 # Block: Handle Deletion Errors
                 # Displays an error message if the deletion fails.
-                messagebox.showerror('Error', f"An error occurred: {e}", parent=main_root)  # Error message.
+                messagebox.showerror('Error', database.error_message(e), parent=main_root)  # Error message.
+
+            # Block: Execute Deletion Query
+            if worker:
+                worker.submit(soft_delete.trash_books, book_ids, on_done=on_deleted, on_error=on_error)  # Delete in the background.
+            else:
+                try:
+                    result = soft_delete.trash_books(book_ids)
+                except Exception as e:
+                    on_error(e)
+                else:
+                    on_deleted(result)
     else:
         # Block: No Selection Made
         # Informs the user that no item was selected for deletion.
         messagebox.showinfo('Message', "No item selected", parent=main_root)  # Informational message.
 
-    # Block: Close Database Connection
-    conn.close()  # Close the database connection.
+
+# -------------------------------------------
+# Function: delete_book
+# Purpose:
+# Deletes a book by primary key: it is moved to the trash and removed for good by the purge
+# job later. Remaining IDs are left untouched; the consecutive row number is only computed
+# for display. Returns (tombstone time, [book_id]) like soft_delete.trash_books.
+# Retried when another PC holds the write lock (see database.write_transaction).
+# -------------------------------------------
+def delete_book(book_id):
+    return soft_delete.trash_books([book_id])
 
 
 # -------------------------------------------
 # Function: refresh_table
 # Purpose:
-# Clears and repopulates the table with the latest data from the database.
+# Updates the table with the latest data from the database.
 # Ensures that the table display is up-to-date after any modifications.
 # -------------------------------------------
-def refresh_table(tabla_information, cursor):
-    # Block: Clear Existing Table Entries
-    # Removes all current entries from the table.
-    for row in tabla_information.get_children():
-        tabla_information.delete(row)  # Delete each row.
-
+def refresh_table(tabla_information):
     # Block: Fetch Updated Data
-    # Retrieves the latest book data from the database.
-    cursor.execute("SELECT book_id, book_name, book_publisher, author_name, book_year, book_genre, book_language, book_ISBN, book_quantity FROM books ORDER BY book_id")  # Execute select query.
-    for row in cursor.fetchall():
-        tabla_information.insert("", "end", values=row)  # Insert each row into the table.
+    # Takes the books from the catalog cache (read from disk only if the database changed)
+    # and applies only the differences.
+    show_book_rows(tabla_information, catalog_cache.all_books())
+
+
+# -------------------------------------------
+# Function: show_book_rows
+# Purpose:
+# Makes the table show the given book records, using the book ID as item ID and prepending
+# the consecutive row number shown in the "#" column (display only).
+# Compares with the rows shown by the previous call and only deletes, inserts, moves or
+# updates the items that changed, so the scroll position and the selection are kept.
+# The table must only be filled through this function.
+# -------------------------------------------
+def show_book_rows(tabla_information, rows, start_number=1):
+    with query_trace.timed_section('show_book_rows') as trace:
+        _show_book_rows(tabla_information, rows, start_number)
+        if trace is not None:
+            trace.rows = len(rows)
+
+
+def _show_book_rows(tabla_information, rows, start_number):
+    key = str(tabla_information)  # Widget name of the table.
+    shown = _shown_rows.get(key, {})  # Rows on screen after the previous refresh.
+
+    # Block: Build New Display Rows
+    new_rows = {}
+    for row_number, row in enumerate(rows, start=start_number):
+        new_rows[str(row[0])] = (row_number,) + tuple(row)
+
+    # Block: Remove Rows That Are Gone
+    removed = [item for item in shown if item not in new_rows]
+    if removed:
+        tabla_information.delete(*removed)  # One call for all the removed rows.
+
+    # Block: Check Whether The Kept Rows Changed Order
+    kept_order = [item for item in shown if item in new_rows]
+    reordered = kept_order != [item for item in new_rows if item in shown]
+
+    # Block: Insert, Move and Update Rows
+    # Rows are visited in display order, so every item before `index` is already in place.
+    for index, (item, values) in enumerate(new_rows.items()):
+        old_values = shown.get(item)
+        if old_values is None:
+            tabla_information.insert("", index, iid=item, values=values)  # New row.
+            continue
+        if reordered:
+            tabla_information.move(item, "", index)  # Put the row in its new position.
+        if old_values != values:
+            tabla_information.item(item, values=values)  # Changed row.
+
+    _shown_rows[key] = new_rows  # Remember what is on screen for the next refresh.
+
+
+# -------------------------------------------
+# Function: update_book_rows
+# Purpose:
+# Shows new values for the given book records where they are on screen, without reloading
+# or moving anything (used after saving edits). Books that are not shown are ignored.
+# -------------------------------------------
+def update_book_rows(tabla_information, rows):
+    shown = _shown_rows.get(str(tabla_information), {})
+    for row in rows:
+        item = str(row[0])
+        old_values = shown.get(item)
+        if old_values is None:
+            continue  # Not on screen.
+        values = old_values[:1] + tuple(row)  # Keep the row number.
+        if values != old_values:
+            tabla_information.item(item, values=values)
+            shown[item] = values
 
 
 # -------------------------------------------
@@ -193,3 +278,44 @@ def update_user_name_label(name_label, username):
         name_label.configure(text=f"Welcome, {username.upper()}")  # Display username in uppercase.
     else:
         name_label.configure(text="Welcome, Guest")  # Default to "Guest" if no username.
+
+
+# -------------------------------------------
+# Function: open_progress_window
+# Purpose:
+# Creates a small window with a status label, a progress bar and a Cancel button for long
+# background work (import, export). Returns the window, an update(fraction, text) function
+# and the threading.Event set when the user presses Cancel.
+# -------------------------------------------
+def open_progress_window(main_root, title):
+    progress_root = ctk.CTkToplevel(main_root)  # Progress window instance.
+    progress_root.geometry('400x160')  # Set window size.
+    progress_root.title(title)  # Set window title.
+    progress_root.resizable(False, False)  # Disable window resizing.
+    progress_root.transient(main_root)  # Set as transient window.
+    progress_root.after(200, lambda: progress_root.iconbitmap('./images/icobookstore.ico'))  # Set window icon after 200ms.
+
+    progress_label = ctk.CTkLabel(progress_root, text='Starting...', font=('Cascadia Code', 12))  # Status text.
+    progress_label.place(x=20, y=20)  # Position the status text.
+    progress_bar = ctk.CTkProgressBar(progress_root, width=360, progress_color='#605b3e')  # Progress bar.
+    progress_bar.set(0)
+    progress_bar.place(x=20, y=60)  # Position the progress bar.
+
+    cancel_event = threading.Event()  # Set by the Cancel button.
+    cancel_button = ctk.CTkButton(
+        progress_root,
+        text='Cancel',  # Button text.
+        fg_color='#605b3e',  # Foreground color.
+        hover_color='#4c2c18',  # Hover color.
+        font=('Cascadia Code', 14),  # Font style and size.
+        width=100,  # Button width.
+        height=30,  # Button height.
+        command=cancel_event.set  # Ask the background work to stop.
+    )
+    cancel_button.place(x=150, y=100)  # Position the "Cancel" button.
+
+    def update(fraction, text):
+        progress_bar.set(fraction)  # Fraction of the work done, from 0 to 1.
+        progress_label.configure(text=text)  # Status text.
+
+    return progress_root, update, cancel_event
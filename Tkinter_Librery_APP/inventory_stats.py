@@ -0,0 +1,136 @@
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Inventory Dashboard Settings
+# Purpose:
+# The dashboard reads the summary tables kept up to date by triggers (see the inventory
+# statistics migration): a handful of rows, whatever the size of the catalog.
+# -------------------------------------------
+DIMENSIONS = {'Genre': 'genre', 'Language': 'language', 'Decade': 'decade'}  # Button -> stats_groups.dimension.
+STATS_KEY = 'inventory_stats'  # Worker key: a newer load replaces an older one.
+
+
+# -------------------------------------------
+# Function: load_inventory_stats
+# Purpose:
+# Returns {'titles', 'copies', 'groups': {dimension: [(value, titles, copies), ...]}} from the
+# summary tables. Genres and languages are listed by number of titles, decades in order.
+# -------------------------------------------
+def load_inventory_stats():
+    titles, copies = database.fetch_one('SELECT titles, copies FROM stats_totals') or (0, 0)
+    groups = {dimension: [] for dimension in DIMENSIONS.values()}
+    for dimension, value, group_titles, group_copies in database.fetch_all(
+        'SELECT dimension, value, titles, copies FROM stats_groups'
+    ):
+        groups[dimension].append((value, group_titles, group_copies))
+    for dimension, rows in groups.items():
+        if dimension == 'decade':
+            rows.sort()
+        else:
+            rows.sort(key=lambda row: (-row[1], str(row[0])))
+    return {'titles': titles, 'copies': copies, 'groups': groups}
+
+
+# -------------------------------------------
+# Function: group_label
+# Purpose:
+# Text shown for a group value ("1990s" for a decade).
+# -------------------------------------------
+def group_label(dimension, value):
+    return f'{value}s' if dimension == 'decade' else str(value)
+
+
+# -------------------------------------------
+# Function: inventory_panel
+# Purpose:
+# Adds the inventory summary (titles and copies) to the left panel of the main window.
+# Clicking it shows the dashboard with the counts by genre, language and decade over the
+# search and action controls; "Close" hides it again.
+# Returns a function that reloads the numbers on the database worker.
+# -------------------------------------------
+def inventory_panel(left_frame, worker):
+    stats = {'titles': 0, 'copies': 0, 'groups': {dimension: [] for dimension in DIMENSIONS.values()}}
+
+    # Block: Summary Line
+    summary_label = ctk.CTkLabel(left_frame, text='', font=('Cascadia Code', 12), cursor='hand2')
+    summary_label.place(x=150, y=165, anchor='n')  # Centered under the user name.
+    summary_label.bind('<Button-1>', lambda event: toggle_dashboard())
+
+    # Block: Dashboard
+    # Covers the search and the buttons while it is open.
+    dashboard_frame = ctk.CTkFrame(left_frame, width=280, height=560, fg_color=left_frame.cget('fg_color'))
+    dashboard_frame.pack_propagate(False)  # Keep the fixed size of the panel area.
+    ctk.CTkLabel(dashboard_frame, text='Inventory', font=('Cascadia Code', 16, 'bold')).pack(pady=(5, 0))
+    totals_label = ctk.CTkLabel(dashboard_frame, text='', font=('Cascadia Code', 12))
+    totals_label.pack()
+    dimension_button = ctk.CTkSegmentedButton(
+        dashboard_frame, values=list(DIMENSIONS), command=lambda choice: show_groups(),
+        selected_color='#605b3e', selected_hover_color='#4c2c18', font=('Cascadia Code', 12)
+    )
+    dimension_button.set('Genre')
+    dimension_button.pack(pady=5)
+    groups_frame = ctk.CTkScrollableFrame(dashboard_frame, width=250, height=380)  # One line per group.
+    groups_frame.pack(fill='both', expand=True, padx=5)
+    groups_frame.grid_columnconfigure(0, weight=1)
+    ctk.CTkButton(
+        dashboard_frame, text='Close', width=120, fg_color='#605b3e', hover_color='#4c2c18',
+        command=lambda: toggle_dashboard(), font=('Cascadia Code', 12)
+    ).pack(pady=5)
+
+    # -------------------------------------------
+    # Function: show_groups
+    # Purpose:
+    # Lists the titles and copies of every group of the selected dimension.
+    # -------------------------------------------
+    def show_groups():
+        for child in groups_frame.winfo_children():
+            child.destroy()
+        dimension = DIMENSIONS[dimension_button.get()]
+        for column, heading in enumerate((dimension_button.get(), 'Titles', 'Copies')):
+            ctk.CTkLabel(groups_frame, text=heading, font=('Cascadia Code', 12, 'bold')).grid(
+                row=0, column=column, sticky='w' if column == 0 else 'e', padx=4)
+        for row, (value, titles, copies) in enumerate(stats['groups'][dimension], start=1):
+            for column, text in enumerate((group_label(dimension, value), f'{titles:,}', f'{copies:,}')):
+                ctk.CTkLabel(groups_frame, text=text, font=('Cascadia Code', 12)).grid(
+                    row=row, column=column, sticky='w' if column == 0 else 'e', padx=4)
+
+    # -------------------------------------------
+    # Function: show_stats
+    # Purpose:
+    # Shows freshly loaded numbers.
+    # -------------------------------------------
+    def show_stats(result):
+        stats.update(result)
+        text = f"{stats['titles']:,} titles, {stats['copies']:,} copies"
+        summary_label.configure(text=text)
+        totals_label.configure(text=text)
+        if dashboard_frame.winfo_ismapped():
+            show_groups()
+
+    # -------------------------------------------
+    # Function: toggle_dashboard
+    # Purpose:
+    # Opens or closes the dashboard.
+    # -------------------------------------------
+    def toggle_dashboard():
+        if dashboard_frame.winfo_ismapped():
+            dashboard_frame.place_forget()
+        else:
+            show_groups()
+            dashboard_frame.place(x=10, y=195)
+            dashboard_frame.lift()  # Above the controls created later.
+
+    # -------------------------------------------
+    # Function: refresh_stats
+    # Purpose:
+    # Reloads the numbers in the background.
+    # -------------------------------------------
+    def refresh_stats():
+        worker.submit(
+            load_inventory_stats, on_done=show_stats,
+            on_error=lambda err: print(f"Error loading inventory statistics: {err}"),  # Not worth a message box.
+            key=STATS_KEY
+        )
+
+    return refresh_stats
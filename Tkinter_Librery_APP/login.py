@@ -1,21 +1,23 @@
 import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
-from PIL import Image, UnidentifiedImageError  # Module to load and handle images.
+from PIL import UnidentifiedImageError  # Error raised for invalid image files.
 import tkinter.messagebox as messagebox  # Module for displaying message boxes.
 import sqlite3  # SQLite3 for database management.
-import subprocess  # Module to execute external scripts or programs.
+import database  # Shared database connection layer.
+from credentials import verify_login  # Salted scrypt password check.
+from db_worker import DatabaseWorker  # Runs the password check off the Tk thread.
+from assets import load_ctk_image  # Decoded-once, pre-resized images.
 from functions import exit_command  # Custom function to handle exit operations.
 
 # -------------------------------------------
 # Function: login_screen_main
 # Purpose:
-# This function creates and manages the main login window.
+# This function shows the login screen in the application window.
 # It handles user input for username and password, validates credentials
-# against the SQLite database, and transitions to the main application upon successful login.
+# against the SQLite database, and calls `on_login(username)` upon successful login.
 # -------------------------------------------
-def login_screen_main():
+def login_screen_main(login_root, on_login):
     # Block: Initialize Login Window
-    # Creates the main login window with fixed size and no borders.
-    login_root = ctk.CTk()  # Main window instance.
+    # Sets up the window with fixed size and no borders.
     login_root.geometry("850x450")  # Set window size.
     login_root.resizable(False, False)  # Disable window resizing.
     login_root.config(bg='#aa965b')  # Set background color.
@@ -64,10 +66,10 @@ def login_screen_main():
     # -------------------------------------------
     def load_background_image():
         try:
-            login_image = ctk.CTkImage(
-                light_image=Image.open('./images/login_background.jpg'),  # Light mode image.
-                dark_image=Image.open('./images/login_background.jpg'),   # Dark mode image.
-                size=(850, 450)  # Set image size to match window.
+            login_image = load_ctk_image(
+                './images/login_background.jpg',  # Shared by the light and dark modes.
+                (850, 450),  # Set image size to match window.
+                login_root
             )
             return login_image
         except (FileNotFoundError, UnidentifiedImageError):
@@ -169,11 +171,15 @@ def login_screen_main():
         font=('Cascadia Code', 12)  # Font style and size.
     )
 
+    # Block: Start Credential Worker
+    # The password hash is slow on purpose, so it is checked on a background thread.
+    worker = DatabaseWorker(login_root)  # Background thread for the password check.
+
     # -------------------------------------------
     # Function: validate_credentials
     # Purpose:
     # Retrieves the entered username and password, validates them against
-    # the SQLite database, and proceeds to the main application if valid.
+    # the SQLite database on the worker thread, and proceeds to the main application if valid.
     # Displays an error message if validation fails.
     # -------------------------------------------
     def validate_credentials():
@@ -184,36 +190,30 @@ def login_screen_main():
         if not username or not password:
             messagebox.showwarning("Input Error", "Please enter both username and password.")
             return
+        if worker.pending:
+            return  # A check is already running.
 
-        # Database connection details.
-        db_path = './db/bookstore_management.db'  # Path to the SQLite database.
-        table_name = 'usuarios'  # Name of the user table.
-        username_column = 'nombre_usuario'  # Column name for username.
-        password_column = 'password'  # Column name for password.
-
-        try:
-            conn = sqlite3.connect(db_path)  # Connect to the database.
-            cursor = conn.cursor()  # Create a cursor object.
-
-            # SQL query to select user with matching username and password.
-            query = f"""
-            SELECT * FROM "{table_name}"
-            WHERE "{username_column}" = ? AND "{password_column}" = ?
-            """
-            cursor.execute(query, (username, password))  # Execute the query with parameters.
-            result = cursor.fetchone()  # Fetch the first matching record.
-            conn.close()  # Close the database connection.
-
-            if result:
-                # If credentials are valid, launch the main application.
-                subprocess.Popen(["pythonw", "main_data.py", username_var.get()], creationflags=subprocess.CREATE_NO_WINDOW)
-                login_root.destroy()  # Close the login window.
+        def on_checked(valid):
+            """Switches to the main application, or shows the error message."""
+            login_button.configure(state='normal', text='Sign in')
+            if valid:
+                worker.shutdown()  # The main window has its own worker.
+                on_login(username)
             else:
                 # If credentials are invalid, display the error message.
                 miss_data.place(x=300, y=240)
-        except sqlite3.Error as e:
-            # Show a database error message if an exception occurs.
-            messagebox.showerror("Database Error", f"An error occurred: {e}")
+
+        def on_error(e):
+            """Shows a database error message if an exception occurs."""
+            login_button.configure(state='normal', text='Sign in')
+            if isinstance(e, sqlite3.Error):
+                messagebox.showerror("Database Error", database.error_message(e))
+            else:
+                messagebox.showerror("Error", f"An error occurred: {e}")
+
+        miss_data.place_forget()  # Hide the previous error while checking.
+        login_button.configure(state='disabled', text='Signing in...')
+        worker.submit(verify_login, username, password, on_done=on_checked, on_error=on_error)
 
     # Block: Create Login Button
     # Button to initiate credential validation.
@@ -260,13 +260,12 @@ def login_screen_main():
     # Allows the user to press Enter to submit the login form.
     login_root.bind('<Return>', on_enter_key)  # Bind the Enter key to the handler.
 
-    # Block: Start Main Event Loop
-    # Initiates the Tkinter event loop to run the login screen.
-    login_root.mainloop()  # Start the Tkinter event loop.
 
 # -------------------------------------------
 # Execution: Start Login Screen
 # Purpose:
-# Calls the main function to initialize and display the login screen.
+# Running this file starts the application from the login screen.
 # -------------------------------------------
-login_screen_main()
+if __name__ == "__main__":
+    from app import main
+    main('login')
@@ -1,11 +1,35 @@
 import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
-from PIL import Image  # PIL for image handling.
 import sys  # Module to interact with the Python interpreter.
-from tkinter import ttk  # Themed widgets for Tkinter.
+import database  # Shared database connection layer.
+from tkinter import TclError, ttk  # Themed widgets for Tkinter.
 from addBookWindow import add_book_window  # Function to open the "Add Book" window.
 import tkinter.messagebox as messagebox  # Module for displaying message boxes.
-import sqlite3  # SQLite3 for database management.
-from functions import delete_item, deselect_item, update_user_name_label  # Custom utility functions.
+from functions import delete_item, deselect_item, show_book_rows, update_book_rows, update_user_name_label  # Custom utility functions.
+from virtual_table import LOAD_KEY, VirtualTable  # Keyset-paginated view of the books table.
+from db_worker import DatabaseWorker  # Runs database work off the Tk thread.
+from row_hover import RowHover  # Highlights the treeview row under the mouse.
+from search import DEFAULT_SORT, build_filter, search_books  # Indexed search and sort behind the catalog.
+from catalog_import import import_books_window  # Bulk import of supplier catalogs.
+from catalog_export import export_books_window  # Streaming export of the catalog.
+from assets import load_ctk_image  # Decoded-once, pre-resized images.
+from diagnostics import open_diagnostics_window  # Hidden query timing window.
+from change_watcher import ChangeWatcher  # Refreshes the table after other PCs commit.
+from inventory_stats import inventory_panel  # Trigger-maintained inventory dashboard.
+from rentals import rent_book_window  # Checkout and returns of rented books.
+from book_details import book_info_window  # Lazily loaded details of the selected book.
+from book_editor import BookEditor  # In-place editing with buffered saves.
+from soft_delete import PurgeJob, UndoJournal  # Trash with undo and a batched purge.
+
+# -------------------------------------------
+# Block: Catalog View Settings
+# Purpose:
+# With the virtual table mode only the visible rows are kept in the treeview and pages are
+# fetched while scrolling. Without it the whole books table is loaded at startup.
+# -------------------------------------------
+VIRTUAL_TABLE_MODE = True  # Use the keyset-paginated catalog view.
+ROW_HEIGHT = 30  # Height of a treeview row in pixels.
+SEARCH_DELAY_MS = 250  # Pause in typing before the search runs.
+REFRESH_RETRY_MS = 2000  # Wait before refreshing again when the database was busy.
 
 
 # -------------------------------------------
@@ -15,11 +39,15 @@ from functions import delete_item, deselect_item, update_user_name_label  # Cust
 # Sets up the user interface, including the treeview for displaying books,
 # user information panel, search functionality, and action buttons.
 # -------------------------------------------
-def main_window():
+def main_window(main_root, username=None):
     """
     Initializes and displays the main window of the bookstore management application.
     Sets up the user interface, including the treeview for displaying books,
     user information panel, search functionality, and action buttons.
+
+    Parameters:
+    - main_root: The application window the main screen is built in.
+    - username: Name of the logged-in user, or None for a guest.
     """
 
     # -------------------------------------------
@@ -27,12 +55,14 @@ def main_window():
     # Purpose:
     # Sets up the main window's properties such as size, title, icon, and theme.
     # -------------------------------------------
-    main_root = ctk.CTk()  # Main application window instance.
     main_root.geometry('1400x800')  # Set window size.
     main_root.title('BooksTore')  # Set window title.
     main_root.resizable(True, True)  # Allow window resizing.
     ctk.set_default_color_theme('dark-blue')  # Set the default color theme.
-    main_root.iconbitmap('./images/icobookstore.ico')  # Set window icon.
+    try:
+        main_root.iconbitmap('./images/icobookstore.ico')  # Set window icon.
+    except TclError:
+        pass  # .ico icons are only supported on Windows (e.g. the benchmarks under Xvfb).
 
     # -------------------------------------------
     # Block: Center Main Window on Screen
@@ -58,9 +88,11 @@ def main_window():
     # -------------------------------------------
     # Block: Bind Events
     # Purpose:
-    # Binds a left-click event to the main window to handle item deselection in the treeview.
+    # Binds a left-click event to the main window to handle item deselection in the treeview,
+    # and Ctrl+Shift+D to the hidden diagnostics window.
     # -------------------------------------------
     main_root.bind("<Button-1>", lambda event: deselect_item(event, tabla_information))  # Bind left-click to deselect items.
+    main_root.bind("<Control-Shift-D>", lambda event: open_diagnostics_window(main_root))  # Hidden diagnostics window.
 
     # -------------------------------------------
     # Block: Setup Treeview Frame
@@ -78,36 +110,6 @@ def main_window():
     scrollbar_vertical = ctk.CTkScrollbar(treeview_frame, orientation="vertical")  # Vertical scrollbar.
     scrollbar_horizontal = ctk.CTkScrollbar(treeview_frame, orientation="horizontal")  # Horizontal scrollbar.
 
-    # -------------------------------------------
-    # Block: Define Hover Effects
-    # Purpose:
-    # Implements visual feedback when hovering over treeview rows.
-    # -------------------------------------------
-    def ttk_hover(event):
-        """
-        Highlights the row under the mouse cursor in the treeview.
-
-        Parameters:
-        - event: The event object containing information about the mouse movement.
-        """
-        my_line = tabla_information.identify_row(event.y)  # Identify the row under the cursor.
-
-        if my_line:
-            tabla_information.tag_configure('hover', background='#605b3e', foreground='#ffffff')  # Configure hover tag.
-
-            for i in tabla_information.get_children():
-                tabla_information.item(i, tags=('hover',) if i == my_line else ())  # Apply hover tag to the current row.
-
-    def ttk_leave(event):
-        """
-        Removes the hover highlight from all rows in the treeview.
-
-        Parameters:
-        - event: The event object indicating the mouse has left the treeview.
-        """
-        for i in tabla_information.get_children():
-            tabla_information.item(i, tags=())  # Remove all tags from rows.
-
     # -------------------------------------------
     # Block: Initialize Treeview
     # Purpose:
@@ -115,7 +117,7 @@ def main_window():
     # -------------------------------------------
     tabla_information = ttk.Treeview(
         treeview_frame,
-        columns=("book_id", "book_name", "book_publisher", "author_name", "book_year",
+        columns=("row_number", "book_id", "book_name", "book_publisher", "author_name", "book_year",
                  "book_genre", "book_language", "book_isbn", "book_quantity"),
         show='headings',
         yscrollcommand=scrollbar_vertical.set,
@@ -130,7 +132,7 @@ def main_window():
     style = ttk.Style()  # Initialize style.
     # Uncomment the next line to use a different theme.
     # style.theme_use('clam')  # Set a different theme if desired.
-    style.configure("Treeview", rowheight=30, font=('Arial', 11))  # Configure row height and font.
+    style.configure("Treeview", rowheight=ROW_HEIGHT, font=('Arial', 11))  # Configure row height and font.
     style.map(
         'Treeview',
         background=[('selected', '#4c2c18')],  # Background color when selected.
@@ -140,10 +142,9 @@ def main_window():
     # -------------------------------------------
     # Block: Bind Hover Events to Treeview
     # Purpose:
-    # Associates the hover and leave functions with the treeview events.
+    # Highlights the row under the mouse cursor. Only the previous and the new row are retagged.
     # -------------------------------------------
-    tabla_information.bind('<Motion>', ttk_hover)  # Bind mouse movement to hover effect.
-    tabla_information.bind('<Leave>', ttk_leave)  # Bind mouse leave to remove hover effect.
+    RowHover(tabla_information)  # Binds <Motion> and <Leave> on the treeview, which keeps it alive.
 
     # -------------------------------------------
     # Block: Define Treeview Columns and Headings
@@ -151,6 +152,7 @@ def main_window():
     # Sets up the treeview columns with appropriate titles and properties.
     # -------------------------------------------
     # Setting column headers with appropriate titles.
+    tabla_information.heading('row_number', text='#')  # Column heading for the display row number.
     tabla_information.heading('book_id', text='Book ID')  # Column heading for Book ID.
     tabla_information.heading('book_name', text='Book Name')  # Column heading for Book Name.
     tabla_information.heading('book_publisher', text='Publisher')  # Column heading for Publisher.
@@ -163,14 +165,14 @@ def main_window():
 
     # Define the columns and set their properties: width, alignment, and labels.
     columns = (
-        "book_id", "book_name", "book_publisher", "author_name", "book_year",
+        "row_number", "book_id", "book_name", "book_publisher", "author_name", "book_year",
         "book_genre", "book_language", "book_isbn", "book_quantity"
     )  # List of column identifiers.
 
     for column in columns:
         if column in ("book_name", "book_publisher", "author_name"):
             tabla_information.column(column, width=250, anchor='w', stretch=False)  # Wide columns for text.
-        elif column == "book_id":
+        elif column in ("row_number", "book_id"):
             tabla_information.column(column, width=50, anchor='center', stretch=False)  # Narrow column for ID.
         else:
             tabla_information.column(column, width=250, anchor='center', stretch=False)  # Other columns.
@@ -218,8 +220,7 @@ def main_window():
     # Displays a user image or a placeholder text in the left panel.
     # -------------------------------------------
     try:
-        p_imagen = Image.open('./images/userbook.png')  # Open user image.
-        r_imagen = ctk.CTkImage(p_imagen, size=(70, 70))  # Resize image.
+        r_imagen = load_ctk_image('./images/userbook.png', (70, 70), main_root)  # Pre-resized user image.
         user_label_imagen = ctk.CTkLabel(left_frame, image=r_imagen, text="")  # Label for user image.
     except Exception:
         user_label_imagen = ctk.CTkLabel(left_frame, text="Not Found", font=("Cascadia Code", 14, "bold"))  # Placeholder text if image not found.
@@ -233,7 +234,6 @@ def main_window():
     # -------------------------------------------
     name_label = ctk.CTkLabel(left_frame, text="User Name", font=('Cascadia Code', 12))  # Welcome label.
     name_label.place(x=105, y=130)  # Position the welcome label.
-    username = sys.argv[1] if len(sys.argv) > 1 else None  # Retrieve username from command-line arguments.
     update_user_name_label(name_label, username)  # Update the welcome label with the username.
 
     # -------------------------------------------
@@ -248,13 +248,62 @@ def main_window():
         height=30,
         dropdown_hover_color='#4c2c18',
         dropdown_font=('Cascadia Code', 12),
-        font=('Cascadia Code', 12)
+        font=('Cascadia Code', 12),
+        command=lambda choice: apply_search()  # Search again with the new criteria.
     )  # Dropdown for selecting search criteria.
     search_filter.set('')  # Set default value.
     search_filter.place(x=60, y=200)  # Position the search filter dropdown.
 
     search_entry = ctk.CTkEntry(left_frame, placeholder_text=' Type information')  # Entry for search input.
     search_entry.place(x=60, y=270)  # Position the search entry field.
+    search_entry_border = search_entry.cget('border_color')  # Border color restored after an invalid search.
+
+    # -------------------------------------------
+    # Block: Run Searches
+    # Purpose:
+    # Filters the treeview with the indexed search while the user types.
+    # -------------------------------------------
+    search_after_id = None  # Pending search scheduled from the entry.
+
+    def apply_search():
+        """
+        Shows the books matching the selected filter and the typed text in the treeview.
+        Marks the entry in red when the text is not valid for the filter (for example a bad year).
+        """
+        nonlocal search_after_id
+        search_after_id = None
+        try:
+            condition = build_filter(search_filter.get(), search_entry.get())
+        except ValueError:
+            search_entry.configure(border_color='red')  # Invalid text for this filter.
+            return
+        search_entry.configure(border_color=search_entry_border)
+
+        if catalog_view:
+            catalog_view.set_filter(*(condition or ('', ())))  # Page through the matching rows.
+        else:
+            refresh_treeview(tabla_information)  # Load the matching rows in the background.
+
+    def current_filter():
+        """
+        Returns the (where_sql, params) of the current search, or None when no valid search is active.
+        """
+        try:
+            return build_filter(search_filter.get(), search_entry.get())
+        except ValueError:
+            return None
+
+    def schedule_search(event=None):
+        """
+        Runs the search once the user stops typing for SEARCH_DELAY_MS.
+        """
+        nonlocal search_after_id
+        if search_after_id is not None:
+            main_root.after_cancel(search_after_id)
+        search_after_id = main_root.after(SEARCH_DELAY_MS, apply_search)
+
+    search_entry.bind('<KeyRelease>', schedule_search)  # Search while typing.
+    search_entry.bind('<Return>', lambda event: apply_search())  # Search immediately on Enter.
 
     # -------------------------------------------
     # Block: Add Clear Search Button
@@ -267,6 +316,7 @@ def main_window():
         """
         search_filter.set('')  # Reset search filter dropdown.
         search_entry.delete(0, 'end')  # Clear search entry field.
+        apply_search()  # Show the whole catalog again.
 
     search_button_clear = ctk.CTkButton(
         left_frame,
@@ -302,7 +352,7 @@ def main_window():
         font=('Cascadia Code', 14),  # Font style and size.
         width=200,  # Button width.
         height=30,  # Button height.
-        command=lambda: add_book_window(main_root, tabla_information, refresh_treeview)  # Open "Add Book" window.
+        command=lambda: add_book_window(main_root, tabla_information, refresh_treeview, worker)  # Open "Add Book" window.
     )
     add_book_button.place(x=button_x, y=340)  # Position the "Add Book" button.
 
@@ -315,13 +365,11 @@ def main_window():
         font=('Cascadia Code', 14),  # Font style and size.
         width=200,  # Button width.
         height=30,  # Button height.
-        command=lambda: messagebox.showinfo(
-            'Maintenance',
-            "Work is being done on this page",
-            parent=main_root
-        )  # Placeholder action for editing books.
+        command=lambda: book_editor.edit_selected()  # Edit the selected book in the table.
     )
     edit_book_button.place(x=button_x, y=410)  # Position the "Edit Book" button.
+    edit_status_label = ctk.CTkLabel(left_frame, text='', font=('Cascadia Code', 11), height=20)  # Unsaved edits.
+    edit_status_label.place(x=150, y=446, anchor='n')  # Between the "Edit Book" and "Delete Book" buttons.
 
     # Delete Book Button
     delete_book_button = ctk.CTkButton(
@@ -332,9 +380,11 @@ def main_window():
         font=('Cascadia Code', 14),  # Font style and size.
         width=200,  # Button width.
         height=30,  # Button height.
-        command=lambda: delete_item(main_root, tabla_information)  # Call delete_item function.
+        command=lambda: delete_item(main_root, tabla_information, refresh_treeview, worker, journal)  # Call delete_item function.
     )
     delete_book_button.place(x=button_x, y=480)  # Position the "Delete Book" button.
+    undo_label = ctk.CTkLabel(left_frame, text='', font=('Cascadia Code', 11, 'underline'), height=20, cursor='hand2')  # Last delete.
+    undo_label.place(x=150, y=516, anchor='n')  # Between the "Delete Book" and "Book Information" buttons.
 
     # Book Information Button
     info_book_button = ctk.CTkButton(
@@ -345,11 +395,7 @@ def main_window():
         font=('Cascadia Code', 14),  # Font style and size.
         width=200,  # Button width.
         height=30,  # Button height.
-        command=lambda: messagebox.showinfo(
-            'Maintenance',
-            "Work is being done on this page",
-            parent=main_root
-        )  # Placeholder action for book information.
+        command=lambda: book_info_window(main_root, tabla_information, worker)  # Details of the selected book.
     )
     info_book_button.place(x=button_x, y=550)  # Position the "Book Information" button.
 
@@ -362,86 +408,239 @@ def main_window():
         font=('Cascadia Code', 14),  # Font style and size.
         width=200,  # Button width.
         height=30,  # Button height.
-        command=lambda: messagebox.showinfo(
-            'Maintenance',
-            "Work is being done on this page",
-            parent=main_root
-        )  # Placeholder action for renting books.
+        command=lambda: rent_book_window(main_root, tabla_information, refresh_treeview, worker, username)  # Checkout and returns.
     )
     rent_book_button.place(x=button_x, y=620)  # Position the "Rent Book" button.
 
+    # Import Books Button
+    import_books_button = ctk.CTkButton(
+        left_frame,
+        text='Import',  # Button text.
+        fg_color='#605b3e',  # Foreground color.
+        hover_color='#4c2c18',  # Hover color.
+        font=('Cascadia Code', 14),  # Font style and size.
+        width=95,  # Button width.
+        height=30,  # Button height.
+        command=lambda: import_books_window(main_root, tabla_information, refresh_treeview, worker)  # Bulk import from CSV/JSONL.
+    )
+    import_books_button.place(x=button_x, y=680)  # Position the "Import" button.
+
+    # Export Books Button
+    export_books_button = ctk.CTkButton(
+        left_frame,
+        text='Export',  # Button text.
+        fg_color='#605b3e',  # Foreground color.
+        hover_color='#4c2c18',  # Hover color.
+        font=('Cascadia Code', 14),  # Font style and size.
+        width=95,  # Button width.
+        height=30,  # Button height.
+        command=lambda: export_books_window(main_root, worker, current_filter)  # Streaming export to CSV/JSONL.
+    )
+    export_books_button.place(x=button_x + 105, y=680)  # Position the "Export" button.
+
     # -------------------------------------------
-    # Block: Populate Treeview with Book Records
+    # Block: Add Busy Indicator
     # Purpose:
-    # Fetches and displays existing book records from the database in the treeview.
+    # Shows a moving progress bar while the database worker is running a query.
     # -------------------------------------------
-    def populate_treeview():
+    busy_indicator = ctk.CTkProgressBar(
+        left_frame,
+        mode='indeterminate',  # No known progress: the bar keeps moving.
+        width=200,  # Bar width.
+        progress_color='#605b3e'  # Bar color.
+    )
+
+    def show_busy(busy):
         """
-        Connects to the SQLite database, retrieves all book records, and inserts them into the treeview.
+        Shows or hides the busy indicator.
+
+        Parameters:
+        - busy: True while the database worker has work.
         """
-        try:
-            connection = sqlite3.connect('./db/bookstore_management.db')  # Connect to the database.
-            cursor = connection.cursor()  # Create a cursor object.
-            query = """
-            SELECT book_id, book_name, book_publisher, author_name, 
-                   book_year, book_genre, book_language, book_ISBN, book_quantity 
-            FROM books;
-            """  # SQL query to select all book records.
-            cursor.execute(query)  # Execute the query.
-            rows = cursor.fetchall()  # Fetch all results.
-
-            for row in rows:
-                tabla_information.insert("", "end", values=row)  # Insert each row into the treeview.
-
-            cursor.close()  # Close the cursor.
-            connection.close()  # Close the database connection.
-        except sqlite3.Error as err:
-            print(f"Error: {err}")  # Print any database errors.
+        if busy:
+            busy_indicator.place(x=button_x, y=735)  # Position the indicator below the buttons.
+            busy_indicator.start()
+        else:
+            busy_indicator.stop()
+            busy_indicator.place_forget()
 
-    populate_treeview()  # Populate the treeview upon initialization.
+    # -------------------------------------------
+    # Block: Start Database Worker
+    # Purpose:
+    # Runs the catalog queries, deletes and inserts off the Tk thread.
+    # -------------------------------------------
+    worker = DatabaseWorker(main_root, on_busy_change=show_busy)  # Background database thread.
+
+    # -------------------------------------------
+    # Block: Add Inventory Dashboard
+    # Purpose:
+    # Shows the titles and copies under the user name; a click opens the counts by genre,
+    # language and decade. Read from summary tables, refreshed with the catalog.
+    # -------------------------------------------
+    refresh_inventory = inventory_panel(left_frame, worker)
 
     # -------------------------------------------
     # Block: Define Refresh Treeview Function
     # Purpose:
-    # Refreshes the treeview by clearing existing entries and fetching updated data from the database.
+    # Refreshes the treeview with updated data from the database, applying only the changed rows.
     # -------------------------------------------
+    def on_refresh_error(err):
+        """
+        Tries the refresh again later when another PC held the database, or shows the error.
+
+        Parameters:
+        - err: Exception raised by the background refresh.
+        """
+        if database.is_transient_error(err):
+            main_root.after(REFRESH_RETRY_MS, lambda: refresh_treeview(tabla_information))
+        else:
+            messagebox.showerror('Error', database.error_message(err), parent=main_root)
+
+    catalog_view = (
+        VirtualTable(tabla_information, scrollbar_vertical, ROW_HEIGHT, worker, on_error=on_refresh_error)
+        if VIRTUAL_TABLE_MODE else None
+    )
+    current_sort = DEFAULT_SORT  # (column, descending) chosen with the column headings.
+    change_watcher = None  # Started once the table is first populated.
+    book_editor = None  # Created once the table can be refreshed.
+
     def refresh_treeview(tabla_information):
         """
-        Refreshes the treeview by clearing existing entries and fetching updated data from the database.
+        Refreshes the treeview with updated data from the database in the background. Only the
+        rows that were added, changed or removed since the last refresh are touched in the widget.
 
         Parameters:
         - tabla_information: The treeview widget to be refreshed.
         """
-        for item in tabla_information.get_children():
-            tabla_information.delete(item)  # Remove all existing entries.
+        if book_editor:
+            book_editor.flush()  # Saved before the reload, which then reads the edited values.
+        if change_watcher:
+            change_watcher.mark_seen()  # This refresh already shows the changes committed so far.
+        refresh_inventory()  # A few rows of the summary tables.
+        if catalog_view:
+            catalog_view.reload()  # Re-read the row count and the visible page.
+        else:
+            worker.submit(
+                search_books, search_filter.get(), search_entry.get(), current_sort,
+                on_done=lambda rows: show_book_rows(tabla_information, rows),  # Diff the whole table.
+                on_error=on_refresh_error,
+                key=LOAD_KEY
+            )
 
-        try:
-            conn = sqlite3.connect('./db/bookstore_management.db')  # Connect to the database.
-            cursor = conn.cursor()  # Create a cursor object.
-            cursor.execute(
-                'SELECT book_id, book_name, book_publisher, author_name, book_year, book_genre, book_language, book_ISBN, book_quantity FROM books'
-            )  # SQL query to select all book records.
-            rows = cursor.fetchall()  # Fetch all results.
+    # -------------------------------------------
+    # Block: Inline Editing
+    # Purpose:
+    # Double-click a cell (or "Edit Book") to edit it. Edits are saved together in the
+    # background; afterwards the edited rows are redrawn at once. The change watcher still
+    # sees the commit and runs its usual diff refresh, which also picks up any commit another
+    # PC made in the meantime (marking the version as seen here could hide that one).
+    # -------------------------------------------
+    def show_saved_rows(rows):
+        """
+        Redraws the rows saved by the inline editor.
 
-            for row in rows:
-                tabla_information.insert("", "end", values=row)  # Insert each row into the treeview.
+        Parameters:
+        - rows: The saved book rows as read back from the database.
+        """
+        refresh_inventory()  # Quantities, genres and languages may have changed.
+        if catalog_view:
+            catalog_view.update_rows(rows)  # Also fixes the cached pages.
+        else:
+            update_book_rows(tabla_information, rows)
+
+    book_editor = BookEditor(
+        tabla_information, worker, show_saved_rows,
+        on_discarded=lambda: refresh_treeview(tabla_information),  # Show the database values again.
+        status_label=edit_status_label
+    )
 
-            conn.close()  # Close the database connection.
-        except sqlite3.Error as err:
-            print(f"Error refreshing treeview: {err}")  # Print any database errors.
+    # -------------------------------------------
+    # Block: Undo Deletes
+    # Purpose:
+    # Deleted books go to the trash; Ctrl+Z (or the label under "Delete Book") restores the
+    # last delete of the session and Ctrl+Y deletes it again.
+    # -------------------------------------------
+    journal = UndoJournal(
+        worker, lambda: refresh_treeview(tabla_information), main_root, status_label=undo_label
+    )
+    undo_label.bind('<Button-1>', lambda event: journal.undo())  # Click to undo the last delete.
+    tabla_information.bind('<Control-z>', lambda event: journal.undo())  # Undo the last delete.
+    tabla_information.bind('<Control-y>', lambda event: journal.redo())  # Delete it again.
+    tabla_information.bind('<Control-Z>', lambda event: journal.redo())  # Ctrl+Shift+Z, same as Ctrl+Y.
+
+    # -------------------------------------------
+    # Block: Populate Treeview with Book Records
+    # Purpose:
+    # Fetches and displays existing book records from the database in the treeview.
+    # -------------------------------------------
+    def populate_treeview():
+        """
+        Shows the first page of the virtual table, or all book records when the virtual mode
+        is off. The queries run on the database worker.
+        """
+        refresh_treeview(tabla_information)
+
+    # -------------------------------------------
+    # Block: Sort by Column Heading
+    # Purpose:
+    # Clicking a heading orders the catalog by that column (on its index, see search.SORT_EXPRESSIONS);
+    # clicking it again reverses the order. The sorted heading shows an arrow.
+    # -------------------------------------------
+    heading_titles = {column: tabla_information.heading(column, 'text') for column in columns}  # Titles without arrows.
+
+    def show_sort_arrow():
+        """
+        Marks the heading of the sorted column with the direction of the order.
+        """
+        sort_column, descending = current_sort
+        for column, title in heading_titles.items():
+            arrow = (' \u25bc' if descending else ' \u25b2') if column == sort_column else ''  # Down / up triangle.
+            tabla_information.heading(column, text=title + arrow)
+
+    def sort_by(column):
+        """
+        Orders the catalog by `column`, reversing the order when it is already sorted ascending by it.
+
+        Parameters:
+        - column: Treeview column identifier of the clicked heading.
+        """
+        nonlocal current_sort
+        current_sort = (column, current_sort == (column, False))  # Second click sorts descending.
+        show_sort_arrow()
+        if catalog_view:
+            catalog_view.set_sort(*current_sort)  # Page through the rows in the new order.
+        else:
+            refresh_treeview(tabla_information)  # Reload the whole table in the new order.
+
+    for column in columns[1:]:  # The row number is not a sortable column.
+        tabla_information.heading(column, command=lambda column=column: sort_by(column))
+    show_sort_arrow()  # The catalog starts sorted by Book ID.
+
+    populate_treeview()  # Populate the treeview upon initialization.
+
+    # -------------------------------------------
+    # Block: Watch for Changes From Other PCs
+    # Purpose:
+    # Refreshes the table when another counter PC commits to the shared database. Only the
+    # visible page (virtual mode) or the changed books (catalog cache) are read again, and
+    # only the rows that differ are touched in the widget.
+    # -------------------------------------------
+    change_watcher = ChangeWatcher(tabla_information, lambda: refresh_treeview(tabla_information))
 
     # -------------------------------------------
-    # Block: Start Main Event Loop
+    # Block: Purge the Trash
     # Purpose:
-    # Initiates the Tkinter event loop to display and manage the main application window.
+    # Books in the trash for longer than soft_delete.PURGE_AFTER_DAYS are removed for good,
+    # a small batch at a time on the database worker.
     # -------------------------------------------
-    main_root.mainloop()  # Start the Tkinter event loop.
+    PurgeJob(tabla_information, worker)
 
 
 # -------------------------------------------
 # Execution: Start Main Window
 # Purpose:
-# Calls the main_window function to launch the bookstore management application.
+# Running this file opens the main window directly, with the username from the command line.
 # -------------------------------------------
 if __name__ == "__main__":
-    main_window()  # Execute the main window function to start the application.
+    from app import main
+    main('main', sys.argv[1] if len(sys.argv) > 1 else None)  # Start the application on the main window.
@@ -0,0 +1,428 @@
+import credentials  # Password hashing used by the credential migration.
+
+# -------------------------------------------
+# Block: Schema Migrations
+# Purpose:
+# Every change to the schema of the bookstore database ships as a numbered migration.
+# The number of the last applied migration is stored in PRAGMA user_version, so each
+# migration runs exactly once per database file. Add new migrations at the end of MIGRATIONS;
+# never edit or renumber one that was already released.
+# -------------------------------------------
+
+
+# -------------------------------------------
+# Function: migrate_stable_book_ids
+# Purpose:
+# Book IDs used to be renumbered after every delete and assigned with MAX(book_id) + 1.
+# They are now fixed, so the AUTOINCREMENT counter must be at least the highest existing ID;
+# existing IDs are kept as they are.
+# -------------------------------------------
+def migrate_stable_book_ids(conn):
+    conn.execute(
+        "INSERT INTO sqlite_sequence (name, seq) "
+        "SELECT 'books', 0 WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'books')"
+    )  # Create the counter if the table never received a row.
+    conn.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, (SELECT IFNULL(MAX(book_id), 0) FROM books)) "
+        "WHERE name = 'books'"
+    )  # Move the counter past every existing ID.
+
+
+# -------------------------------------------
+# Function: migrate_search_index
+# Purpose:
+# Creates the FTS5 index over book name, author and publisher, the triggers that keep it in
+# sync with the books table, and the indexes used by the ISBN, language and year lookups.
+# The full-text index is filled from the existing rows the first time it is created.
+# -------------------------------------------
+def migrate_search_index(conn):
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'"
+    ).fetchone()  # Databases opened by older versions may already have the index.
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            book_name, author_name, book_publisher,
+            content='books', content_rowid='book_id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)  # External content index: the text is read from the books table.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, book_name, author_name, book_publisher)
+            VALUES (new.book_id, new.book_name, new.author_name, new.book_publisher);
+        END
+    """)  # Index new books.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, book_name, author_name, book_publisher)
+            VALUES ('delete', old.book_id, old.book_name, old.author_name, old.book_publisher);
+        END
+    """)  # Remove deleted books from the index.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_fts_update
+        AFTER UPDATE OF book_id, book_name, author_name, book_publisher ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, book_name, author_name, book_publisher)
+            VALUES ('delete', old.book_id, old.book_name, old.author_name, old.book_publisher);
+            INSERT INTO books_fts (rowid, book_name, author_name, book_publisher)
+            VALUES (new.book_id, new.book_name, new.author_name, new.book_publisher);
+        END
+    """)  # Reindex edited books.
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_books_isbn ON books (book_ISBN)')  # Exact ISBN lookup.
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_books_year ON books (book_year)')  # Year ranges.
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_language ON books (book_language COLLATE NOCASE)'
+    )  # Case-insensitive language lookup.
+    if not exists:
+        conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")  # Index the existing rows.
+
+
+# -------------------------------------------
+# Function: migrate_performance_indexes
+# Purpose:
+# Indexes for looking up and sorting by book name and author (case-insensitive, as the
+# catalog shows them), then refreshes the planner statistics so SQLite uses them.
+# -------------------------------------------
+def migrate_performance_indexes(conn):
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_name ON books (book_name COLLATE NOCASE, book_id)'
+    )  # Lookup and sort by title.
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_author ON books (author_name COLLATE NOCASE, book_id)'
+    )  # Lookup and sort by author.
+    conn.execute('ANALYZE')  # Statistics for the query planner.
+
+
+# -------------------------------------------
+# Function: migrate_hashed_passwords
+# Purpose:
+# Replaces the plaintext passwords of the usuarios table with salted scrypt hashes.
+# -------------------------------------------
+def migrate_hashed_passwords(conn):
+    rows = conn.execute(
+        'SELECT id_usuario, password FROM usuarios'
+    ).fetchall()
+    conn.executemany(
+        'UPDATE usuarios SET password = ? WHERE id_usuario = ?',
+        [(credentials.hash_password(password), user_id)
+         for user_id, password in rows if not credentials.is_hashed(password)]
+    )  # Hashed rows (added by a newer version) are left as they are.
+
+
+# -------------------------------------------
+# Function: migrate_sort_indexes
+# Purpose:
+# Indexes for the remaining click-to-sort columns of the catalog table, matching the sort
+# expressions of search.SORT_EXPRESSIONS (the other columns are covered by earlier indexes;
+# every index also orders by book_id, the rowid).
+# -------------------------------------------
+def migrate_sort_indexes(conn):
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_publisher ON books (book_publisher COLLATE NOCASE)'
+    )  # Sort by publisher.
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_genre ON books (book_genre COLLATE NOCASE)'
+    )  # Sort by genre.
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_quantity ON books (CAST(IFNULL(book_quantity, 0) AS INTEGER))'
+    )  # Sort by quantity as a number (the column has no numeric affinity).
+    conn.execute('ANALYZE')  # Statistics for the new indexes.
+
+
+CHANGE_LOG_ROWS = 10000  # Entries kept in the book_changes log.
+
+
+# -------------------------------------------
+# Function: migrate_change_log
+# Purpose:
+# Creates the book_changes log: triggers record the ID of every inserted, updated or deleted
+# book, so the open windows of every PC re-read only those rows after a commit. Only the
+# newest CHANGE_LOG_ROWS entries are kept; a reader that fell further behind reloads everything.
+# -------------------------------------------
+def migrate_change_log(conn):
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS book_changes ('
+        'change_id INTEGER PRIMARY KEY AUTOINCREMENT, book_id INTEGER NOT NULL)'
+    )  # AUTOINCREMENT: a change ID is never reused after the old entries are pruned.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_log_insert AFTER INSERT ON books BEGIN
+            INSERT INTO book_changes (book_id) VALUES (new.book_id);
+        END
+    """)  # New books.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_log_delete AFTER DELETE ON books BEGIN
+            INSERT INTO book_changes (book_id) VALUES (old.book_id);
+        END
+    """)  # Deleted books.
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS books_log_update AFTER UPDATE ON books BEGIN
+            INSERT INTO book_changes (book_id) VALUES (new.book_id);
+            INSERT INTO book_changes (book_id) SELECT old.book_id WHERE old.book_id <> new.book_id;
+        END
+    """)  # Changed books (both IDs if the ID itself changed).
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS book_changes_prune AFTER INSERT ON book_changes BEGIN
+            DELETE FROM book_changes WHERE change_id <= new.change_id - {CHANGE_LOG_ROWS};
+        END
+    """)  # Keep the log small.
+
+
+STATS_COPIES = 'CAST(IFNULL({0}.book_quantity, 0) AS INTEGER)'  # Copies of a book row, as a number.
+
+
+# -------------------------------------------
+# Function: stats_changes
+# Purpose:
+# Trigger statements adding (sign = 1) or removing (sign = -1) the book `row` ('new' or 'old')
+# from every inventory summary.
+# -------------------------------------------
+def stats_changes(row, sign):
+    copies = STATS_COPIES.format(row)
+    statements = [
+        f"UPDATE stats_totals SET titles = titles + {sign}, copies = copies + {sign} * {copies};"
+    ]
+    for dimension, value in (('genre', f'{row}.book_genre'), ('language', f'{row}.book_language'),
+                             ('decade', f'{row}.book_year / 10 * 10')):
+        statements.append(
+            f"INSERT INTO stats_groups (dimension, value, titles, copies) "
+            f"VALUES ('{dimension}', {value}, {sign}, {sign} * {copies}) "
+            f"ON CONFLICT (dimension, value) DO UPDATE SET "
+            f"titles = titles + excluded.titles, copies = copies + excluded.copies;"
+        )
+        if sign < 0:
+            statements.append(
+                f"DELETE FROM stats_groups WHERE dimension = '{dimension}' AND value = {value} AND titles = 0;"
+            )  # Drop the group when its last book is gone.
+    return '\n'.join(statements)
+
+
+# -------------------------------------------
+# Function: migrate_inventory_stats
+# Purpose:
+# Creates the summary tables of the inventory dashboard and the triggers that keep them up
+# to date on every insert, update and delete of a book, so the numbers are read without
+# scanning the books table. stats_totals has one row (titles, copies); stats_groups has one
+# row per genre, language and decade. Copies count book_quantity as a number, like its sort index.
+# -------------------------------------------
+def migrate_inventory_stats(conn):
+    copies = STATS_COPIES  # Copies of the new/old row.
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS stats_totals ('
+        'id INTEGER PRIMARY KEY CHECK (id = 1), titles INTEGER NOT NULL, copies INTEGER NOT NULL)'
+    )  # Single row.
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS stats_groups ('
+        'dimension TEXT NOT NULL, value NOT NULL, titles INTEGER NOT NULL, copies INTEGER NOT NULL, '
+        'PRIMARY KEY (dimension, value)) WITHOUT ROWID'
+    )  # dimension is 'genre', 'language' or 'decade'.
+
+    # Block: Fill From The Existing Books
+    # The only full scan: from now on the triggers apply each change.
+    conn.execute('DELETE FROM stats_totals')
+    conn.execute('DELETE FROM stats_groups')
+    conn.execute(
+        f"INSERT INTO stats_totals (id, titles, copies) "
+        f"SELECT 1, COUNT(*), IFNULL(SUM({copies.format('books')}), 0) FROM books"
+    )
+    for dimension, value in (('genre', 'book_genre'), ('language', 'book_language'),
+                             ('decade', 'book_year / 10 * 10')):
+        conn.execute(
+            f"INSERT INTO stats_groups (dimension, value, titles, copies) "
+            f"SELECT '{dimension}', {value}, COUNT(*), SUM({copies.format('books')}) FROM books GROUP BY 2"
+        )
+
+    # Block: Triggers
+    # Every insert, update and delete of a book is applied to the summaries (see stats_changes).
+    conn.execute(
+        f'CREATE TRIGGER IF NOT EXISTS books_stats_insert AFTER INSERT ON books BEGIN {stats_changes("new", 1)} END'
+    )
+    conn.execute(
+        f'CREATE TRIGGER IF NOT EXISTS books_stats_delete AFTER DELETE ON books BEGIN {stats_changes("old", -1)} END'
+    )
+    conn.execute(
+        'CREATE TRIGGER IF NOT EXISTS books_stats_update '
+        'AFTER UPDATE OF book_genre, book_language, book_year, book_quantity ON books '
+        f'BEGIN {stats_changes("old", -1)} {stats_changes("new", 1)} END'
+    )  # Remove the old values, add the new ones.
+
+
+# -------------------------------------------
+# Function: migrate_loans
+# Purpose:
+# Creates the loans table of the rentals (one row per title of a checkout) and the partial
+# indexes on the open loans used by the checkout, the returns screen and the overdue list.
+# -------------------------------------------
+def migrate_loans(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS loans (
+            loan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL,
+            customer TEXT NOT NULL,
+            copies INTEGER NOT NULL CHECK (copies > 0),
+            checked_out_at TEXT NOT NULL,
+            due_at TEXT NOT NULL,
+            returned_at TEXT,
+            staff TEXT
+        )
+    """)  # Dates are ISO 8601 text (local time).
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_loans_open_customer '
+        'ON loans (customer COLLATE NOCASE, due_at) WHERE returned_at IS NULL'
+    )  # Open loans of a customer (returns screen).
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_loans_open_book ON loans (book_id) WHERE returned_at IS NULL'
+    )  # Copies of a book that are out.
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_loans_open_due ON loans (due_at) WHERE returned_at IS NULL'
+    )  # Overdue loans.
+
+
+# -------------------------------------------
+# Function: migrate_loan_history_index
+# Purpose:
+# Indexes every loan of a book, newest first, for the loan history of the "Book Information"
+# window. It also answers the open loans of a book, which replaces the partial index on them.
+# -------------------------------------------
+def migrate_loan_history_index(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_loans_book ON loans (book_id, checked_out_at)')
+    conn.execute('DROP INDEX IF EXISTS idx_loans_open_book')
+
+
+CATALOG_INDEXES = {
+    'idx_books_isbn': 'book_ISBN',
+    'idx_books_year': 'book_year',
+    'idx_books_language': 'book_language COLLATE NOCASE',
+    'idx_books_name': 'book_name COLLATE NOCASE, book_id',
+    'idx_books_author': 'author_name COLLATE NOCASE, book_id',
+    'idx_books_publisher': 'book_publisher COLLATE NOCASE',
+    'idx_books_genre': 'book_genre COLLATE NOCASE',
+    'idx_books_quantity': 'CAST(IFNULL(book_quantity, 0) AS INTEGER)',
+}  # Search and sort indexes of the catalog: index name -> indexed terms.
+
+
+# -------------------------------------------
+# Function: migrate_soft_delete
+# Purpose:
+# Deleting a book now moves it to the trash: deleted_at is set instead of removing the row, so
+# the delete can be undone, and a purge job removes old tombstones later (see soft_delete.py).
+# The search and sort indexes only cover the books that are not in the trash (partial
+# indexes, used by queries with database.LIVE_BOOKS), one more index finds the tombstones,
+# and the inventory summaries count a book out when it is trashed and back in when restored.
+# -------------------------------------------
+def migrate_soft_delete(conn):
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(books)')]
+    if 'deleted_at' not in columns:
+        conn.execute('ALTER TABLE books ADD COLUMN deleted_at TEXT')  # NULL: in the catalog.
+
+    # Block: Partial Indexes
+    for name, terms in CATALOG_INDEXES.items():
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+        conn.execute(f'CREATE INDEX {name} ON books ({terms}) WHERE deleted_at IS NULL')
+    conn.execute(
+        'CREATE INDEX IF NOT EXISTS idx_books_tombstones ON books (deleted_at) WHERE deleted_at IS NOT NULL'
+    )  # Oldest tombstones first, for the purge.
+
+    # Block: Inventory Statistics Triggers
+    # Books in the trash are not counted; the purge of a tombstone changes nothing.
+    for trigger in ('books_stats_insert', 'books_stats_delete', 'books_stats_update'):
+        conn.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    conn.execute(
+        'CREATE TRIGGER books_stats_insert AFTER INSERT ON books WHEN new.deleted_at IS NULL '
+        f'BEGIN {stats_changes("new", 1)} END'
+    )
+    conn.execute(
+        'CREATE TRIGGER books_stats_delete AFTER DELETE ON books WHEN old.deleted_at IS NULL '
+        f'BEGIN {stats_changes("old", -1)} END'
+    )
+    conn.execute(
+        'CREATE TRIGGER books_stats_update '
+        'AFTER UPDATE OF book_genre, book_language, book_year, book_quantity ON books '
+        'WHEN old.deleted_at IS NULL AND new.deleted_at IS NULL '
+        f'BEGIN {stats_changes("old", -1)} {stats_changes("new", 1)} END'
+    )  # Edits of a book in the catalog.
+    conn.execute(
+        'CREATE TRIGGER IF NOT EXISTS books_stats_trash AFTER UPDATE OF deleted_at ON books '
+        'WHEN old.deleted_at IS NULL AND new.deleted_at IS NOT NULL '
+        f'BEGIN {stats_changes("old", -1)} END'
+    )  # Moved to the trash.
+    conn.execute(
+        'CREATE TRIGGER IF NOT EXISTS books_stats_restore AFTER UPDATE OF deleted_at ON books '
+        'WHEN old.deleted_at IS NOT NULL AND new.deleted_at IS NULL '
+        f'BEGIN {stats_changes("new", 1)} END'
+    )  # Restored from the trash.
+    conn.execute('ANALYZE')  # Statistics for the new indexes.
+
+
+# -------------------------------------------
+# Function: migrate_normalized_isbns
+# Purpose:
+# Removes hyphens and spaces from the stored ISBNs (database.normalize_isbn), which every
+# write path now does too, so the ISBN search finds books that were typed or imported with them.
+# -------------------------------------------
+def migrate_normalized_isbns(conn):
+    import database  # Imported here: database imports this module.
+    conn.create_function('normalize_isbn', 1, database.normalize_isbn, deterministic=True)
+    conn.execute(
+        'UPDATE books SET book_ISBN = normalize_isbn(book_ISBN) WHERE book_ISBN <> normalize_isbn(book_ISBN)'
+    )
+
+
+# -------------------------------------------
+# Block: Migration List
+# Purpose:
+# (version, description, function) in the order they are applied.
+# -------------------------------------------
+MIGRATIONS = [
+    (1, 'Stable book IDs', migrate_stable_book_ids),
+    (2, 'Full-text search index', migrate_search_index),
+    (3, 'Name and author indexes', migrate_performance_indexes),
+    (4, 'Hashed passwords', migrate_hashed_passwords),
+    (5, 'Sort indexes', migrate_sort_indexes),
+    (6, 'Change log', migrate_change_log),
+    (7, 'Inventory statistics', migrate_inventory_stats),
+    (8, 'Loans', migrate_loans),
+    (9, 'Loan history index', migrate_loan_history_index),
+    (10, 'Soft delete', migrate_soft_delete),
+    (11, 'Normalized ISBNs', migrate_normalized_isbns),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]  # Schema version of a fully migrated database.
+
+
+# -------------------------------------------
+# Function: schema_version
+# Purpose:
+# Returns the number of the last migration applied to the database.
+# -------------------------------------------
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+# -------------------------------------------
+# Function: apply_migrations
+# Purpose:
+# Applies the pending migrations in order. Each one runs in its own write transaction
+# together with the user_version update, so a failed migration leaves the database at the
+# previous version. The version is checked again after the write lock is taken, so two PCs
+# starting at the same time never apply the same migration twice.
+# Returns the list of the applied migration descriptions.
+# -------------------------------------------
+def apply_migrations(conn):
+    applied = []
+    if schema_version(conn) >= LATEST_VERSION:
+        return applied  # Nothing to do (the usual case).
+
+    for version, description, migrate in MIGRATIONS:
+        if conn.in_transaction:
+            conn.commit()  # Start from a clean state.
+        conn.execute('BEGIN IMMEDIATE')  # Take the write lock before checking the version.
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()  # Already applied (possibly by another PC just now).
+                continue
+            migrate(conn)
+            conn.execute(f'PRAGMA user_version = {int(version)}')  # Recorded in the same transaction.
+            conn.commit()
+        except Exception:
+            conn.rollback()  # Keep the database at the previous version.
+            raise
+        applied.append(description)
+    return applied
@@ -0,0 +1,230 @@
+import collections  # Ring buffer of the latest records.
+import logging  # Optional log file of the statements.
+import logging.handlers  # Rotating log file.
+import os  # Module to interact with the file system.
+import sqlite3  # SQLite3 for database management.
+import sys  # Frame inspection to find the calling function.
+import threading  # Name of the thread that ran the statement.
+import time  # High resolution timer.
+from contextlib import contextmanager  # Helper to build the timed_section context manager.
+
+# -------------------------------------------
+# Block: Trace Settings
+# Purpose:
+# Every statement of the shared connections goes through TracedConnection, which records its
+# text, duration (execute plus fetches), rows and calling function in a ring buffer shown by
+# the diagnostics window. Widget work is recorded next to it (timed_section) so a slow screen
+# can be attributed to the database or to the widgets.
+# -------------------------------------------
+TRACE_ENABLED = os.environ.get('BOOKSTORE_SQL_TRACE', '1') != '0'  # Record statements.
+MAX_RECORDS = 2000  # Records kept in memory.
+LOG_PATH = './logs/sql_trace.log'  # Optional log file.
+LOG_MAX_BYTES = 1_000_000  # Size of one log file before it is rotated.
+LOG_BACKUPS = 3  # Rotated log files kept.
+SKIPPED_FILES = ('database.py', 'query_trace.py', 'contextlib.py')  # Not reported as callers.
+
+records = collections.deque(maxlen=MAX_RECORDS)  # Latest TraceRecord objects, oldest first.
+_logger = logging.getLogger('bookstore.sql')  # Writes finished records when logging is on.
+_logger.propagate = False
+
+
+# -------------------------------------------
+# Class: TraceRecord
+# Purpose:
+# One statement (or widget section): the duration and row count grow while its rows are
+# fetched; `finished` is set once the result has been read.
+# -------------------------------------------
+class TraceRecord:
+    __slots__ = ('started_at', 'kind', 'sql', 'caller', 'thread', 'rows', 'duration_ms', 'finished')
+
+    def __init__(self, kind, sql, caller):
+        self.started_at = time.time()  # Wall clock time of the statement.
+        self.kind = kind  # 'sql' or 'widget'.
+        self.sql = sql  # Statement text (or section name).
+        self.caller = caller  # module.function that ran it.
+        self.thread = threading.current_thread().name  # Tk thread or DatabaseWorker.
+        self.rows = 0  # Rows returned (SELECT) or changed (INSERT/UPDATE/DELETE).
+        self.duration_ms = 0.0  # Time spent in SQLite for this statement.
+        self.finished = False  # Whether the result has been fully read.
+
+    def finish(self):
+        """Marks the record as complete and writes it to the log file if logging is on."""
+        if not self.finished:
+            self.finished = True
+            if _logger.handlers:
+                _logger.info('%.3f ms | %d rows | %s | %s | %s', self.duration_ms, self.rows,
+                             self.thread, self.caller, ' '.join(self.sql.split()))
+
+
+# -------------------------------------------
+# Function: find_caller
+# Purpose:
+# Returns "module.function" of the first frame outside the database layer, after skipping
+# `outer` more frames (the function that opened a timed section reports its own caller).
+# -------------------------------------------
+def find_caller(outer=0):
+    frame = sys._getframe(2)
+    while frame and (outer or frame.f_code.co_filename.endswith(SKIPPED_FILES)):
+        if not frame.f_code.co_filename.endswith(SKIPPED_FILES):
+            outer -= 1
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+# -------------------------------------------
+# Class: TracedCursor
+# Purpose:
+# sqlite3 cursor that times execute and every fetch of the current statement.
+# -------------------------------------------
+class TracedCursor(sqlite3.Cursor):
+    record = None  # Record of the statement being read.
+
+    def _timed(self, function, *args):
+        """Runs a cursor method and adds its duration to the current record."""
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            if self.record is not None:
+                self.record.duration_ms += (time.perf_counter() - start) * 1000
+
+    def _start(self, sql, execute, *args):
+        if not TRACE_ENABLED:
+            self.record = None
+            return execute(sql, *args)
+        self.record = TraceRecord('sql', sql, find_caller())
+        records.append(self.record)
+        result = self._timed(execute, sql, *args)
+        if self.description is None:
+            self.record.rows = max(self.rowcount, 0)  # Changed rows.
+            self.record.finish()  # Nothing to fetch.
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._start(sql, super().execute, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._start(sql, super().executemany, seq_of_parameters)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if self.record is not None:
+            self.record.rows += row is not None
+            self.record.finish()  # fetchone is used for single-row lookups.
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self.record is not None:
+            self.record.rows += len(rows)
+            if len(rows) < (self.arraysize if size is None else size):
+                self.record.finish()  # Last batch of a streamed result.
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self.record is not None:
+            self.record.rows += len(rows)
+            self.record.finish()
+        return rows
+
+
+# -------------------------------------------
+# Class: TracedConnection
+# Purpose:
+# sqlite3 connection whose statements all run on TracedCursor (pass it as the factory of
+# sqlite3.connect).
+# -------------------------------------------
+class TracedConnection(sqlite3.Connection):
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# -------------------------------------------
+# Function: timed_section
+# Purpose:
+# Context manager that records the duration of widget work (for example a treeview refresh)
+# next to the statements. Set `rows` on the yielded record (None when tracing is off).
+# The caller reported is the one of the function that opened the section.
+# -------------------------------------------
+@contextmanager
+def timed_section(name):
+    if not TRACE_ENABLED:
+        yield None
+        return
+    record = TraceRecord('widget', name, find_caller(outer=1))
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        records.append(record)
+        record.finish()
+
+
+# -------------------------------------------
+# Function: set_enabled
+# Purpose:
+# Turns the recording of statements on or off.
+# -------------------------------------------
+def set_enabled(enabled):
+    global TRACE_ENABLED
+    TRACE_ENABLED = enabled
+
+
+# -------------------------------------------
+# Function: set_log_file
+# Purpose:
+# Starts or stops writing finished records to the rotating log file LOG_PATH.
+# -------------------------------------------
+def set_log_file(enabled):
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+        handler.close()
+    if enabled:
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+
+
+# -------------------------------------------
+# Function: is_logging
+# Purpose:
+# Whether finished records are being written to the log file.
+# -------------------------------------------
+def is_logging():
+    return bool(_logger.handlers)
+
+
+# -------------------------------------------
+# Function: summary
+# Purpose:
+# Returns {'sql': (count, total_ms, slowest_ms), 'widget': (...)} over the kept records.
+# -------------------------------------------
+def summary():
+    totals = {'sql': [0, 0.0, 0.0], 'widget': [0, 0.0, 0.0]}
+    for record in list(records):
+        total = totals[record.kind]
+        total[0] += 1
+        total[1] += record.duration_ms
+        total[2] = max(total[2], record.duration_ms)
+    return {kind: tuple(total) for kind, total in totals.items()}
+
+
+# Block: Log File From The Environment
+# BOOKSTORE_SQL_LOG=1 writes the log from startup, before the diagnostics window is opened.
+if os.environ.get('BOOKSTORE_SQL_LOG') == '1':
+    set_log_file(True)
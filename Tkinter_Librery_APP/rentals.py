@@ -0,0 +1,331 @@
+from datetime import datetime, timedelta  # Checkout and due dates.
+import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
+import tkinter.messagebox as messagebox  # Module for displaying message boxes.
+from tkinter import ttk  # Themed widgets for Tkinter.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Rental Settings
+# Purpose:
+# A checkout takes copies from book_quantity and records one loan per title in the same
+# transaction. The stock is checked by the UPDATE itself (only if enough copies are left),
+# so two counters renting the last copy at the same time cannot both succeed.
+# -------------------------------------------
+LOAN_DAYS = 14  # Default loan period.
+MAX_LISTED_LOANS = 500  # Open loans shown at most in the returns tab.
+QUANTITY = 'CAST(IFNULL(book_quantity, 0) AS INTEGER)'  # Copies in stock (the column has no numeric affinity).
+TAKE_COPIES_QUERY = (
+    f'UPDATE books SET book_quantity = {QUANTITY} - ? '
+    f'WHERE book_id = ? AND {QUANTITY} >= ? AND {database.LIVE_BOOKS}'
+)  # Changes nothing when the stock is too low or the book is in the trash.
+RETURN_COPIES_QUERY = f'UPDATE books SET book_quantity = {QUANTITY} + ? WHERE book_id = ?'
+INSERT_LOAN_QUERY = (
+    'INSERT INTO loans (book_id, customer, copies, checked_out_at, due_at, staff) VALUES (?, ?, ?, ?, ?, ?)'
+)
+OPEN_LOANS_QUERY = (
+    'SELECT loans.loan_id, loans.book_id, IFNULL(books.book_name, \'(deleted)\'), loans.customer, '
+    'loans.copies, loans.checked_out_at, loans.due_at '
+    'FROM loans LEFT JOIN books ON books.book_id = loans.book_id '
+    'WHERE loans.returned_at IS NULL'
+)  # Served by the partial indexes on open loans.
+
+
+# -------------------------------------------
+# Function: now_text
+# Purpose:
+# Returns a local date and time as stored in the loans table.
+# -------------------------------------------
+def now_text(moment=None):
+    return (moment or datetime.now()).isoformat(sep=' ', timespec='seconds')
+
+
+# -------------------------------------------
+# Function: checkout
+# Purpose:
+# Rents several titles to a customer in one transaction. `items` is a list of
+# (book_id, copies). Returns the new loan IDs. Raises ValueError, and rents nothing, when
+# the customer is missing or a title does not have enough copies left.
+# -------------------------------------------
+def checkout(customer, items, loan_days=LOAN_DAYS, staff=None):
+    customer = customer.strip()
+    if not customer:
+        raise ValueError('Enter the name of the customer.')
+    wanted = {}
+    for book_id, copies in items:
+        if int(copies) < 1:
+            raise ValueError('The number of copies must be at least 1.')
+        wanted[int(book_id)] = wanted.get(int(book_id), 0) + int(copies)  # Same title twice: add up.
+    if not wanted:
+        raise ValueError('Select the books to rent.')
+    if int(loan_days) < 1:
+        raise ValueError('The loan period must be at least one day.')
+
+    now = datetime.now()
+    checked_out_at, due_at = now_text(now), now_text(now + timedelta(days=int(loan_days)))
+
+    def take(cursor):
+        loan_ids = []
+        for book_id, copies in sorted(wanted.items()):  # Same order on every counter.
+            cursor.execute(TAKE_COPIES_QUERY, (copies, book_id, copies))
+            if cursor.rowcount != 1:
+                raise ValueError(f'Book {book_id} does not have {copies} copies in stock.')  # Rolls back the batch.
+            cursor.execute(INSERT_LOAN_QUERY, (book_id, customer, copies, checked_out_at, due_at, staff))
+            loan_ids.append(cursor.lastrowid)
+        return loan_ids
+
+    return database.write_transaction(take)
+
+
+# -------------------------------------------
+# Function: return_loans
+# Purpose:
+# Marks the given loans as returned and puts their copies back in stock, in one transaction.
+# Loans already returned (for example at another counter) are skipped. Returns the number
+# of loans returned.
+# -------------------------------------------
+def return_loans(loan_ids):
+    returned_at = now_text()
+
+    def give_back(cursor):
+        returned = 0
+        for loan_id in loan_ids:
+            loan = cursor.execute(
+                'SELECT book_id, copies FROM loans WHERE loan_id = ? AND returned_at IS NULL', (loan_id,)
+            ).fetchone()
+            if loan is None:
+                continue  # Already returned.
+            cursor.execute('UPDATE loans SET returned_at = ? WHERE loan_id = ?', (returned_at, loan_id))
+            cursor.execute(RETURN_COPIES_QUERY, (loan[1], loan[0]))  # No-op if the book was deleted.
+            returned += 1
+        return returned
+
+    return database.write_transaction(give_back)
+
+
+# -------------------------------------------
+# Function: open_loans
+# Purpose:
+# Returns the open loans of a customer (case-insensitive), or of everybody when the name is
+# empty, the ones due first at the top.
+# Rows: (loan_id, book_id, book_name, customer, copies, checked_out_at, due_at).
+# -------------------------------------------
+def open_loans(customer=''):
+    customer = customer.strip()
+    if customer:
+        return database.fetch_all(
+            f'{OPEN_LOANS_QUERY} AND loans.customer = ? COLLATE NOCASE ORDER BY loans.due_at LIMIT ?',
+            (customer, MAX_LISTED_LOANS)
+        )
+    return database.fetch_all(f'{OPEN_LOANS_QUERY} ORDER BY loans.due_at LIMIT ?', (MAX_LISTED_LOANS,))
+
+
+# -------------------------------------------
+# Function: books_in_stock
+# Purpose:
+# Returns (book_id, book_name, copies in stock) of the given books, in the given order.
+# -------------------------------------------
+def books_in_stock(book_ids):
+    if not book_ids:
+        return []
+    marks = ', '.join('?' * len(book_ids))
+    rows = database.fetch_all(
+        f'SELECT book_id, book_name, {QUANTITY} FROM books WHERE book_id IN ({marks}) AND {database.LIVE_BOOKS}',
+        tuple(book_ids)
+    )
+    by_id = {row[0]: tuple(row) for row in rows}
+    return [by_id[book_id] for book_id in book_ids if book_id in by_id]
+
+
+# -------------------------------------------
+# Function: rent_book_window
+# Purpose:
+# Opens the "Rent Book" window: a checkout tab with the books selected in the catalog and a
+# returns tab with the open loans of a customer. It is not modal, so more books can be
+# selected in the catalog and added while it is open. Database work runs on the worker.
+# -------------------------------------------
+def rent_book_window(main_root, tabla_information, refresh_treeview, worker, username=None):
+    """
+    Parameters:
+    - main_root: The main application window.
+    - tabla_information: The catalog treeview (its selection is what gets rented).
+    - refresh_treeview: Callback refreshing the catalog after a checkout or a return.
+    - worker: DatabaseWorker running the queries off the Tk thread.
+    - username: Logged-in user, recorded on the loans.
+    """
+
+    # -------------------------------------------
+    # Block: Initialize "Rent Book" Window
+    # -------------------------------------------
+    rent_root = ctk.CTkToplevel(main_root)  # "Rent Book" window instance.
+    rent_root.geometry('640x560')  # Set window size.
+    rent_root.title('Rent Book')  # Set window title.
+    rent_root.transient(main_root)  # Stays above the main window.
+    rent_root.after(200, lambda: rent_root.iconbitmap('./images/icobookstore.ico'))  # Set window icon after 200ms.
+
+    tabs = ctk.CTkTabview(rent_root, segmented_button_selected_color='#605b3e')
+    tabs.pack(fill='both', expand=True, padx=10, pady=10)
+    checkout_tab = tabs.add('Check out')
+    returns_tab = tabs.add('Returns')
+
+    # -------------------------------------------
+    # Function: show_error
+    # Purpose:
+    # Shows a failed checkout or return: the reason for invalid input, a readable text otherwise.
+    # -------------------------------------------
+    def show_error(err):
+        text = str(err) if isinstance(err, ValueError) else database.error_message(err)
+        messagebox.showerror('Rent Book', text, parent=rent_root)
+
+    # -------------------------------------------
+    # Block: Checkout Tab
+    # -------------------------------------------
+    ctk.CTkLabel(checkout_tab, text='Customer:', font=('Cascadia Code', 14)).grid(row=0, column=0, sticky='w', pady=5)
+    customer_entry = ctk.CTkEntry(checkout_tab, font=('Cascadia Code', 14), width=250)
+    customer_entry.grid(row=0, column=1, sticky='w', pady=5)
+    ctk.CTkLabel(checkout_tab, text='Days:', font=('Cascadia Code', 14)).grid(row=0, column=2, sticky='e', padx=(20, 5))
+    days_entry = ctk.CTkEntry(checkout_tab, font=('Cascadia Code', 14), width=60)
+    days_entry.insert(0, str(LOAN_DAYS))
+    days_entry.grid(row=0, column=3, sticky='w')
+
+    cart_table = ttk.Treeview(checkout_tab, columns=('book_id', 'book_name', 'in_stock', 'copies'), show='headings', height=12)
+    for column, title, width in (('book_id', 'Book ID', 70), ('book_name', 'Book Name', 300),
+                                 ('in_stock', 'In stock', 80), ('copies', 'Copies', 70)):
+        cart_table.heading(column, text=title)
+        cart_table.column(column, width=width, anchor='w' if column == 'book_name' else 'center')
+    cart_table.grid(row=1, column=0, columnspan=4, sticky='nsew', pady=5)
+    checkout_tab.grid_rowconfigure(1, weight=1)
+    checkout_tab.grid_columnconfigure(1, weight=1)
+
+    cart_buttons = ctk.CTkFrame(checkout_tab, fg_color='transparent')
+    cart_buttons.grid(row=2, column=0, columnspan=4, sticky='ew')
+    button_style = {'fg_color': '#605b3e', 'hover_color': '#4c2c18', 'font': ('Cascadia Code', 14), 'height': 30}
+
+    # -------------------------------------------
+    # Function: add_selected_books
+    # Purpose:
+    # Adds the books selected in the catalog to the checkout (one copy each).
+    # -------------------------------------------
+    def add_selected_books():
+        book_ids = [int(item) for item in tabla_information.selection() if not cart_table.exists(item)]
+        if not book_ids:
+            return
+        worker.submit(books_in_stock, book_ids, on_done=show_cart_rows, on_error=show_error)
+
+    def show_cart_rows(rows):
+        for book_id, book_name, in_stock in rows:
+            if not cart_table.exists(str(book_id)):
+                cart_table.insert('', 'end', iid=str(book_id), values=(book_id, book_name, in_stock, 1))
+
+    # -------------------------------------------
+    # Function: change_copies
+    # Purpose:
+    # Adds `step` copies to the selected checkout lines (at least one copy each).
+    # -------------------------------------------
+    def change_copies(step):
+        for item in cart_table.selection():
+            values = list(cart_table.item(item, 'values'))
+            values[3] = max(int(values[3]) + step, 1)
+            cart_table.item(item, values=values)
+
+    # -------------------------------------------
+    # Function: submit_checkout
+    # Purpose:
+    # Rents every line of the checkout in one transaction.
+    # -------------------------------------------
+    def submit_checkout():
+        items = [(int(item), int(cart_table.item(item, 'values')[3])) for item in cart_table.get_children()]
+        try:
+            loan_days = int(days_entry.get())
+        except ValueError:
+            show_error(ValueError('The loan period must be a number of days.'))
+            return
+        checkout_button.configure(state='disabled')  # Avoid renting twice while it runs.
+        worker.submit(
+            checkout, customer_entry.get(), items, loan_days, username,
+            on_done=on_checked_out, on_error=on_checkout_failed
+        )
+
+    def on_checked_out(loan_ids):
+        checkout_button.configure(state='normal')
+        cart_table.delete(*cart_table.get_children())
+        refresh_treeview(tabla_information)  # New quantities.
+        find_loans()  # The new loans in the returns tab.
+        messagebox.showinfo('Rent Book', f'{len(loan_ids)} titles rented to {customer_entry.get().strip()}.', parent=rent_root)
+
+    def on_checkout_failed(err):
+        checkout_button.configure(state='normal')
+        show_error(err)
+
+    ctk.CTkButton(cart_buttons, text='Add selected books', width=170, command=add_selected_books, **button_style).pack(side='left', padx=(0, 5))
+    ctk.CTkButton(cart_buttons, text='+1', width=40, command=lambda: change_copies(1), **button_style).pack(side='left', padx=2)
+    ctk.CTkButton(cart_buttons, text='-1', width=40, command=lambda: change_copies(-1), **button_style).pack(side='left', padx=2)
+    ctk.CTkButton(
+        cart_buttons, text='Remove', width=80,
+        command=lambda: cart_table.delete(*cart_table.selection()), **button_style
+    ).pack(side='left', padx=5)
+    checkout_button = ctk.CTkButton(cart_buttons, text='Check out', width=120, command=submit_checkout, **button_style)
+    checkout_button.pack(side='right')
+
+    # -------------------------------------------
+    # Block: Returns Tab
+    # -------------------------------------------
+    ctk.CTkLabel(returns_tab, text='Customer:', font=('Cascadia Code', 14)).grid(row=0, column=0, sticky='w', pady=5)
+    loan_customer_entry = ctk.CTkEntry(returns_tab, font=('Cascadia Code', 14), width=250,
+                                       placeholder_text='Empty: every open loan')
+    loan_customer_entry.grid(row=0, column=1, sticky='w', pady=5)
+
+    loans_table = ttk.Treeview(
+        returns_tab, columns=('loan_id', 'book_name', 'customer', 'copies', 'checked_out_at', 'due_at'),
+        show='headings', height=12
+    )
+    for column, title, width in (('loan_id', 'Loan', 50), ('book_name', 'Book Name', 190), ('customer', 'Customer', 120),
+                                 ('copies', 'Copies', 55), ('checked_out_at', 'Out since', 90), ('due_at', 'Due', 90)):
+        loans_table.heading(column, text=title)
+        loans_table.column(column, width=width, anchor='w' if column in ('book_name', 'customer') else 'center')
+    loans_table.tag_configure('overdue', foreground='#c0392b')  # Loans past their due date.
+    loans_table.grid(row=1, column=0, columnspan=3, sticky='nsew', pady=5)
+    returns_tab.grid_rowconfigure(1, weight=1)
+    returns_tab.grid_columnconfigure(1, weight=1)
+
+    # -------------------------------------------
+    # Function: find_loans
+    # Purpose:
+    # Lists the open loans of the customer typed in the returns tab.
+    # -------------------------------------------
+    def find_loans():
+        worker.submit(open_loans, loan_customer_entry.get(), on_done=show_loans, on_error=show_error, key='open_loans')
+
+    def show_loans(rows):
+        loans_table.delete(*loans_table.get_children())
+        now = now_text()
+        for loan_id, book_id, book_name, customer, copies, checked_out_at, due_at in rows:
+            loans_table.insert(
+                '', 'end', iid=str(loan_id),
+                values=(loan_id, book_name, customer, copies, checked_out_at[:10], due_at[:10]),
+                tags=('overdue',) if due_at < now else ()
+            )
+
+    # -------------------------------------------
+    # Function: submit_return
+    # Purpose:
+    # Returns the selected loans in one transaction.
+    # -------------------------------------------
+    def submit_return():
+        loan_ids = [int(item) for item in loans_table.selection()]
+        if not loan_ids:
+            messagebox.showinfo('Rent Book', 'Select the loans to return.', parent=rent_root)
+            return
+        worker.submit(return_loans, loan_ids, on_done=on_returned, on_error=show_error)
+
+    def on_returned(returned):
+        refresh_treeview(tabla_information)  # New quantities.
+        find_loans()
+        messagebox.showinfo('Rent Book', f'{returned} loans returned.', parent=rent_root)
+
+    ctk.CTkButton(returns_tab, text='Find', width=80, command=find_loans, **button_style).grid(row=0, column=2, sticky='w', padx=5)
+    loan_customer_entry.bind('<Return>', lambda event: find_loans())
+    ctk.CTkButton(returns_tab, text='Return selected', width=160, command=submit_return, **button_style).grid(
+        row=2, column=2, sticky='e')
+
+    add_selected_books()  # Start with the books selected in the catalog.
+    find_loans()
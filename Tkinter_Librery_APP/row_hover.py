@@ -0,0 +1,92 @@
+# -------------------------------------------
+# Block: Row Hover Settings
+# Purpose:
+# Colors of the highlighted row and the minimum time between two highlight updates.
+# -------------------------------------------
+HOVER_TAG = 'hover'  # Tag applied to the row under the mouse.
+HOVER_BACKGROUND = '#605b3e'  # Background color of the highlighted row.
+HOVER_FOREGROUND = '#ffffff'  # Text color of the highlighted row.
+THROTTLE_MS = 30  # Motion events are coalesced into one update per interval.
+
+
+# -------------------------------------------
+# Class: RowHover
+# Purpose:
+# Highlights the treeview row under the mouse cursor. Only the previously hovered row and
+# the new one are retagged, so the cost of a motion event does not depend on the row count.
+# Motion events are throttled: the latest position is applied once per THROTTLE_MS.
+# -------------------------------------------
+class RowHover:
+    def __init__(self, tabla_information, throttle_ms=THROTTLE_MS):
+        """
+        Parameters:
+        - tabla_information: The treeview widget whose rows are highlighted.
+        - throttle_ms: Minimum time between two highlight updates in milliseconds.
+        """
+        self.tabla_information = tabla_information
+        self.throttle_ms = throttle_ms
+        self.hovered_item = ''  # Item currently highlighted.
+        self.pending_y = None  # Latest mouse position not applied yet.
+        self.after_id = None  # Scheduled update, if any.
+
+        tabla_information.tag_configure(HOVER_TAG, background=HOVER_BACKGROUND, foreground=HOVER_FOREGROUND)  # Configure once.
+        tabla_information.bind('<Motion>', self.on_motion)  # Bind mouse movement to hover effect.
+        tabla_information.bind('<Leave>', self.on_leave)  # Bind mouse leave to remove hover effect.
+
+    # -------------------------------------------
+    # Function: on_motion
+    # Purpose:
+    # Stores the mouse position and schedules an update if none is pending.
+    # -------------------------------------------
+    def on_motion(self, event):
+        self.pending_y = event.y
+        if self.after_id is None:
+            self.after_id = self.tabla_information.after(self.throttle_ms, self.apply)
+
+    # -------------------------------------------
+    # Function: on_leave
+    # Purpose:
+    # Cancels any pending update and removes the highlight when the mouse leaves the treeview.
+    # -------------------------------------------
+    def on_leave(self, event=None):
+        if self.after_id is not None:
+            self.tabla_information.after_cancel(self.after_id)
+            self.after_id = None
+        self.pending_y = None
+        self.highlight('')
+
+    # -------------------------------------------
+    # Function: apply
+    # Purpose:
+    # Highlights the row under the latest stored mouse position.
+    # -------------------------------------------
+    def apply(self):
+        self.after_id = None
+        if self.pending_y is not None:
+            self.highlight(self.tabla_information.identify_row(self.pending_y))
+            self.pending_y = None
+
+    # -------------------------------------------
+    # Function: highlight
+    # Purpose:
+    # Moves the hover tag from the previously hovered row to `item` ('' removes it).
+    # -------------------------------------------
+    def highlight(self, item):
+        if item == self.hovered_item:
+            return  # Still on the same row: nothing to retag.
+        if self.hovered_item and self.tabla_information.exists(self.hovered_item):
+            self._set_hover(self.hovered_item, False)  # The row may have been removed by a refresh.
+        if item:
+            self._set_hover(item, True)
+        self.hovered_item = item
+
+    # -------------------------------------------
+    # Function: _set_hover
+    # Purpose:
+    # Adds or removes the hover tag of one row, keeping any other tag it has.
+    # -------------------------------------------
+    def _set_hover(self, item, hovered):
+        tags = [tag for tag in self.tabla_information.item(item, 'tags') if tag != HOVER_TAG]
+        if hovered:
+            tags.append(HOVER_TAG)
+        self.tabla_information.item(item, tags=tags)
@@ -0,0 +1,150 @@
+import re  # Regular expressions to parse the search text.
+import database  # Shared database connection layer.
+import catalog_cache  # In-memory catalog answering repeated searches.
+
+# -------------------------------------------
+# Block: Search Settings
+# Purpose:
+# Maps the options of the search_filter combobox to the column searched in the FTS5 index.
+# An empty filter searches book name, author and publisher at once.
+# -------------------------------------------
+FULL_TEXT_COLUMNS = {
+    '': '',
+    'Book Name': 'book_name',
+    'Author Name': 'author_name',
+    'Publisher': 'book_publisher',
+}  # Filters answered by the full-text index.
+YEAR_PATTERN = re.compile(r'^\s*(\d{1,4})\s*(?:(?:-|\.\.)\s*(\d{1,4})\s*)?$')  # "1990" or "1990-1999".
+
+# -------------------------------------------
+# Block: Sort Settings
+# Purpose:
+# SQL sort key of every sortable treeview column. Each expression matches an index (see the
+# sort indexes migration) and is followed by book_id, so the order is total and the keyset
+# pagination of the virtual table can continue after any row. Text is sorted without regard
+# to case and the quantity as a number.
+# -------------------------------------------
+SORT_EXPRESSIONS = {
+    'book_id': 'book_id',
+    'book_name': 'book_name COLLATE NOCASE',
+    'book_publisher': 'book_publisher COLLATE NOCASE',
+    'author_name': 'author_name COLLATE NOCASE',
+    'book_year': 'book_year',
+    'book_genre': 'book_genre COLLATE NOCASE',
+    'book_language': 'book_language COLLATE NOCASE',
+    'book_isbn': 'book_ISBN',
+    'book_quantity': 'CAST(IFNULL(book_quantity, 0) AS INTEGER)',
+}  # Treeview column -> sort expression.
+DEFAULT_SORT = ('book_id', False)  # (column, descending) of the catalog order.
+
+
+# -------------------------------------------
+# Function: full_text_query
+# Purpose:
+# Turns the typed text into an FTS5 query. Every word is quoted (so punctuation typed by the
+# user cannot break the query syntax) and matched as a prefix; all words must be present.
+# -------------------------------------------
+def full_text_query(text, column=''):
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        return None
+    query = ' AND '.join(f'"{word}"*' for word in words)
+    return f'{{{column}}} : ({query})' if column else query
+
+
+# -------------------------------------------
+# Function: build_filter
+# Purpose:
+# Returns the WHERE condition and its parameters for the selected filter and typed text, or
+# None when there is nothing to search for. Raises ValueError if the text is not valid for
+# the filter (for example a year that is not a number).
+# - Book Name / Author Name / Publisher / no filter: FTS5 index.
+# - ISBN: exact match on the ISBN index (hyphens and spaces are ignored).
+# - Language: exact, case-insensitive match on the language index.
+# - Year: a year or a range ("1990-1999") on the year index.
+# -------------------------------------------
+def build_filter(search_filter, text):
+    text = text.strip()
+    if not text:
+        return None
+
+    if search_filter in FULL_TEXT_COLUMNS:
+        query = full_text_query(text, FULL_TEXT_COLUMNS[search_filter])
+        return ('book_id IN (SELECT rowid FROM books_fts WHERE books_fts MATCH ?)', (query,))
+
+    if search_filter == 'ISBN':
+        return ('book_ISBN = ?', (database.normalize_isbn(text),))
+
+    if search_filter == 'Language':
+        return ('book_language = ? COLLATE NOCASE', (text,))
+
+    if search_filter == 'Year':
+        match = YEAR_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Invalid year: '{text}'. Use a year or a range like 1990-1999.")
+        first_year = int(match.group(1))
+        last_year = int(match.group(2) or first_year)
+        return ('book_year BETWEEN ? AND ?', (min(first_year, last_year), max(first_year, last_year)))
+
+    raise ValueError(f"Invalid search filter: '{search_filter}'.")
+
+
+# -------------------------------------------
+# Function: where_clause
+# Purpose:
+# Builds the WHERE clause of a catalog query from a filter condition and any extra conditions.
+# Books in the trash are always left out, which is also what lets SQLite use the partial
+# indexes of the catalog.
+# -------------------------------------------
+def where_clause(where_sql='', *conditions):
+    parts = [database.LIVE_BOOKS] + [condition for condition in (where_sql,) + conditions if condition]
+    return f" WHERE {' AND '.join(parts)}"
+
+
+# -------------------------------------------
+# Function: order_by
+# Purpose:
+# Returns the ORDER BY terms for a sort (column, descending), with book_id as tie-breaker.
+# -------------------------------------------
+def order_by(sort=DEFAULT_SORT):
+    column, descending = sort
+    direction = ' DESC' if descending else ''
+    if column == 'book_id':
+        return f'book_id{direction}'
+    return f'{SORT_EXPRESSIONS[column]}{direction}, book_id{direction}'
+
+
+# -------------------------------------------
+# Function: after_key
+# Purpose:
+# Returns the keyset queries [(condition, params, order), ...] selecting the rows that come
+# after the book `anchor` in the given sort, to be read in that order: first the rest of the
+# anchor's sort value (by book_id), then the following values. Two queries instead of one row
+# value comparison, because SQLite only seeks the index with them when the sort uses a
+# collation or an expression. The sort value of the anchor is looked up by primary key, so only the book
+# ID has to be remembered between pages.
+# -------------------------------------------
+def after_key(anchor, sort=DEFAULT_SORT):
+    column, descending = sort
+    operator = '<' if descending else '>'
+    if column == 'book_id':
+        return [(f'book_id {operator} ?', (anchor,), order_by(sort))]
+    expression = SORT_EXPRESSIONS[column]
+    anchor_value = f'(SELECT {expression} FROM books WHERE book_id = ?)'  # Sort value of the anchor.
+    return [
+        (f'{expression} = {anchor_value} AND book_id {operator} ?', (anchor, anchor),
+         order_by(('book_id', descending))),  # Same value: only book_id to order.
+        (f'{expression} {operator} {anchor_value}', (anchor,), order_by(sort)),  # Next values.
+    ]
+
+
+# -------------------------------------------
+# Function: search_books
+# Purpose:
+# Returns every book matching the filter in the given sort order (used without the virtual
+# table). Served by the catalog cache until the database changes.
+# -------------------------------------------
+def search_books(search_filter, text, sort=DEFAULT_SORT):
+    condition = build_filter(search_filter, text)
+    where_sql, params = condition or ('', ())
+    return catalog_cache.find_books(where_sql, params, sort)
@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta  # Tombstone times and the purge cut-off.
+import tkinter.messagebox as messagebox  # Module for displaying message boxes.
+import database  # Shared database connection layer.
+
+# -------------------------------------------
+# Block: Soft Delete Settings
+# Purpose:
+# Deleting a book only sets its deleted_at (a tombstone): one small UPDATE that can be undone.
+# Catalog queries leave tombstones out (database.LIVE_BOOKS) and the search and sort indexes
+# do not contain them (partial indexes, see the soft delete migration). The deletes of the
+# session can be undone and redone; a purge job removes tombstones older than
+# PURGE_AFTER_DAYS in small batches, so no transaction holds the write lock for long.
+# -------------------------------------------
+PURGE_AFTER_DAYS = 30  # Age of a tombstone before it is removed for good.
+PURGE_BATCH = 500  # Tombstones removed per transaction.
+PURGE_PAUSE_MS = 250  # Pause between two batches (other PCs get the write lock).
+PURGE_START_MS = 60_000  # First purge after the main window opened.
+PURGE_INTERVAL_MS = 15 * 60_000  # Time between two purges once the old tombstones are gone.
+MAX_UNDO_STEPS = 50  # Deletes of the session that can be undone.
+
+
+# -------------------------------------------
+# Function: timestamp
+# Purpose:
+# Returns a tombstone time. Microseconds make it unique to one delete, so an undo only
+# restores the books it moved to the trash.
+# -------------------------------------------
+def timestamp(moment=None):
+    return (moment or datetime.now()).isoformat(sep=' ', timespec='microseconds')
+
+
+# -------------------------------------------
+# Function: trash_books
+# Purpose:
+# Moves books to the trash in one transaction. Returns (tombstone time, IDs of the books
+# trashed); books already in the trash or purged are skipped.
+# -------------------------------------------
+def trash_books(book_ids):
+    deleted_at = timestamp()
+
+    def trash(cursor):
+        trashed = []
+        for book_id in book_ids:
+            cursor.execute(
+                f'UPDATE books SET deleted_at = ? WHERE book_id = ? AND {database.LIVE_BOOKS}', (deleted_at, book_id)
+            )
+            if cursor.rowcount:
+                trashed.append(book_id)
+        return trashed
+
+    return deleted_at, database.write_transaction(trash)
+
+
+# -------------------------------------------
+# Function: restore_books
+# Purpose:
+# Takes books back out of the trash if they still carry the given tombstone. Returns the IDs
+# of the books restored; the others were purged or restored by another PC meanwhile.
+# -------------------------------------------
+def restore_books(book_ids, deleted_at):
+    def restore(cursor):
+        restored = []
+        for book_id in book_ids:
+            cursor.execute(
+                'UPDATE books SET deleted_at = NULL WHERE book_id = ? AND deleted_at = ?', (book_id, deleted_at)
+            )
+            if cursor.rowcount:
+                restored.append(book_id)
+        return restored
+
+    return database.write_transaction(restore)
+
+
+# -------------------------------------------
+# Function: purge_tombstones
+# Purpose:
+# Removes up to `limit` books trashed before `older_than` (oldest first, on the tombstone
+# index) in one transaction. Returns the number removed.
+# -------------------------------------------
+def purge_tombstones(older_than, limit=PURGE_BATCH):
+    def purge(cursor):
+        cursor.execute(
+            'DELETE FROM books WHERE book_id IN '
+            '(SELECT book_id FROM books WHERE deleted_at < ? ORDER BY deleted_at LIMIT ?)', (older_than, limit)
+        )
+        return cursor.rowcount
+
+    return database.write_transaction(purge)
+
+
+# -------------------------------------------
+# Class: UndoJournal
+# Purpose:
+# Deletes of the current session, to undo (restore from the trash) and redo (trash again).
+# The database work runs on the worker; `on_change` is called on the Tk thread afterwards.
+# -------------------------------------------
+class UndoJournal:
+    def __init__(self, worker, on_change, parent=None, status_label=None):
+        """
+        Parameters:
+        - worker: DatabaseWorker running the restores and deletes.
+        - on_change: Callback run after an undo or a redo (refresh the table).
+        - parent: Window the message boxes belong to.
+        - status_label: Optional label showing the step that can be undone (see undo_text).
+        """
+        self.worker = worker
+        self.on_change = on_change
+        self.parent = parent
+        self.status_label = status_label
+        self.undo_steps = []  # (description, book IDs, tombstone time), newest last.
+        self.redo_steps = []  # (description, book IDs), newest last.
+
+    # -------------------------------------------
+    # Function: record_trash
+    # Purpose:
+    # Adds a delete to the journal. A new delete clears the steps that could be redone.
+    # -------------------------------------------
+    def record_trash(self, description, book_ids, deleted_at):
+        if not book_ids:
+            return
+        self.undo_steps.append((description, list(book_ids), deleted_at))
+        del self.undo_steps[:-MAX_UNDO_STEPS]  # Forget the oldest steps.
+        self.redo_steps.clear()
+        self.show_status()
+
+    # -------------------------------------------
+    # Function: undo_text
+    # Purpose:
+    # Describes the step that "Undo" would revert, or '' when there is none.
+    # -------------------------------------------
+    def undo_text(self):
+        return f'Undo delete of {self.undo_steps[-1][0]} (Ctrl+Z)' if self.undo_steps else ''
+
+    # -------------------------------------------
+    # Function: show_status
+    # Purpose:
+    # Updates the status label, if any, with undo_text().
+    # -------------------------------------------
+    def show_status(self):
+        if self.status_label is not None and self.status_label.winfo_exists():
+            self.status_label.configure(text=self.undo_text())
+
+    # -------------------------------------------
+    # Function: undo
+    # Purpose:
+    # Restores the books of the last delete.
+    # -------------------------------------------
+    def undo(self):
+        if not self.undo_steps:
+            return
+        step = self.undo_steps.pop()
+        description, book_ids, deleted_at = step
+        self.show_status()
+        self.worker.submit(
+            restore_books, book_ids, deleted_at,
+            on_done=lambda restored: self._undone(description, book_ids, restored),
+            on_error=lambda err: self._failed(err, self.undo_steps, step)
+        )
+
+    def _undone(self, description, book_ids, restored):
+        if restored:
+            self.redo_steps.append((description, restored))
+        if len(restored) < len(book_ids):
+            messagebox.showinfo(
+                'Undo', f'{len(book_ids) - len(restored)} books could not be restored: they were purged '
+                        'or restored on another PC.', parent=self.parent
+            )
+        self.show_status()
+        self.on_change()
+
+    # -------------------------------------------
+    # Function: redo
+    # Purpose:
+    # Deletes again the books of the last undone delete.
+    # -------------------------------------------
+    def redo(self):
+        if not self.redo_steps:
+            return
+        step = self.redo_steps.pop()
+        description, book_ids = step
+        self.worker.submit(
+            trash_books, book_ids,
+            on_done=lambda result: self._redone(description, *result),
+            on_error=lambda err: self._failed(err, self.redo_steps, step)
+        )
+
+    def _redone(self, description, deleted_at, trashed):
+        if trashed:
+            self.undo_steps.append((description, trashed, deleted_at))
+        self.show_status()
+        self.on_change()
+
+    # -------------------------------------------
+    # Function: _failed
+    # Purpose:
+    # Puts a step back after a failed undo or redo and shows the error.
+    # -------------------------------------------
+    def _failed(self, err, steps, step):
+        steps.append(step)
+        self.show_status()
+        messagebox.showerror('Error', database.error_message(err), parent=self.parent)
+        self.on_change()
+
+
+# -------------------------------------------
+# Class: PurgeJob
+# Purpose:
+# Removes old tombstones in the background while `widget` exists: one batch at a time on the
+# worker, with a pause between batches, then again every PURGE_INTERVAL_MS.
+# -------------------------------------------
+class PurgeJob:
+    def __init__(self, widget, worker, start_ms=PURGE_START_MS):
+        """
+        Parameters:
+        - widget: Tk widget used to schedule the batches with after(); the job stops with it.
+        - worker: DatabaseWorker running the batches.
+        - start_ms: Delay before the first batch.
+        """
+        self.widget = widget
+        self.worker = worker
+        self.purged = 0  # Tombstones removed by this job.
+        self.widget.after(start_ms, self._run)
+
+    # -------------------------------------------
+    # Function: _run
+    # Purpose:
+    # Submits one batch with the current cut-off time.
+    # -------------------------------------------
+    def _run(self):
+        if not self.widget.winfo_exists():
+            return  # The window was closed.
+        older_than = timestamp(datetime.now() - timedelta(days=PURGE_AFTER_DAYS))
+        self.worker.submit(purge_tombstones, older_than, on_done=self._done, on_error=self._failed)
+
+    def _done(self, purged):
+        self.purged += purged
+        self._schedule(PURGE_PAUSE_MS if purged == PURGE_BATCH else PURGE_INTERVAL_MS)  # More left: go on soon.
+
+    def _failed(self, err):
+        print(f"Error purging deleted books: {err}")  # Tried again on the next round.
+        self._schedule(PURGE_INTERVAL_MS)
+
+    def _schedule(self, delay_ms):
+        if self.widget.winfo_exists():
+            self.widget.after(delay_ms, self._run)
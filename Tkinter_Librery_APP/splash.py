@@ -1,19 +1,21 @@
 import customtkinter as ctk  # CustomTkinter for modern GUI design with tkinter.
-from PIL import Image, UnidentifiedImageError  # Module to load and handle images.
-import subprocess  # Module to execute external scripts or programs.
+from PIL import UnidentifiedImageError  # Error raised for invalid image files.
 import sqlite3  # SQLite3 for database management.
 import os  # Module to interact with the file system.
+import database  # Shared database connection layer.
+import migrations  # Versioned schema migrations.
+from assets import load_ctk_image  # Decoded-once, pre-resized images.
 
 # -------------------------------------------
 # Function: splash_screen_main
 # Purpose:
-# This function creates and manages a splash screen window. It displays a background image,
-# checks for database connectivity, and then launches the next script (e.g., login window).
+# This function shows the splash screen in the application window. It displays a background
+# image, checks and migrates the database, and calls `on_ready` as soon as this initialization
+# finishes so the login screen can replace it.
 # -------------------------------------------
-def splash_screen_main():
+def splash_screen_main(splash_root, on_ready):
     # Block: Initialize Splash Screen Window
-    # Creates a splash screen window with fixed size and no borders.
-    splash_root = ctk.CTk()
+    # Sets up the window with fixed size and no borders.
     splash_root.geometry('400x400')
     splash_root.resizable(False, False)
     splash_root.overrideredirect(True)
@@ -46,11 +48,7 @@ def splash_screen_main():
     # -------------------------------------------
     def load_background_image():
         try:
-            splash_imagen_center = ctk.CTkImage(
-                light_image=Image.open('./images/fondo_splash.jpg'),
-                dark_image=Image.open('./images/fondo_splash.jpg'),
-                size=(400, 400)
-            )
+            splash_imagen_center = load_ctk_image('./images/fondo_splash.jpg', (400, 400), splash_root)
             return splash_imagen_center
         except (FileNotFoundError, UnidentifiedImageError):
             error_label = ctk.CTkLabel(
@@ -82,15 +80,21 @@ def splash_screen_main():
     # -------------------------------------------
     # Function: check_db_connection
     # Purpose:
-    # Verifies if the SQLite database file exists and connects successfully.
-    # If successful, proceeds to the next step.
+    # Verifies if the SQLite database file exists and connects successfully, then applies
+    # the pending schema migrations. If successful, proceeds to the next step.
     # -------------------------------------------
     def check_db_connection():
-        db_path = './db/bookstore_management.db'
+        db_path = database.DB_PATH
         if os.path.exists(db_path):
             try:
-                conn = sqlite3.connect(db_path)
-                conn.close()
+                conn = database.open_connection(db_path)
+                try:
+                    if migrations.schema_version(conn) < migrations.LATEST_VERSION:
+                        splash_label_msg.configure(text="Updating database...")
+                        splash_root.update_idletasks()
+                    migrations.apply_migrations(conn)  # Bring the schema up to date.
+                finally:
+                    conn.close()
                 data_update_check()
             except sqlite3.Error:
                 splash_label_msg.configure(text="Database connection failed.")
@@ -104,35 +108,31 @@ def splash_screen_main():
     # -------------------------------------------
     # Function: start_reconocimiento
     # Purpose:
-    # Simulates an initial recognition process before checking the database.
+    # Paints the splash screen, then starts the initialization right away.
     # -------------------------------------------
     def start_reconocimiento():
-        splash_root.update_idletasks()
-        splash_root.after(1000, check_db_connection)
+        splash_root.update()  # Show the splash before the database work starts.
+        check_db_connection()
 
     # -------------------------------------------
     # Function: data_update_check
     # Purpose:
-    # Simulates a data update process before opening the next script.
+    # The database is ready: loads the next screen, which replaces the splash screen.
     # -------------------------------------------
     def data_update_check():
+        splash_label_msg.configure(text="Loading...")
         splash_root.update_idletasks()
-        splash_root.after(1000, open_next_script)
-
-    # -------------------------------------------
-    # Function: open_next_script
-    # Purpose:
-    # Launches the login window script and closes the splash screen.
-    # -------------------------------------------
-    def open_next_script():
-        subprocess.Popen(["pythonw", "login.py"], creationflags=subprocess.CREATE_NO_WINDOW)
-        splash_root.destroy()
+        on_ready()
 
     # Block: Start Splash Screen Logic
-    splash_root.after(1000, start_reconocimiento)
+    splash_root.after(0, start_reconocimiento)  # Runs once the event loop has started.
 
-    # Block: Run Main Loop
-    splash_root.mainloop()
 
-# Call Main Function to Start Splash Screen
-splash_screen_main()
+# -------------------------------------------
+# Execution: Start Application
+# Purpose:
+# Running this file starts the application from the splash screen.
+# -------------------------------------------
+if __name__ == "__main__":
+    from app import main
+    main()
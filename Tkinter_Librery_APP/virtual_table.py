@@ -0,0 +1,364 @@
+from collections import OrderedDict  # Ordered mapping used as a small LRU page cache.
+import database  # Shared database connection layer.
+import catalog_cache  # Counts kept until the database changes.
+from functions import show_book_rows, update_book_rows  # Shows book rows, applying only the differences.
+from search import DEFAULT_SORT, after_key, order_by, where_clause  # Sort orders and filters of the catalog.
+
+# -------------------------------------------
+# Block: Virtual Table Settings
+# Purpose:
+# Page size used for keyset pagination and limits for what is kept in memory and in the widget.
+# -------------------------------------------
+PAGE_SIZE = 100  # Rows fetched per query.
+MAX_CACHED_PAGES = 8  # Pages kept in memory around the current position.
+BUFFER_ROWS = 5  # Extra rows inserted below the visible area.
+WHEEL_ROWS = 3  # Rows scrolled per mouse wheel notch.
+LOAD_KEY = 'catalog'  # Worker key: a newer load or search replaces an older one.
+
+
+# -------------------------------------------
+# Function: fetch_page
+# Purpose:
+# Fetches PAGE_SIZE rows after the book `anchor` (from the start when None) by keyset, in
+# the given sort order.
+# -------------------------------------------
+def fetch_page(where_sql, params, anchor, sort=DEFAULT_SORT):
+    if anchor is None:
+        return database.fetch_all(
+            f'SELECT {database.BOOK_COLUMNS} FROM books{where_clause(where_sql)} ORDER BY {order_by(sort)} LIMIT ?',
+            params + (PAGE_SIZE,)
+        )  # First page.
+    rows = []
+    for key_sql, key_params, key_order in after_key(anchor, sort):
+        rows += database.fetch_all(
+            f'SELECT {database.BOOK_COLUMNS} FROM books{where_clause(where_sql, key_sql)} ORDER BY {key_order} LIMIT ?',
+            params + key_params + (PAGE_SIZE - len(rows),)
+        )  # Keyset page: rows after the last book of the previous page.
+        if len(rows) == PAGE_SIZE:
+            break
+    return rows
+
+
+# -------------------------------------------
+# Function: seek_row
+# Purpose:
+# Returns the ID of the book `steps` rows after the book `anchor` (0: the next one; from the
+# start when None) in the given sort order, or None past the end. The index of the sort
+# order is sought at the anchor's key (search.after_key) and only `steps` entries are skipped.
+# -------------------------------------------
+def seek_row(where_sql, params, anchor, steps, sort=DEFAULT_SORT):
+    if anchor is None:
+        row = database.fetch_one(
+            f'SELECT book_id FROM books{where_clause(where_sql)} ORDER BY {order_by(sort)} LIMIT 1 OFFSET ?',
+            params + (steps,)
+        )
+        return row[0] if row else None
+    for key_sql, key_params, key_order in after_key(anchor, sort):
+        where = where_clause(where_sql, key_sql)
+        row = database.fetch_one(
+            f'SELECT book_id FROM books{where} ORDER BY {key_order} LIMIT 1 OFFSET ?', params + key_params + (steps,)
+        )
+        if row:
+            return row[0]
+        steps -= database.fetch_one(f'SELECT COUNT(*) FROM books{where}', params + key_params)[0]  # Skipped part.
+    return None
+
+
+# -------------------------------------------
+# Function: fetch_anchor
+# Purpose:
+# Returns the book ID at a position of the result. SQLite cannot seek an index by position,
+# so the row is reached from the nearest known one: the start, the end (the result read
+# backwards, when `total_rows` is known) or the last book before a page already loaded
+# (`anchors`, page -> book ID). Dragging the scrollbar then only skips the rows between two
+# jumps, and a jump to the end of the catalog is a seek instead of a walk over the whole index.
+# -------------------------------------------
+def fetch_anchor(where_sql, params, position, sort=DEFAULT_SORT, total_rows=None, anchors=None):
+    backwards = (sort[0], not sort[1])  # The same order, read from the end.
+    best = (position, None, sort)  # (rows to skip, anchor, order): from the start.
+    if total_rows is not None and total_rows - 1 - position < best[0]:
+        best = (total_rows - 1 - position, None, backwards)  # From the end.
+    for page, book_id in (anchors or {}).items():
+        known = page * PAGE_SIZE - 1  # Position of the book before the page.
+        if book_id is None:
+            continue
+        if known == position:
+            return book_id
+        if known < position and position - known - 1 < best[0]:
+            best = (position - known - 1, book_id, sort)
+        elif known > position and known - position - 1 < best[0]:
+            best = (known - position - 1, book_id, backwards)
+    steps, anchor, order = best
+    if steps < 0:
+        return None  # Past the end of the result.
+    return seek_row(where_sql, params, anchor, steps, order)
+
+
+# -------------------------------------------
+# Function: load_window
+# Purpose:
+# Counts the rows of the result and fetches the pages needed to show `visible_rows` rows
+# from `first_row` in the given sort order. Safe to run on the database worker thread: it
+# only returns data.
+# -------------------------------------------
+def load_window(where_sql, params, first_row, visible_rows, sort=DEFAULT_SORT):
+    total_rows = catalog_cache.count_books(where_sql, params)  # Counted once per data version.
+    first_row = min(max(int(first_row), 0), max(total_rows - visible_rows, 0))
+    stop = min(first_row + visible_rows + BUFFER_ROWS, total_rows)
+
+    pages, anchors = OrderedDict(), {0: None}
+    for page in range(first_row // PAGE_SIZE, max(stop - 1, 0) // PAGE_SIZE + 1):
+        if page not in anchors:
+            anchors[page] = fetch_anchor(where_sql, params, page * PAGE_SIZE - 1, sort, total_rows, anchors)
+        pages[page] = fetch_page(where_sql, params, anchors[page], sort)
+        if pages[page]:
+            anchors[page + 1] = pages[page][-1][0]
+    return total_rows, first_row, pages, anchors
+
+
+# -------------------------------------------
+# Class: VirtualTable
+# Purpose:
+# Shows the books table in a ttk.Treeview while keeping only the visible rows plus a small
+# buffer in the widget. Rows are fetched by keyset pages as the user scrolls and the
+# vertical scrollbar is driven from the full row count.
+# An optional filter (a WHERE condition, see search.build_filter) limits the rows shown and
+# an optional sort (see search.SORT_EXPRESSIONS) orders them.
+# With a DatabaseWorker, reloads and filter changes run off the Tk thread.
+# -------------------------------------------
+class VirtualTable:
+    def __init__(self, tabla_information, scrollbar_vertical, row_height=30, worker=None, on_error=None):
+        """
+        Parameters:
+        - tabla_information: The treeview widget displaying book information.
+        - scrollbar_vertical: The vertical scrollbar placed next to the treeview.
+        - row_height: Height of a treeview row in pixels (style rowheight).
+        - worker: Optional DatabaseWorker used to count and load the first rows.
+        - on_error: Optional callback for a failed background load (the worker prints it otherwise).
+        """
+        self.tabla_information = tabla_information
+        self.scrollbar_vertical = scrollbar_vertical
+        self.row_height = row_height
+        self.worker = worker
+        self.on_error = on_error
+        self.total_rows = 0  # Number of rows in the whole result.
+        self.first_row = 0  # Position of the first visible row.
+        self.visible_rows = 1  # Rows that fit in the widget.
+        self.pages = OrderedDict()  # Page number -> list of rows.
+        self.anchors = {0: None}  # Page number -> last key of the previous page.
+        self.where_sql = ''  # Current filter condition.
+        self.where_params = ()  # Parameters of the filter condition.
+        self.sort = DEFAULT_SORT  # (column, descending) of the current order.
+
+        # Block: Take Over Vertical Scrolling
+        # The treeview only holds a window of rows, so the scrollbar is driven from here.
+        tabla_information.configure(yscrollcommand='')
+        scrollbar_vertical.configure(command=self.yview)
+        tabla_information.bind('<Configure>', self._on_configure, add='+')
+        tabla_information.bind('<MouseWheel>', self._on_mousewheel)
+        tabla_information.bind('<Button-4>', lambda event: self._scroll_units(-WHEEL_ROWS))
+        tabla_information.bind('<Button-5>', lambda event: self._scroll_units(WHEEL_ROWS))
+        tabla_information.bind('<Up>', lambda event: self._on_arrow(-1))
+        tabla_information.bind('<Down>', lambda event: self._on_arrow(1))
+        tabla_information.bind('<Prior>', lambda event: self._scroll_units(-self.visible_rows))
+        tabla_information.bind('<Next>', lambda event: self._scroll_units(self.visible_rows))
+
+    # -------------------------------------------
+    # Function: set_filter
+    # Purpose:
+    # Shows only the rows matching `where_sql` (no filter when empty) from the first row.
+    # -------------------------------------------
+    def set_filter(self, where_sql='', params=()):
+        self.where_sql = where_sql
+        self.where_params = tuple(params)
+        self.first_row = 0
+        self.reload()
+
+    # -------------------------------------------
+    # Function: set_sort
+    # Purpose:
+    # Orders the rows by a treeview column (see search.SORT_EXPRESSIONS) from the first row.
+    # -------------------------------------------
+    def set_sort(self, column, descending=False):
+        self.sort = (column, descending)
+        self.first_row = 0
+        self.reload()
+
+    # -------------------------------------------
+    # Function: reload
+    # Purpose:
+    # Drops the cached pages, re-reads the row count and redraws the current position.
+    # With a worker the queries run in the background and an older pending load is cancelled.
+    # -------------------------------------------
+    def reload(self):
+        args = (self.where_sql, self.where_params, self.first_row, self.visible_rows, self.sort)
+        if self.worker is None:
+            self._apply_load(load_window(*args))
+        else:
+            self.worker.submit(load_window, *args, on_done=self._apply_load, on_error=self.on_error, key=LOAD_KEY)
+
+    # -------------------------------------------
+    # Function: update_rows
+    # Purpose:
+    # Replaces the given book records in the cached pages and on screen, keeping the position
+    # and the order (used after saving edits, instead of a reload).
+    # -------------------------------------------
+    def update_rows(self, rows):
+        by_id = {row[0]: row for row in rows}
+        for page, page_rows in self.pages.items():
+            if any(row[0] in by_id for row in page_rows):
+                self.pages[page] = [by_id.get(row[0], row) for row in page_rows]
+        update_book_rows(self.tabla_information, rows)
+
+    # -------------------------------------------
+    # Function: _apply_load
+    # Purpose:
+    # Replaces the cached pages with the result of load_window and redraws.
+    # -------------------------------------------
+    def _apply_load(self, result):
+        self.total_rows, self.first_row, self.pages, self.anchors = result
+        self.scroll_to(self.first_row)
+
+    # -------------------------------------------
+    # Function: scroll_to
+    # Purpose:
+    # Moves the window so that `first_row` is the first visible row and redraws it.
+    # -------------------------------------------
+    def scroll_to(self, first_row):
+        last_start = max(self.total_rows - self.visible_rows, 0)  # Last position that fills the widget.
+        self.first_row = min(max(int(first_row), 0), last_start)
+        self.render()
+
+    # -------------------------------------------
+    # Function: render
+    # Purpose:
+    # Replaces the rows in the widget with the visible window plus buffer and updates the scrollbar.
+    # -------------------------------------------
+    def render(self):
+        stop = min(self.first_row + self.visible_rows + BUFFER_ROWS, self.total_rows)
+        rows = self.rows_between(self.first_row, stop)
+
+        show_book_rows(self.tabla_information, rows, start_number=self.first_row + 1)  # Only a window of rows is shown.
+        self.tabla_information.yview_moveto(0)  # The window always starts at the top of the widget.
+
+        if self.total_rows:
+            low = self.first_row / self.total_rows
+            high = min(self.first_row + self.visible_rows, self.total_rows) / self.total_rows
+            self.scrollbar_vertical.set(low, high)
+        else:
+            self.scrollbar_vertical.set(0, 1)
+
+    # -------------------------------------------
+    # Function: rows_between
+    # Purpose:
+    # Returns the rows at positions [start, stop) of the result, loading pages as needed.
+    # -------------------------------------------
+    def rows_between(self, start, stop):
+        rows = []
+        if stop <= start:
+            return rows
+        for page in range(start // PAGE_SIZE, (stop - 1) // PAGE_SIZE + 1):
+            page_rows = self._page(page)
+            page_start = page * PAGE_SIZE
+            rows.extend(page_rows[max(start - page_start, 0):stop - page_start])
+        return rows
+
+    # -------------------------------------------
+    # Function: _page
+    # Purpose:
+    # Returns a page from the cache or fetches it with a keyset query.
+    # -------------------------------------------
+    def _page(self, page):
+        if page in self.pages:
+            self.pages.move_to_end(page)  # Mark as recently used.
+            return self.pages[page]
+
+        rows = fetch_page(self.where_sql, self.where_params, self._anchor(page), self.sort)
+        self.pages[page] = rows
+        if rows:
+            self.anchors[page + 1] = rows[-1][0]  # The next page starts after the last key.
+        while len(self.pages) > MAX_CACHED_PAGES:
+            self.pages.popitem(last=False)  # Forget the least recently used page.
+        return rows
+
+    # -------------------------------------------
+    # Function: _anchor
+    # Purpose:
+    # Returns the last book before the given page. Sequential scrolling reuses the last book of
+    # the previous page; a jump with the scrollbar starts from the nearest known book (see fetch_anchor).
+    # -------------------------------------------
+    def _anchor(self, page):
+        if page not in self.anchors:
+            self.anchors[page] = fetch_anchor(
+                self.where_sql, self.where_params, page * PAGE_SIZE - 1, self.sort, self.total_rows, self.anchors
+            )  # Book before the page.
+        return self.anchors[page]
+
+    # -------------------------------------------
+    # Function: yview
+    # Purpose:
+    # Scrollbar command. Accepts the same arguments as Treeview.yview ("moveto" and "scroll").
+    # -------------------------------------------
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * self.total_rows)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_rows
+            self._scroll_units(amount)
+
+    # -------------------------------------------
+    # Function: _scroll_units
+    # Purpose:
+    # Scrolls the window by a number of rows. Returns "break" to stop the default binding.
+    # -------------------------------------------
+    def _scroll_units(self, amount):
+        self.scroll_to(self.first_row + amount)
+        return 'break'
+
+    # -------------------------------------------
+    # Function: _on_mousewheel
+    # Purpose:
+    # Scrolls WHEEL_ROWS rows per wheel notch (Windows and macOS deltas).
+    # -------------------------------------------
+    def _on_mousewheel(self, event):
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self._scroll_units(-notches * WHEEL_ROWS)
+
+    # -------------------------------------------
+    # Function: _on_arrow
+    # Purpose:
+    # Moves the focus with the arrow keys and scrolls when it leaves the visible rows.
+    # -------------------------------------------
+    def _on_arrow(self, step):
+        focus = self.tabla_information.focus()
+        if not focus:
+            return None  # Let the treeview handle the first key press.
+
+        children = self.tabla_information.get_children()
+        position = self.first_row + children.index(focus) + step
+        if position < 0 or position >= self.total_rows:
+            return 'break'
+        if position < self.first_row:
+            self.scroll_to(position)
+        elif position >= self.first_row + self.visible_rows:
+            self.scroll_to(position - self.visible_rows + 1)
+
+        item = self.tabla_information.get_children()[position - self.first_row]
+        self.tabla_information.focus(item)
+        self.tabla_information.selection_set(item)
+        return 'break'
+
+    # -------------------------------------------
+    # Function: _on_configure
+    # Purpose:
+    # Recomputes how many rows fit when the widget is resized.
+    # -------------------------------------------
+    def _on_configure(self, event):
+        visible_rows = max(event.height // self.row_height - 1, 1)  # One row is used by the headings.
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.scroll_to(self.first_row)